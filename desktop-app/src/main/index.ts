@@ -2,6 +2,7 @@ import {
   app,
   BrowserWindow,
   ipcMain,
+  WebContents,
   globalShortcut,
   shell,
   protocol,
@@ -26,6 +27,8 @@ const PY_HOST = "127.0.0.1"
 const PY_PORT = 8000
 const SECRET_TOKEN_LENGTH = 64
 const SECRET_TOKEN = randomBytes(SECRET_TOKEN_LENGTH).toString("hex")
+const JOB_POLL_INTERVAL_MS = 250
+const EVENTS_RETRY_INTERVAL_MS = 1000
 
 // Reference to python process so we can gracefully stop it
 let pythonProcess: ChildProcess = null
@@ -44,6 +47,7 @@ const launchPython = (): ChildProcess => {
     PY_PORT.toString(),
     "--secret",
     SECRET_TOKEN,
+    "--warm-up",
   ]
 
   if (!app.isPackaged) {
@@ -209,18 +213,46 @@ ipcMain.handle(
         body: JSON.stringify({ backend: "BGB", party }),
       })
 
-      if (res.status != 200) {
+      if (res.status != 202) {
         console.error(await res.json())
+        return false
       }
 
-      return res.status == 200
+      // The backend starts in background, wait until its job finishes
+      const { job_id: jobId } = await res.json()
+      return await waitForJob(jobId)
     } catch (err) {
-      console.error()
+      console.error(err)
       return false
     }
   },
 )
 
+async function waitForJob(jobId: string): Promise<boolean> {
+  for (;;) {
+    const res = await fetch(`http://${PY_HOST}:${PY_PORT}/jobs/${jobId}`, {
+      method: "GET",
+      headers: {
+        "secret-token": SECRET_TOKEN,
+        "Content-Type": "application/json",
+      },
+    })
+    if (!res.ok) {
+      console.error(await res.json())
+      return false
+    }
+
+    const job = await res.json()
+    if (job.status === "SUCCEEDED") return true
+    if (job.status === "FAILED") {
+      console.error(job.error)
+      return false
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS))
+  }
+}
+
 ipcMain.handle("stop-bgb-server", async () => {
   try {
     const res = await fetch(`http://${PY_HOST}:${PY_PORT}/stop-backend`, {
@@ -263,6 +295,58 @@ ipcMain.handle("fetch-backend-states", async () => {
   }
 })
 
+// Ids of the WebContents the server events are already forwarded to. A single
+// stream per window, however many times the renderer subscribes (eg. reloads)
+const eventStreams = new Set<number>()
+
+// Forwards the server events (Server-Sent Events) to the renderer, reconnecting
+// while the window is alive
+ipcMain.handle("subscribe-backend-events", (event) => {
+  const sender = event.sender
+  if (eventStreams.has(sender.id)) return
+  eventStreams.add(sender.id)
+  streamBackendEvents(sender).finally(() => eventStreams.delete(sender.id))
+})
+
+async function streamBackendEvents(sender: WebContents): Promise<void> {
+  while (!sender.isDestroyed()) {
+    try {
+      const res = await fetch(`http://${PY_HOST}:${PY_PORT}/events`, {
+        method: "GET",
+        headers: { "secret-token": SECRET_TOKEN },
+      })
+      if (res.ok) {
+        let buffer = ""
+        for await (const chunk of res.body) {
+          if (sender.isDestroyed()) return
+          buffer += chunk.toString()
+          const messages = buffer.split("\n\n")
+          buffer = messages.pop()
+          messages.forEach((message) => {
+            const event = parseServerSentEvent(message)
+            if (event !== null) sender.send("backend-event", event)
+          })
+        }
+      }
+    } catch (err) {
+      console.error(err)
+    }
+    await new Promise((resolve) => setTimeout(resolve, EVENTS_RETRY_INTERVAL_MS))
+  }
+}
+
+function parseServerSentEvent(
+  message: string,
+): { type: string; data: Record<string, unknown> } | null {
+  let type = "message"
+  let data = ""
+  message.split("\n").forEach((line) => {
+    if (line.startsWith("event:")) type = line.slice(6).trim()
+    else if (line.startsWith("data:")) data += line.slice(5).trim()
+  })
+  return data === "" ? null : { type, data: JSON.parse(data) }
+}
+
 ipcMain.handle("open-external-link", (event, url: string) => {
   shell.openExternal(url)
 })
@@ -1,10 +1,10 @@
 // See the Electron documentation for details on how to use preload scripts:
 // https://www.electronjs.org/docs/latest/tutorial/process-model#preload-scripts
 
-import { contextBridge, ipcRenderer } from "electron"
+import { contextBridge, ipcRenderer, IpcRendererEvent } from "electron"
 import { Party } from "../common/models"
 import { Backends } from "../common/constants"
-import { SpooferState } from "../renderer/types"
+import { BackendEvent, SpooferState } from "../renderer/types"
 
 declare global {
   interface Window {
@@ -12,6 +12,7 @@ declare global {
       startBGBServer: (party: Party) => Promise<boolean>
       stopBGBServer: () => Promise<boolean>
       fetchBackendStates: () => Promise<Record<Backends, SpooferState> | null>
+      onBackendEvent: (callback: (event: BackendEvent) => void) => () => void
       isServerUp: () => Promise<{
         state: "error" | "ok" | "loading"
         message: string
@@ -34,6 +35,16 @@ contextBridge.exposeInMainWorld("api", {
   > | null> => {
     return await ipcRenderer.invoke("fetch-backend-states")
   },
+  onBackendEvent: (callback: (event: BackendEvent) => void) => {
+    const listener = (_: IpcRendererEvent, event: BackendEvent) =>
+      callback(event)
+    ipcRenderer.on("backend-event", listener)
+    ipcRenderer.invoke("subscribe-backend-events")
+    // Unsubscribes the callback, the stream of the window keeps running
+    return () => {
+      ipcRenderer.removeListener("backend-event", listener)
+    }
+  },
   isServerUp: async (): Promise<{
     state: "error" | "ok" | "loading"
     message: string
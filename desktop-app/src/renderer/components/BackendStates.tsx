@@ -125,12 +125,14 @@ export default function BackendStates() {
     backends,
     backendMessage,
     fetchBackendStates,
+    applyBackendEvent,
     startBackend,
     stopBackend,
   ] = usePokemonStore((state) => [
     state.backends,
     state.backendMessage,
     state.fetchBackendStates,
+    state.applyBackendEvent,
     state.startBackend,
     state.stopBackend,
   ])
@@ -139,6 +141,8 @@ export default function BackendStates() {
 
   useEffect(() => {
     fetchBackendStates()
+    // State changes are pushed by the server from now on
+    return window.api.onBackendEvent(applyBackendEvent)
   }, [])
   const handleStartStop = (backend: Backends) => () => {
     if (backends[backend] === SpooferState.LOADING) return
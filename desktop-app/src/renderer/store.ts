@@ -1,5 +1,5 @@
 import { create } from "zustand"
-import { type PokeApiPokemon, SpooferState } from "./types"
+import { type BackendEvent, type PokeApiPokemon, SpooferState } from "./types"
 import { Backends } from "../common/constants"
 import { type Party } from "../common/models"
 
@@ -27,6 +27,7 @@ interface Actions {
   deletePartySlot: (slotIdx: number) => void
   clearParty: () => void
   fetchBackendStates: () => Promise<void>
+  applyBackendEvent: (event: BackendEvent) => void
   startBackend: (backend: Backends) => Promise<void>
   stopBackend: (backend: Backends) => Promise<void>
   toggleModal: () => void
@@ -75,6 +76,37 @@ export const usePokemonStore = create<State & Actions>()((set, get) => ({
     const states = await window.api.fetchBackendStates()
     set({ backends: states })
   },
+  applyBackendEvent(event) {
+    const { backends } = get()
+    switch (event.type) {
+      case "backend_state": {
+        const backend = event.data.backend as Backends
+        // A start or stop in progress reports its own result
+        if (!(backend in backends) || backends[backend] === SpooferState.LOADING)
+          return
+        set({
+          backends: {
+            ...backends,
+            [backend]: event.data.running
+              ? SpooferState.RUNNING
+              : SpooferState.STOPPED,
+          },
+        })
+        break
+      }
+      case "session_connected":
+        set({ backendMessage: `Game connected from ${event.data.session}` })
+        break
+      case "session_disconnected":
+        set({ backendMessage: `Game at ${event.data.session} disconnected` })
+        break
+      case "trade_completed":
+        set({
+          backendMessage: `Traded ${event.data.sent.nickname} for ${event.data.received.nickname}`,
+        })
+        break
+    }
+  },
   startBackend: async (backend: Backends) => {
     const { backends, trainerName, party } = get()
     if (!(backend in backends)) return
@@ -12,3 +12,16 @@ export enum SpooferState {
   RUNNING,
   LOADING,
 }
+
+export type BackendEvent =
+  | { type: "backend_state"; data: { backend: string; running: boolean } }
+  | { type: "session_connected"; data: { session: string } }
+  | { type: "session_disconnected"; data: { session: string } }
+  | {
+      type: "trade_completed"
+      data: {
+        session: string
+        sent: { dex_id: number; nickname: string }
+        received: { dex_id: number; nickname: string }
+      }
+    }
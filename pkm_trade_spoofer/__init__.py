@@ -1 +1,15 @@
-from pkm_trade_spoofer.api import ManagementAPI
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pkm_trade_spoofer.api import ManagementAPI
+
+__all__ = ["ManagementAPI"]
+
+
+def __getattr__(name: str) -> Any:
+    # The API pulls FastAPI and uvicorn in, only import it when it is used
+    if name == "ManagementAPI":
+        from pkm_trade_spoofer.api import ManagementAPI
+
+        return ManagementAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,9 @@
-from pkm_trade_spoofer import cli
+import multiprocessing
 
 if __name__ == "__main__":
+    # Process pool workers of the bundled app start through this entry point
+    multiprocessing.freeze_support()
+
+    from pkm_trade_spoofer import cli
+
     cli.app()
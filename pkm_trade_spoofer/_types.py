@@ -1,5 +1,5 @@
 import enum
-from typing import Protocol
+from typing import Optional, Protocol
 
 from pkm_trade_spoofer.models import Party
 
@@ -8,9 +8,21 @@ class BackendTypes(enum.StrEnum):
     bgb_emulator: str = "BGB"
 
 
+class EventLoopTypes(enum.StrEnum):
+    asyncio = "asyncio"
+    uvloop = "uvloop"
+
+
 class Backend(Protocol):
-    async def start(self, party: Party) -> None:
+    async def start(self, party: Party | int, image: Optional[bytes] = None) -> None:
         ...
 
     async def stop(self) -> None:
         ...
+
+    async def swap_party(
+        self,
+        party: Party | int,
+        image: Optional[bytes] = None,
+    ) -> int:
+        ...
@@ -1,72 +1,127 @@
 import asyncio
+import concurrent.futures
+import dataclasses
 import functools
-from typing import Any, Optional
+import hashlib
+from typing import Any, AsyncIterator, Optional
 
 import pydantic
 import uvicorn
 from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
-
-from pkm_trade_spoofer import logger
-from pkm_trade_spoofer._types import Backend, BackendTypes
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from pkm_trade_spoofer import batch, logger
+from pkm_trade_spoofer._types import BackendTypes
+from pkm_trade_spoofer.backend.pool import BackendInstance, BackendPool
+from pkm_trade_spoofer.diagnostics import MemoryDiagnostics
+from pkm_trade_spoofer.events import Event, EventBus
+from pkm_trade_spoofer.jobs import Job, JobRegistry, JobStatus
 from pkm_trade_spoofer.models import EVs, Party, Pokemon
-from pkm_trade_spoofer.pokemon import pokemon_by_id
+from pkm_trade_spoofer.monitoring import LinkHealthMonitor
+from pkm_trade_spoofer.party_cache import CachedParty, PartyCache
+from pkm_trade_spoofer.party_store import PartyStore
+from pkm_trade_spoofer.pokemon import AsyncPokeApiClient, SpeciesRepository
+from pkm_trade_spoofer.profiling import SessionProfiler
+from pkm_trade_spoofer.schemas import PokeApiBaseModel, SimpleParty, SimplePokemon
+from pkm_trade_spoofer.trade_archive import ArchivedPokemon, TradeArchive
 
 LOGGER = logger.get_logger(__name__)
 
+# Seconds without events after which a comment is sent to keep the stream alive
+_EVENTS_KEEP_ALIVE = 15.0
 
-def to_camel(string: str) -> str:
-    initial, *remaining = string.split("_")
-    return initial + "".join(word.capitalize() for word in remaining)
 
+class StartInstanceRequest(PokeApiBaseModel):
+    """Schema of instances start request body.
 
-class _PokeApiBaseModel(pydantic.BaseModel):
-    class Config:
-        alias_generator = to_camel
+    Either a party or the id of a stored party (see `/parties`) is required.
+    """
 
+    party: Optional[SimpleParty] = None
+    party_id: Optional[int] = None
 
-class SimplePokemon(_PokeApiBaseModel):
-    """Simple pokemon schema transferred between front-end and back-end."""
+    @pydantic.root_validator(skip_on_failure=True)
+    def _party_validator(cls, values: dict[str, Any]) -> dict[str, Any]:
+        if (values.get("party") is None) == (values.get("party_id") is None):
+            raise ValueError("Either party or partyId has to be set")
+        return values
 
-    nickname: str
-    dex_id: int = pydantic.Field(ge=0, le=251)  # type: ignore
-    ivs: Optional[list[int]] = pydantic.Field(None, min_items=5, max_items=5)
-    held_item_id: Optional[int] = None
 
-    @pydantic.validator("ivs")
-    def _ivs_validator(cls, ivs: list[int]) -> list[int]:
-        if any(o > 15 or o < 0 for o in ivs):
-            raise ValueError("IVs have to be lower or equal than 15")
-        return ivs
+class StartBackendRequest(StartInstanceRequest):
+    """Schema of start-backend request body, starts the default instance."""
 
+    backend: BackendTypes
 
-class SimpleParty(_PokeApiBaseModel):
-    """Simplified pokemon party schema."""
 
-    trainer_name: str
-    pokemon: list[SimplePokemon] = pydantic.Field(min_items=0, max_items=6)
+class SwapPartyRequest(StartBackendRequest):
+    """swap-party request body schema, takes a party or party id."""
 
 
-class StartBackendRequest(_PokeApiBaseModel):
-    """Schema of start-backend request body."""
+class StorePartyRequest(PokeApiBaseModel):
+    """parties request body schema, `name` defaults to the trainer name."""
 
     party: SimpleParty
-    backend: BackendTypes
+    name: Optional[str] = None
 
 
-class StopBackendRequest(_PokeApiBaseModel):
+class StopBackendRequest(PokeApiBaseModel):
     """stop-backend request body schema."""
 
     backend: BackendTypes
 
 
+class ProfilingRequest(PokeApiBaseModel):
+    """profiling request body schema."""
+
+    enabled: bool
+    peer: Optional[str] = None
+
+
+class MemoryTracingRequest(PokeApiBaseModel):
+    """memory/tracing request body schema."""
+
+    enabled: bool
+    frames: int = pydantic.Field(1, ge=1, le=64)  # type: ignore
+
+
 class Response(pydantic.BaseModel):
     """Common response schema shared across all endpoints."""
 
     message: str
 
 
+class WarmUpProgressResponse(pydantic.BaseModel):
+    """Progress of the species warm up."""
+
+    total: int
+    done: int
+    failed: int
+    finished: bool
+
+
+class JobResponse(pydantic.BaseModel):
+    """Status of a background job, `error` is set when it fails.
+
+    `backend` is the id of the instance the job starts.
+    """
+
+    job_id: str
+    backend: str
+    status: JobStatus
+    error: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
+
+
+class PingResponse(pydantic.BaseModel):
+    """Ping response, with the species warm up progress if there is one."""
+
+    message: str
+    warm_up: Optional[WarmUpProgressResponse] = None
+
+
 class BackendStatesResponse(pydantic.BaseModel):
     """Response containing the status of each backend.
 
@@ -76,6 +131,104 @@ class BackendStatesResponse(pydantic.BaseModel):
     states: dict[str, bool]
 
 
+class InstanceResponse(pydantic.BaseModel):
+    """Backend instance and the address its link server listens at."""
+
+    instance_id: str
+    backend: str
+    host: str
+    port: int
+    running: bool
+
+
+class InstancesResponse(pydantic.BaseModel):
+    """Response listing the backend instances."""
+
+    instances: list[InstanceResponse]
+
+
+class SwapPartyResponse(pydantic.BaseModel):
+    """Version of the party offered by a backend instance after swapping it."""
+
+    instance_id: str
+    version: int
+
+
+class ProfilingStateResponse(pydantic.BaseModel):
+    """Response containing the session profiling settings."""
+
+    enabled: bool
+    peer: Optional[str]
+    output_dir: str
+
+
+class LinkHealthResponse(pydantic.BaseModel):
+    """Event loop lag and link reply latency statistics."""
+
+    metrics: dict[str, Any]
+
+
+class StoredPartyResponse(pydantic.BaseModel):
+    """Id and name of a stored party."""
+
+    party_id: int
+    name: str
+
+
+class StoredPartiesResponse(pydantic.BaseModel):
+    """Response listing the stored parties."""
+
+    parties: list[StoredPartyResponse]
+
+
+class ArchivedPokemonResponse(pydantic.BaseModel):
+    """Pokemon received in a trade, `traded` is set for the one traded."""
+
+    record_id: int
+    timestamp: float
+    trainer_name: str
+    slot: int
+    traded: bool
+    nickname: str
+    ot_name: str
+    dex_id: int
+    level: int
+
+
+class ArchiveResponse(pydantic.BaseModel):
+    """Response listing archived pokemon, the newest first."""
+
+    total: int
+    pokemon: list[ArchivedPokemonResponse]
+
+
+class PartyCacheResponse(pydantic.BaseModel):
+    """Built parties cache statistics."""
+
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+
+
+class MemorySnapshotResponse(pydantic.BaseModel):
+    """Response containing the id of a tracemalloc snapshot."""
+
+    snapshot_id: int
+
+
+class MemoryStatsResponse(pydantic.BaseModel):
+    """Response containing allocation sites statistics."""
+
+    stats: list[dict[str, Any]]
+
+
+class LiveObjectsResponse(pydantic.BaseModel):
+    """Response containing the number of live objects per type."""
+
+    objects: dict[str, int]
+
+
 class HTTPError(pydantic.BaseModel):
     """HTTP Error message schema."""
 
@@ -87,21 +240,57 @@ class HTTPError(pydantic.BaseModel):
         }
 
 
+class _DuplexStreamingResponse(StreamingResponse):
+    """Streaming response produced while the request body is still being read.
+
+    `StreamingResponse` waits for the client to disconnect by reading the request
+    messages, which would steal the body chunks from the response generator.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
 class ManagementAPI(object):
-    """API to manage the execution of the backends."""
+    """API to manage the execution of the backends.
+
+    Backends run as a pool of instances, each listening on its own port and
+    trading its own party.
+    """
 
     def __init__(
         self,
-        backends: dict[BackendTypes, Backend],
+        backends: BackendPool,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         host: str = "127.0.0.1",
         port: int = 8000,
         secret: str = "",
+        profiler: Optional[SessionProfiler] = None,
+        monitor: Optional[LinkHealthMonitor] = None,
+        pokeapi_client: Optional[AsyncPokeApiClient] = None,
+        warm_up: bool = False,
+        events: Optional[EventBus] = None,
+        party_store: Optional[PartyStore] = None,
+        archive: Optional[TradeArchive] = None,
     ) -> None:
         self._host = host
         self._port = port
         self._backends = backends
-        self._running_backends: set[BackendTypes] = set()
+        self._profiler = profiler
+        self._monitor = monitor
+        self._memory = MemoryDiagnostics()
+        self._pokeapi = pokeapi_client or AsyncPokeApiClient()
+        self._species = SpeciesRepository(self._pokeapi)
+        self._parties = PartyCache()
+        self._jobs = JobRegistry()
+        self._events = events or EventBus()
+        self._party_store = party_store
+        self._archive = archive
+        self._batch_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._warm_up = warm_up
+        self._warm_up_task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
         self._loop = loop or asyncio.get_running_loop()
         self.app = FastAPI(title="Pokemon GSC Trade Spoofer")
@@ -123,7 +312,7 @@ class ManagementAPI(object):
             "/ping",
             self._ping,
             responses={
-                200: {"model": BackendStatesResponse},
+                200: {"model": PingResponse},
                 401: {"model": HTTPError},
                 500: {"model": Response},
             },
@@ -133,10 +322,78 @@ class ManagementAPI(object):
         self.app.add_api_route(
             "/start-backend",
             self._start_backend,
-            responses=responses,
+            responses={
+                202: {"model": JobResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+                500: {"model": Response},
+            },
             dependencies=[Depends(_check_secret)],
             methods=["POST"],
         )
+        self.app.add_api_route(
+            "/instances",
+            self._instances,
+            responses={
+                200: {"model": InstancesResponse},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/instances/{instance_id}/start",
+            self._start_instance,
+            responses={
+                202: {"model": JobResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+                404: {"model": Response},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/instances/{instance_id}/stop",
+            self._stop_instance,
+            responses={**responses, 404: {"model": Response}},
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/instances/{instance_id}/party",
+            self._swap_instance_party,
+            responses={
+                200: {"model": SwapPartyResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+                404: {"model": Response},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["PUT"],
+        )
+        self.app.add_api_route(
+            "/swap-party",
+            self._swap_party,
+            responses={
+                200: {"model": SwapPartyResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/jobs/{job_id}",
+            self._job_status,
+            responses={
+                200: {"model": JobResponse},
+                401: {"model": HTTPError},
+                404: {"model": Response},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
 
         self.app.add_api_route(
             "/stop-backend",
@@ -157,6 +414,105 @@ class ManagementAPI(object):
             dependencies=[Depends(_check_secret)],
             methods=["GET"],
         )
+        self.app.add_api_route(
+            "/profiling",
+            self._profiling_state,
+            responses={
+                200: {"model": ProfilingStateResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/profiling",
+            self._set_profiling,
+            responses={
+                200: {"model": ProfilingStateResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/link-health",
+            self._link_health,
+            responses={
+                200: {"model": LinkHealthResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/events",
+            self._stream_events,
+            response_class=StreamingResponse,
+            responses={
+                200: {"content": {"text/event-stream": {}}},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/parties",
+            self._stored_parties,
+            responses={
+                200: {"model": StoredPartiesResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/parties",
+            self._store_party,
+            responses={
+                200: {"model": StoredPartyResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/parties/batch",
+            self._build_parties_batch,
+            response_class=StreamingResponse,
+            responses={
+                200: {"content": {"application/x-ndjson": {}}},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/archive",
+            self._archived_pokemon,
+            responses={
+                200: {"model": ArchiveResponse},
+                400: {"model": Response},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/party-cache",
+            self._party_cache,
+            responses={
+                200: {"model": PartyCacheResponse},
+                401: {"model": HTTPError},
+            },
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self._add_memory_routes()
         config = uvicorn.Config(
             app=self.app,
             loop=self._loop,  # type: ignore
@@ -164,71 +520,551 @@ class ManagementAPI(object):
             port=self._port,
         )
         server = uvicorn.Server(config)
+
+        if self._warm_up:
+            # Runs in background while the API is already serving requests
+            self._warm_up_task = self._loop.create_task(self._species.warm_up())
+
         self._loop.run_until_complete(server.serve())
 
+    def _add_memory_routes(self) -> None:
+        memory_responses: dict[int | str, dict[str, Any]] = {
+            400: {"model": Response},
+            401: {"model": HTTPError},
+        }
+        self.app.add_api_route(
+            "/memory/tracing",
+            self._memory_tracing,
+            responses={200: {"model": Response}, **memory_responses},
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/memory/snapshots",
+            self._memory_snapshot,
+            responses={200: {"model": MemorySnapshotResponse}, **memory_responses},
+            dependencies=[Depends(_check_secret)],
+            methods=["POST"],
+        )
+        self.app.add_api_route(
+            "/memory/top",
+            self._memory_top,
+            responses={200: {"model": MemoryStatsResponse}, **memory_responses},
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/memory/diff",
+            self._memory_diff,
+            responses={200: {"model": MemoryStatsResponse}, **memory_responses},
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+        self.app.add_api_route(
+            "/memory/objects",
+            self._memory_objects,
+            responses={200: {"model": LiveObjectsResponse}, **memory_responses},
+            dependencies=[Depends(_check_secret)],
+            methods=["GET"],
+        )
+
     def stop(self) -> None:
         """Stops the management API, as well as, the started backends."""
 
-        for b in self._backends.values():
-            self._loop.run_until_complete(b.stop())
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+        self._jobs.cancel()
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(cancel_futures=True)
+
+        for instance in self._backends:
+            self._loop.run_until_complete(instance.backend.stop())
+        self._loop.run_until_complete(self._pokeapi.close())
 
     async def _start_backend(
         self,
         start_backend_req: StartBackendRequest,
     ) -> JSONResponse:
-        if start_backend_req.backend in self._running_backends:
-            res_msg = f"Backend {start_backend_req.backend} is already running."
-            return _json_response(Response(message=res_msg), status_code=400)
+        """Accepts the request and starts the backend in a background job.
 
-        try:
-            pkm_party = await _simple_party_to_complex(start_backend_req.party)
-            LOGGER.info(pkm_party)
-            await self._backends[start_backend_req.backend].start(pkm_party)
-        except KeyError:
+        The response carries the job id, poll `/jobs/{job_id}` to know when the
+        backend is up or why it failed.
+        """
+        instance = self._backends.default(start_backend_req.backend)
+        if instance is None:
             res_msg = f"Backend {start_backend_req.backend} is not available."
             return _json_response(Response(message=res_msg), status_code=400)
 
+        return self._submit_start(instance, start_backend_req)
+
+    async def _start_instance(
+        self,
+        instance_id: str,
+        start_instance_req: StartInstanceRequest,
+    ) -> JSONResponse:
+        """Same as `/start-backend` for the given instance."""
+        instance = self._backends.get(instance_id)
+        if instance is None:
+            res_msg = f"Instance {instance_id} not found."
+            return _json_response(Response(message=res_msg), status_code=404)
+
+        return self._submit_start(instance, start_instance_req)
+
+    def _submit_start(
+        self,
+        instance: BackendInstance,
+        start_req: StartInstanceRequest,
+    ) -> JSONResponse:
+        if instance.running:
+            res_msg = f"Backend {instance.id} is already running."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        if self._jobs.active(instance.id) is not None:
+            res_msg = f"Backend {instance.id} is already starting."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        job = self._jobs.submit(
+            instance.id,
+            functools.partial(self._start_backend_job, instance, start_req),
+        )
+        return _json_response(_job_response(job), status_code=202)
+
+    async def _start_backend_job(
+        self,
+        instance: BackendInstance,
+        start_req: StartInstanceRequest,
+        job: Job,
+    ) -> None:
+        pkm_party: Party | int
+        image = None
+        if start_req.party is not None:
+            job.status = JobStatus.building_party
+            built = await self._build_party(start_req.party)
+            pkm_party, image = built.party, built.serialized
+        else:
+            # Validation ensures the id is set when there is no party
+            pkm_party = start_req.party_id  # type: ignore
+
+        job.status = JobStatus.starting_backend
+        await instance.backend.start(pkm_party, image)
+
         async with self._lock:
-            self._running_backends.add(start_backend_req.backend)
+            instance.running = True
+        self._publish_backend_state(instance)
 
-        res_msg = f"Backend {start_backend_req.backend} start successfully."
-        return _json_response(Response(message=res_msg), status_code=200)
+        LOGGER.info(f"Backend {instance.id} start successfully.")
+
+    async def _swap_party(self, swap_party_req: SwapPartyRequest) -> JSONResponse:
+        """Replaces the party of a running backend without stopping it.
+
+        Connected players are offered the new party at their next trade.
+        """
+        instance = self._backends.default(swap_party_req.backend)
+        if instance is None:
+            res_msg = f"Backend {swap_party_req.backend} is not available."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        return await self._swap(instance, swap_party_req)
+
+    async def _swap_instance_party(
+        self,
+        instance_id: str,
+        swap_party_req: StartInstanceRequest,
+    ) -> JSONResponse:
+        """Same as `/swap-party` for the given instance."""
+        instance = self._backends.get(instance_id)
+        if instance is None:
+            res_msg = f"Instance {instance_id} not found."
+            return _json_response(Response(message=res_msg), status_code=404)
+
+        return await self._swap(instance, swap_party_req)
+
+    async def _swap(
+        self,
+        instance: BackendInstance,
+        swap_party_req: StartInstanceRequest,
+    ) -> JSONResponse:
+        if not instance.running:
+            res_msg = f"Backend {instance.id} is not running."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        pkm_party: Party | int
+        image = None
+        if swap_party_req.party is not None:
+            built = await self._build_party(swap_party_req.party)
+            pkm_party, image = built.party, built.serialized
+        else:
+            pkm_party = swap_party_req.party_id  # type: ignore
+
+        try:
+            version = await instance.backend.swap_party(pkm_party, image)
+        except (KeyError, ValueError, RuntimeError) as e:
+            return _json_response(Response(message=str(e)), status_code=400)
+
+        LOGGER.info(f"Backend {instance.id} offering party version {version}.")
+        return _json_response(
+            SwapPartyResponse(instance_id=instance.id, version=version),
+            status_code=200,
+        )
+
+    async def _build_party(self, party: SimpleParty) -> CachedParty:
+        return await self._parties.get_or_build(
+            _party_key(party),
+            lambda: _simple_party_to_complex(party, self._species),
+        )
+
+    async def _job_status(self, job_id: str) -> JSONResponse:
+        job = self._jobs.get(job_id)
+        if job is None:
+            res_msg = f"Job {job_id} not found."
+            return _json_response(Response(message=res_msg), status_code=404)
+
+        return _json_response(_job_response(job), status_code=200)
 
     async def _stop_backend(
         self,
         stop_backend_req: StopBackendRequest,
     ) -> JSONResponse:
-        if stop_backend_req.backend not in self._running_backends:
+        instance = self._backends.default(stop_backend_req.backend)
+        if instance is None or not instance.running:
             res_msg = f"Backend {stop_backend_req.backend} is not running."
             return _json_response(Response(message=res_msg), status_code=400)
 
-        await self._backends[stop_backend_req.backend].stop()
+        return await self._stop(instance)
+
+    async def _stop_instance(self, instance_id: str) -> JSONResponse:
+        instance = self._backends.get(instance_id)
+        if instance is None:
+            res_msg = f"Instance {instance_id} not found."
+            return _json_response(Response(message=res_msg), status_code=404)
+
+        if not instance.running:
+            res_msg = f"Backend {instance.id} is not running."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        return await self._stop(instance)
+
+    async def _stop(self, instance: BackendInstance) -> JSONResponse:
+        await instance.backend.stop()
 
         async with self._lock:
-            self._running_backends.remove(stop_backend_req.backend)
+            instance.running = False
+        self._publish_backend_state(instance)
 
-        res_msg = f"Backend {stop_backend_req.backend} stopped successfully."
+        res_msg = f"Backend {instance.id} stopped successfully."
         return _json_response(Response(message=res_msg), status_code=200)
 
     async def _backend_states(self) -> JSONResponse:
+        """Whether the default instance of each backend is running."""
         state = {
-            str(backend): backend in self._running_backends
-            for backend in self._backends
+            str(instance.type): instance.running
+            for instance in self._backends
+            if self._backends.is_default(instance)
         }
         return _json_response(BackendStatesResponse(states=state), status_code=200)
 
+    async def _instances(self) -> JSONResponse:
+        instances = [
+            InstanceResponse(
+                instance_id=instance.id,
+                backend=str(instance.type),
+                host=instance.host,
+                port=instance.port,
+                running=instance.running,
+            )
+            for instance in self._backends
+        ]
+        return _json_response(
+            InstancesResponse(instances=instances),
+            status_code=200,
+        )
+
+    async def _stream_events(self) -> StreamingResponse:
+        """Server-Sent Events stream of backend states, link sessions and trades.
+
+        The current state of every backend instance is sent first, then events
+        are pushed as they happen.
+        """
+
+        async def stream() -> AsyncIterator[str]:
+            async with self._events.subscribe() as queue:
+                for instance in self._backends:
+                    for event in self._backend_state_events(instance):
+                        yield event.to_sse()
+
+                while True:
+                    try:
+                        async with asyncio.timeout(_EVENTS_KEEP_ALIVE):
+                            event = await queue.get()
+                    except TimeoutError:
+                        yield ": keep-alive\n\n"
+                    else:
+                        yield event.to_sse()
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    def _backend_state_events(self, instance: BackendInstance) -> list[Event]:
+        """`instance_state` event, and `backend_state` for default instances."""
+        events = [
+            Event(
+                type="instance_state",
+                data={
+                    "instance": instance.id,
+                    "backend": str(instance.type),
+                    "port": instance.port,
+                    "running": instance.running,
+                },
+            ),
+        ]
+        if self._backends.is_default(instance):
+            events.append(
+                Event(
+                    type="backend_state",
+                    data={"backend": str(instance.type), "running": instance.running},
+                ),
+            )
+        return events
+
+    def _publish_backend_state(self, instance: BackendInstance) -> None:
+        for event in self._backend_state_events(instance):
+            self._events.publish(event.type, **event.data)
+
+    async def _profiling_state(self) -> JSONResponse:
+        if self._profiler is None:
+            res_msg = "Session profiling is not available."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        return _json_response(
+            ProfilingStateResponse(
+                enabled=self._profiler.enabled,
+                peer=self._profiler.peer,
+                output_dir=str(self._profiler.output_dir),
+            ),
+            status_code=200,
+        )
+
+    async def _set_profiling(self, profiling_req: ProfilingRequest) -> JSONResponse:
+        if self._profiler is None:
+            res_msg = "Session profiling is not available."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        # Only affects sessions started after this call
+        self._profiler.enabled = profiling_req.enabled
+        self._profiler.peer = profiling_req.peer
+        return await self._profiling_state()
+
+    async def _link_health(self) -> JSONResponse:
+        if self._monitor is None:
+            res_msg = "Link health monitoring is not enabled."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        return _json_response(
+            LinkHealthResponse(metrics=self._monitor.snapshot()),
+            status_code=200,
+        )
+
+    async def _stored_parties(self) -> JSONResponse:
+        if self._party_store is None:
+            res_msg = "Party store is not enabled."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        parties = [
+            StoredPartyResponse(party_id=party_id, name=name)
+            for party_id, name in self._party_store.items()
+        ]
+        return _json_response(
+            StoredPartiesResponse(parties=parties),
+            status_code=200,
+        )
+
+    async def _store_party(self, store_party_req: StorePartyRequest) -> JSONResponse:
+        if self._party_store is None:
+            res_msg = "Party store is not enabled."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        built = await self._build_party(store_party_req.party)
+        name = store_party_req.name or built.party.trainer_name
+        party_id = self._party_store.append_image(built.serialized, name)
+        return _json_response(
+            StoredPartyResponse(party_id=party_id, name=name),
+            status_code=200,
+        )
+
+    async def _build_parties_batch(self, request: Request) -> StreamingResponse:
+        """Builds a JSONL stream of `SimpleParty` documents in a process pool.
+
+        The response streams a JSON line per party, in the same order, with the
+        base64 serialized party or the error that prevented building it.
+        """
+        if self._batch_executor is None:
+            self._batch_executor = batch.create_executor()
+
+        results = batch.build_parties_async(
+            batch.iter_lines(request.stream()),
+            self._batch_executor,
+        )
+        return _DuplexStreamingResponse(
+            (f"{r}\n" async for r in results),
+            media_type="application/x-ndjson",
+        )
+
+    async def _archived_pokemon(
+        self,
+        dex_id: Optional[int] = None,
+        trainer: Optional[str] = None,
+        limit: int = 100,
+    ) -> JSONResponse:
+        """Pokemon received in trades, filtered by species and trainer."""
+        if self._archive is None:
+            res_msg = "Trade archive is not enabled."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        # Reads the matching records from disk
+        archived = await asyncio.to_thread(
+            self._archive.query,
+            dex_id=dex_id,
+            trainer_name=trainer,
+            limit=limit,
+        )
+        return _json_response(
+            ArchiveResponse(
+                total=len(self._archive),
+                pokemon=[_archived_pokemon_response(a) for a in archived],
+            ),
+            status_code=200,
+        )
+
+    async def _party_cache(self) -> JSONResponse:
+        return _json_response(
+            PartyCacheResponse(
+                size=len(self._parties),
+                max_entries=self._parties.max_entries,
+                hits=self._parties.hits,
+                misses=self._parties.misses,
+            ),
+            status_code=200,
+        )
+
+    async def _memory_tracing(
+        self,
+        memory_tracing_req: MemoryTracingRequest,
+    ) -> JSONResponse:
+        if memory_tracing_req.enabled:
+            self._memory.start(memory_tracing_req.frames)
+            res_msg = "Memory tracing started."
+        else:
+            self._memory.stop()
+            res_msg = "Memory tracing stopped."
+        return _json_response(Response(message=res_msg), status_code=200)
+
+    # Snapshots, their statistics and the live objects count walk the whole heap,
+    # they run in a thread so the link sessions are served meanwhile
+
+    async def _memory_snapshot(self) -> JSONResponse:
+        try:
+            snapshot_id = await asyncio.to_thread(self._memory.take_snapshot)
+        except RuntimeError as e:
+            return _json_response(Response(message=str(e)), status_code=400)
+
+        return _json_response(
+            MemorySnapshotResponse(snapshot_id=snapshot_id),
+            status_code=200,
+        )
+
+    async def _memory_top(
+        self,
+        limit: int = 20,
+        snapshot_id: Optional[int] = None,
+    ) -> JSONResponse:
+        try:
+            stats = await asyncio.to_thread(self._memory.top, limit, snapshot_id)
+        except RuntimeError as e:
+            return _json_response(Response(message=str(e)), status_code=400)
+        except KeyError:
+            res_msg = f"Snapshot {snapshot_id} does not exist."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        return _json_response(MemoryStatsResponse(stats=stats), status_code=200)
+
+    async def _memory_diff(
+        self,
+        first: int,
+        second: int,
+        limit: int = 20,
+    ) -> JSONResponse:
+        try:
+            stats = await asyncio.to_thread(self._memory.diff, first, second, limit)
+        except KeyError as e:
+            res_msg = f"Snapshot {e} does not exist."
+            return _json_response(Response(message=res_msg), status_code=400)
+
+        return _json_response(MemoryStatsResponse(stats=stats), status_code=200)
+
+    async def _memory_objects(self) -> JSONResponse:
+        objects = await asyncio.to_thread(self._memory.live_objects)
+        return _json_response(
+            LiveObjectsResponse(objects=objects),
+            status_code=200,
+        )
+
     async def _ping(self) -> JSONResponse:
-        return _json_response(Response(message="pong"), status_code=200)
+        progress = self._species.warm_up_progress
+        return _json_response(
+            PingResponse(
+                message="pong",
+                warm_up=(
+                    WarmUpProgressResponse(**dataclasses.asdict(progress))
+                    if progress is not None
+                    else None
+                ),
+            ),
+            status_code=200,
+        )
 
 
 def _json_response(content: pydantic.BaseModel, status_code: int) -> JSONResponse:
     return JSONResponse(jsonable_encoder(content), status_code=status_code)
 
 
-async def _simple_party_to_complex(sp: SimpleParty) -> Party:
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        backend=job.backend,
+        status=job.status,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _archived_pokemon_response(archived: ArchivedPokemon) -> ArchivedPokemonResponse:
+    return ArchivedPokemonResponse(
+        record_id=archived.record_id,
+        timestamp=archived.timestamp,
+        trainer_name=archived.trainer_name,
+        slot=archived.slot,
+        traded=archived.traded,
+        nickname=archived.nickname,
+        ot_name=archived.ot_name,
+        dex_id=archived.pokemon.dex_id,
+        level=archived.pokemon.level,
+    )
+
+
+def _party_key(sp: SimpleParty) -> str:
+    """Hash of the party contents, equal parties get the same key."""
+    return hashlib.sha256(sp.json(sort_keys=True).encode()).hexdigest()
+
+
+async def _simple_party_to_complex(
+    sp: SimpleParty,
+    species: SpeciesRepository,
+) -> Party:
 
     async with asyncio.TaskGroup() as tg:
-        pkm_tasks = [tg.create_task(_simple_pkm_to_complex(pkm)) for pkm in sp.pokemon]
+        pkm_tasks = [
+            tg.create_task(_simple_pkm_to_complex(pkm, species)) for pkm in sp.pokemon
+        ]
 
     return Party(
         trainer_name=sp.trainer_name,
@@ -238,16 +1074,15 @@ async def _simple_party_to_complex(sp: SimpleParty) -> Party:
     )
 
 
-async def _simple_pkm_to_complex(pkm: SimplePokemon) -> Pokemon:
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(
-        None,
-        functools.partial(
-            pokemon_by_id,
-            pkm.dex_id,
-            ivs=EVs(*pkm.ivs) if pkm.ivs else EVs(0, 0, 0, 0, 0),
-            item_held_id=pkm.held_item_id,
-        ),
+async def _simple_pkm_to_complex(
+    pkm: SimplePokemon,
+    species: SpeciesRepository,
+) -> Pokemon:
+    return await species.pokemon_by_id(
+        pkm.dex_id,
+        ivs=EVs(*pkm.ivs) if pkm.ivs else EVs(0, 0, 0, 0, 0),
+        level=pkm.level,
+        item_held_id=pkm.held_item_id,
     )
 
 
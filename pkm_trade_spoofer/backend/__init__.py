@@ -1 +1,2 @@
 from pkm_trade_spoofer.backend.bgb.bgb import BGBBackend
+from pkm_trade_spoofer.backend.pool import BackendInstance, BackendPool
@@ -1,18 +1,35 @@
 import asyncio
-import functools
+import collections
 from typing import Awaitable, Callable, Optional
 
 from pkm_trade_spoofer import logger
-from pkm_trade_spoofer.backend.bgb.bgb_link_server import BGBLinkCableServer
+from pkm_trade_spoofer.backend.bgb.bgb_link_server import (
+    LINK_CLIENT,
+    BGBLinkCableServer,
+    LinkClient,
+)
+from pkm_trade_spoofer.events import EventBus
 from pkm_trade_spoofer.models import Party
+from pkm_trade_spoofer.monitoring import LinkHealthMonitor
+from pkm_trade_spoofer.party_slot import PartySlot
+from pkm_trade_spoofer.party_store import PartyStore
+from pkm_trade_spoofer.profiling import SessionProfiler
+from pkm_trade_spoofer.session_checkpoint import SessionCheckpoint, SessionCheckpoints
+from pkm_trade_spoofer.trade_archive import TradeArchiveWriter
 from pkm_trade_spoofer.trading_state_machine import (
     NotConnectedState,
+    State,
     TradeStateMachineContext,
     TradingPokemonStateMachine,
 )
+from pkm_trade_spoofer.utils.queues import PeekableQueue
 
 LOGGER = logger.get_logger(__name__)
 
+# Seconds a new connection waits for the status packet telling whether it is a
+# client reconnecting, BGB sends it right after the version packet
+_STATUS_TIMEOUT = 1.0
+
 
 class BGBBackend(object):
     def __init__(
@@ -20,37 +37,186 @@ class BGBBackend(object):
         host: str = "127.0.0.1",
         port: int = 8000,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        profiler: Optional[SessionProfiler] = None,
+        monitor: Optional[LinkHealthMonitor] = None,
+        events: Optional[EventBus] = None,
+        store: Optional[PartyStore] = None,
+        archive: Optional[TradeArchiveWriter] = None,
+        reconnect_grace: Optional[float] = None,
     ) -> None:
+        self._events = events
+        self._store = store
+        self._archive = archive
+        self._slot: Optional[PartySlot] = None
+        self._checkpoints = (
+            SessionCheckpoints(reconnect_grace) if reconnect_grace else None
+        )
+        # Live sessions per host, their checkpoints would be ambiguous
+        self._sessions_by_host: collections.Counter[str] = collections.Counter()
         self._server = BGBLinkCableServer(
             host=host,
             port=port,
             loop=loop,
             blocking=False,
+            profiler=profiler,
+            monitor=monitor,
+            events=events,
         )
 
-    async def start(self, party: Party) -> None:
-        await self._server.run(
-            functools.partial(self._master_data_handler_state_machine, party),
-        )
+    async def start(self, party: Party | int, image: Optional[bytes] = None) -> None:
+        """Starts the link server trading the given party.
+
+        `party` can also be the id of a party in the store, its stored image is
+        then sent as is instead of serializing the party again. Same for `image`,
+        the party already serialized.
+        """
+        self._slot = PartySlot(*self._resolve_party(party, image))
+        await self._server.run(self._master_data_handler_state_machine)
 
     async def stop(self) -> None:
         await self._server.stop()
+        self._slot = None
+        if self._checkpoints is not None:
+            self._checkpoints.clear()
+
+    async def swap_party(
+        self,
+        party: Party | int,
+        image: Optional[bytes] = None,
+    ) -> int:
+        """Replaces the party offered by the running server.
+
+        Connected players get it at their next party interchange, without
+        reconnecting.
+
+        Returns:
+            int: Version of the party
+        """
+        if self._slot is None:
+            raise RuntimeError("The backend is not running.")
+        return self._slot.replace(*self._resolve_party(party, image))
+
+    def _resolve_party(
+        self,
+        party: Party | int,
+        image: Optional[bytes] = None,
+    ) -> tuple[Party, bytes | memoryview]:
+        if isinstance(party, int):
+            if self._store is None:
+                raise ValueError("Can not use a stored party without a store.")
+            stored_image = self._store.image(party)
+            return Party.from_bytes(bytearray(stored_image)), stored_image
+
+        return party, image if image is not None else bytes(party.serialize())
 
     async def _master_data_handler_state_machine(
         self,
-        party: Party,
-        reader: asyncio.Queue[int],
+        reader: PeekableQueue[int],
         writer: Callable[[int], Awaitable[None]],
     ) -> None:
-        ctx = TradeStateMachineContext(
-            reader=reader,
-            writer=writer,
-            pkm_party=party,
-        )
+        client = LINK_CLIENT.get()
+        if client is None:
+            await self._run_session(reader, writer, None)
+            return
+
+        self._sessions_by_host[client.host] += 1
+        try:
+            await self._run_session(reader, writer, client)
+        finally:
+            self._sessions_by_host[client.host] -= 1
+            if not self._sessions_by_host[client.host]:
+                del self._sessions_by_host[client.host]
+
+    async def _run_session(
+        self,
+        reader: PeekableQueue[int],
+        writer: Callable[[int], Awaitable[None]],
+        client: Optional[LinkClient],
+    ) -> None:
+        if self._slot is None:
+            raise RuntimeError("The backend is not running.")
+
+        checkpoint = None
+        if client is not None:
+            checkpoint = await self._restore_checkpoint(client)
+
+        initial_state: State
+        if checkpoint is not None:
+            # The client reconnected, continue its session on the new link
+            ctx = checkpoint.context
+            ctx.reader = reader
+            ctx.writer = writer
+            initial_state = checkpoint.state
+            LOGGER.info("Resuming session at %s", initial_state)
+            if self._events is not None:
+                self._events.publish("session_resumed", state=str(initial_state))
+        else:
+            current = self._slot.current
+            pkm_party, party_image = current.checkout()
+            ctx = TradeStateMachineContext(
+                reader=reader,
+                writer=writer,
+                pkm_party=pkm_party,
+                party_image=party_image,
+                events=self._events,
+                archive=self._archive,
+                party_slot=self._slot,
+                party_version=current.version,
+            )
+            initial_state = NotConnectedState()
 
         state_machine = TradingPokemonStateMachine(
-            initial_state=NotConnectedState(),
+            initial_state=initial_state,
             context=ctx,
         )
 
-        await state_machine()
+        try:
+            await state_machine()
+        except asyncio.CancelledError:
+            # The connection is gone, keep the session if the client comes back
+            self._save_checkpoint(client, ctx, state_machine.state)
+            raise
+        except ConnectionError:
+            # Reset while writing to the client, the connection reader sees it
+            # as well and tears down the connection
+            LOGGER.info("Connection lost at %s", state_machine.state)
+            self._save_checkpoint(client, ctx, state_machine.state)
+
+    async def _restore_checkpoint(
+        self,
+        client: LinkClient,
+    ) -> Optional[SessionCheckpoint]:
+        if self._checkpoints is None or client.host not in self._checkpoints:
+            return None
+
+        # Only a client that reconnects by itself can be the one that dropped,
+        # which is only known once it sends its status
+        try:
+            await asyncio.wait_for(client.status_received.wait(), _STATUS_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        if not client.resumable or not self._single_session(client):
+            return None
+        return self._checkpoints.restore(client.host)
+
+    def _save_checkpoint(
+        self,
+        client: Optional[LinkClient],
+        ctx: TradeStateMachineContext,
+        state: Optional[State],
+    ) -> None:
+        if (
+            self._checkpoints is not None
+            and client is not None
+            and client.resumable
+            and self._single_session(client)
+            and state is not None
+            and not isinstance(state, NotConnectedState)
+        ):
+            self._checkpoints.save(client.host, ctx, state)
+
+    def _single_session(self, client: LinkClient) -> bool:
+        # Sessions are told apart by host only. With several clients connected
+        # from the same host, eg. emulators on 127.0.0.1, a reconnecting client
+        # can not be matched with the session it dropped
+        return self._sessions_by_host[client.host] <= 1
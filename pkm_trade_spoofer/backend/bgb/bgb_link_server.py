@@ -1,10 +1,17 @@
 import asyncio
+import contextvars
 import enum
 import functools
 import logging
 import struct
+from dataclasses import dataclass, field
 from typing import Any, Awaitable, Callable, Coroutine, NamedTuple, Optional
 
+from pkm_trade_spoofer.events import SESSION, EventBus
+from pkm_trade_spoofer.monitoring import ConnectionJitter, LinkHealthMonitor
+from pkm_trade_spoofer.profiling import SessionProfiler
+from pkm_trade_spoofer.utils.queues import PeekableQueue
+
 PACKET_SIZE_BYTES = 8
 PACKET_FORMAT = "<4BI"
 LOGGER = logging.getLogger(__name__)
@@ -13,11 +20,35 @@ LOGGER = logging.getLogger(__name__)
 HandlerFn = Callable[["GameBoyPacket"], Awaitable[None]]
 WriterFn = Callable[[int], Awaitable[None]]
 SlaveMasterDataTaskFn = Callable[
-    [asyncio.Queue[int], WriterFn],
+    [PeekableQueue[int], WriterFn],
     Coroutine[Any, Any, None],
 ]
 
 
+@dataclass
+class LinkClient:
+    """Emulator at the other end of a connection, as described by its packets."""
+
+    host: str
+    supports_reconnect: bool = False
+    wants_disconnect: bool = False
+    # Set once the first status packet tells what the client supports
+    status_received: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def resumable(self) -> bool:
+        # A dropped connection is only expected back if the emulator reconnects
+        # by itself and did not choose to leave
+        return self.supports_reconnect and not self.wants_disconnect
+
+
+# Client of the link session the running task belongs to, set by the link server
+LINK_CLIENT: contextvars.ContextVar[Optional[LinkClient]] = contextvars.ContextVar(
+    "LINK_CLIENT",
+    default=None,
+)
+
+
 class GBPacketType(enum.IntEnum):
     VERSION = 1
     JOYPAD_UPDATE = 101
@@ -130,12 +161,16 @@ class BGBLinkCableConnection(object):
         loop: Optional[asyncio.AbstractEventLoop] = None,
         master_data_task_fn: Optional[SlaveMasterDataTaskFn] = None,
         slave_data_task_fn: Optional[SlaveMasterDataTaskFn] = None,
+        jitter: Optional[ConnectionJitter] = None,
+        client: Optional[LinkClient] = None,
     ) -> None:
         self.reader = reader
         self.writer = writer
+        self.client = client
         self._loop = loop or asyncio.get_running_loop()
         self.master_data_task_fn = master_data_task_fn
         self.slave_data_task_fn = slave_data_task_fn
+        self._jitter = jitter
 
         self._handlers: dict[GBPacketType, HandlerFn] = {
             GBPacketType.VERSION: self._handle_version,
@@ -150,11 +185,19 @@ class BGBLinkCableConnection(object):
             k: asyncio.Queue() for k in self._handlers
         }
 
-        self._master_slave_queues: dict[GBPacketType, asyncio.Queue[int]] = {
-            GBPacketType.MASTER: asyncio.Queue(),
-            GBPacketType.SLAVE: asyncio.Queue(),
+        self._master_slave_queues: dict[GBPacketType, PeekableQueue[int]] = {
+            GBPacketType.MASTER: PeekableQueue(),
+            GBPacketType.SLAVE: PeekableQueue(),
         }
 
+        # Set while the emulator runs, writers wait on it while it is paused
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
     async def __call__(self) -> None:
         try:
             await self._run()
@@ -173,39 +216,68 @@ class BGBLinkCableConnection(object):
         await self.writer.write_version()
 
         async with asyncio.TaskGroup() as tg:
-            for k, handler in self._handlers.items():
+            tasks = [
                 tg.create_task(self._handler_tasks(handler, self._queues[k]))
+                for k, handler in self._handlers.items()
+            ]
 
             if self.master_data_task_fn is not None:
-                tg.create_task(
-                    self.master_data_task_fn(
-                        self._master_slave_queues[GBPacketType.MASTER],
-                        self.writer.write_slave,
+                tasks.append(
+                    tg.create_task(
+                        self.master_data_task_fn(
+                            self._master_slave_queues[GBPacketType.MASTER],
+                            self._write_slave,
+                        ),
                     ),
                 )
 
             if self.slave_data_task_fn is not None:
-                tg.create_task(
-                    self.slave_data_task_fn(
-                        self._master_slave_queues[GBPacketType.SLAVE],
-                        self.writer.write_master,
+                tasks.append(
+                    tg.create_task(
+                        self.slave_data_task_fn(
+                            self._master_slave_queues[GBPacketType.SLAVE],
+                            self._write_master,
+                        ),
                     ),
                 )
 
             while True:
                 try:
                     packet = await self.reader.read()
-                except asyncio.IncompleteReadError:
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    # Also a reset connection, eg. after a network blip
                     break
 
                 # Cheat, and say we are exactly in sync with the client
                 self.writer.update_timestamp(packet.timestamp or 0)
 
                 if packet.type_ in {GBPacketType.SLAVE, GBPacketType.MASTER}:
+                    if packet.type_ == GBPacketType.MASTER and self._jitter:
+                        self._jitter.master_received()
                     await self._master_slave_queues[packet.type_].put(packet.b2)
                 else:
                     await self._queues[packet.type_].put(packet)
 
+            # Client is gone, tear down the tasks serving it
+            LOGGER.info("Client disconnected")
+            for t in tasks:
+                t.cancel()
+
+    async def _write_slave(self, data: int) -> None:
+        if self.paused:
+            # Time spent paused is not link latency
+            if self._jitter is not None:
+                self._jitter.discard()
+            await self._resumed.wait()
+
+        if self._jitter is not None:
+            self._jitter.slave_sent()
+        await self.writer.write_slave(data)
+
+    async def _write_master(self, data: int) -> None:
+        await self._resumed.wait()
+        await self.writer.write_master(data)
+
     async def _handler_tasks(
         self,
         handler: HandlerFn,
@@ -217,11 +289,11 @@ class BGBLinkCableConnection(object):
                 await handler(packet)
                 queue.task_done()
         except asyncio.CancelledError:
-            print("Cancelled task:", handler.__name__)
+            LOGGER.debug("Cancelled task: %s", handler.__name__)
 
     async def _handle_version(self, packet: GameBoyPacket) -> None:
         major, minor, patch = packet.b2, packet.b3, packet.b4
-        print(f"Received version packet: {major}.{minor}.{patch}")
+        LOGGER.info("Received version packet: %d.%d.%d", major, minor, patch)
         if (major, minor, patch) != (1, 4, 0):
             raise ValueError(f"Unsupported protocol version {major}.{minor}.{patch}")
 
@@ -234,11 +306,30 @@ class BGBLinkCableConnection(object):
         ...
 
     async def _handle_status(self, packet: GameBoyPacket) -> None:
-        # TODO: stop logic when client is paused
-        print("Received status packet:")
-        print("\tRunning:", (packet.b2 & 1) == 1)
-        print("\tPaused:", (packet.b2 & 2) == 2)
-        print("\tSupports reconnect:", (packet.b2 & 4) == 4)
+        running = (packet.b2 & 1) == 1
+        paused = (packet.b2 & 2) == 2
+        supports_reconnect = (packet.b2 & 4) == 4
+        LOGGER.debug(
+            "Received status packet: running=%s, paused=%s, supports reconnect=%s",
+            running,
+            paused,
+            supports_reconnect,
+        )
+        if self.client is not None:
+            self.client.supports_reconnect = supports_reconnect
+            self.client.status_received.set()
+
+        # The state machine blocks on its next write until the client resumes,
+        # so a paused session does not wake up at all
+        if paused or not running:
+            if not self.paused:
+                LOGGER.info("Client paused")
+                self._resumed.clear()
+            return
+
+        if self.paused:
+            LOGGER.info("Client resumed")
+            self._resumed.set()
 
         # The docs say not to respond to status with status, but not doing this
         # causes link instability. An alternative is to send sync3 packets
@@ -246,7 +337,9 @@ class BGBLinkCableConnection(object):
         await self.writer.write_status()
 
     async def _handle_want_disconnect(self, _: GameBoyPacket) -> None:
-        print("Client has initiated disconnect")
+        LOGGER.info("Client has initiated disconnect")
+        if self.client is not None:
+            self.client.wants_disconnect = True
 
 
 # Implements the BGB link cable protocol
@@ -260,12 +353,18 @@ class BGBLinkCableServer:
         port: int = 8765,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         blocking: bool = True,
+        profiler: Optional[SessionProfiler] = None,
+        monitor: Optional[LinkHealthMonitor] = None,
+        events: Optional[EventBus] = None,
     ) -> None:
         self.host = host
         self.port = port
         self._connections: list[asyncio.Task] = []
         self._loop = loop or asyncio.get_running_loop()
         self._blocking = blocking
+        self._profiler = profiler
+        self._monitor = monitor
+        self._events = events
         self._server: Optional[asyncio.AbstractServer] = None
 
     async def _handle_connection(
@@ -275,14 +374,39 @@ class BGBLinkCableServer:
         master_data_handler: Optional[SlaveMasterDataTaskFn] = None,
         slave_data_handler: Optional[SlaveMasterDataTaskFn] = None,
     ) -> None:
+        peer_host, peer_port, *_ = writer.get_extra_info("peername")
+        session_name = f"{peer_host}:{peer_port}"
+        jitter = None
+        if self._monitor is not None:
+            jitter = self._monitor.track_connection(session_name)
+
+        client = LinkClient(peer_host)
         connection = BGBLinkCableConnection(
             GameBoyLinkStreamReader(reader),
             GameBoyLinkStreamWriter(writer),
             self._loop,
             master_data_handler,
             slave_data_handler,
+            jitter,
+            client,
         )
-        self._connections.append(self._loop.create_task(connection()))
+
+        session: Coroutine[Any, Any, None] = connection()
+        if self._profiler is not None and self._profiler.should_profile(peer_host):
+            session = self._profiler.profile_session(
+                f"session-{peer_host}-{peer_port}",
+                session,
+            )
+
+        task = self._loop.create_task(
+            _run_session(session_name, client, session, self._events),
+        )
+        task.add_done_callback(self._connections.remove)
+        if self._monitor is not None and jitter is not None:
+            task.add_done_callback(
+                functools.partial(_untrack_connection, self._monitor, jitter),
+            )
+        self._connections.append(task)
 
     async def run(
         self,
@@ -300,7 +424,7 @@ class BGBLinkCableServer:
         )
 
         addrs = ", ".join(str(sock.getsockname()) for sock in self._server.sockets)
-        LOGGER.info(f"BGB Server listening at {addrs}")
+        LOGGER.info("BGB Server listening at %s", addrs)
         if self._blocking:
             await self._server.serve_forever()
 
@@ -318,3 +442,30 @@ class BGBLinkCableServer:
         if self._server is not None:
             self._server.close()
             await self._server.wait_closed()
+
+
+async def _run_session(
+    name: str,
+    client: LinkClient,
+    session: Coroutine[Any, Any, None],
+    events: Optional[EventBus],
+) -> None:
+    # Tasks spawned by the session inherit the variables, so their events are
+    # tagged with the session
+    SESSION.set(name)
+    LINK_CLIENT.set(client)
+    if events is not None:
+        events.publish("session_connected")
+    try:
+        await session
+    finally:
+        if events is not None:
+            events.publish("session_disconnected")
+
+
+def _untrack_connection(
+    monitor: LinkHealthMonitor,
+    jitter: ConnectionJitter,
+    _: asyncio.Task,
+) -> None:
+    monitor.untrack_connection(jitter)
@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from pkm_trade_spoofer._types import Backend, BackendTypes
+
+
+@dataclass
+class BackendInstance:
+    id: str
+    type: BackendTypes
+    host: str
+    port: int
+    backend: Backend
+    running: bool = False
+
+
+class BackendPool(object):
+    """Backend instances managed by the API, each one listening on its own port.
+
+    Every instance trades its own party and is started and stopped on its own.
+    The first instance of each type is the default one, used when a request
+    only names the backend type.
+    """
+
+    def __init__(self) -> None:
+        self._instances: dict[str, BackendInstance] = {}
+        self._defaults: dict[BackendTypes, BackendInstance] = {}
+
+    def add(
+        self,
+        type_: BackendTypes,
+        host: str,
+        port: int,
+        backend: Backend,
+    ) -> BackendInstance:
+        instance = BackendInstance(
+            id=f"{type_}-{port}",
+            type=type_,
+            host=host,
+            port=port,
+            backend=backend,
+        )
+        if instance.id in self._instances:
+            raise ValueError(f"Instance {instance.id} already exists")
+
+        self._instances[instance.id] = instance
+        self._defaults.setdefault(type_, instance)
+        return instance
+
+    def get(self, instance_id: str) -> Optional[BackendInstance]:
+        return self._instances.get(instance_id)
+
+    def default(self, type_: BackendTypes) -> Optional[BackendInstance]:
+        return self._defaults.get(type_)
+
+    def is_default(self, instance: BackendInstance) -> bool:
+        return self._defaults.get(instance.type) is instance
+
+    @property
+    def types(self) -> list[BackendTypes]:
+        return list(self._defaults)
+
+    def __iter__(self) -> Iterator[BackendInstance]:
+        return iter(list(self._instances.values()))
+
+    def __len__(self) -> int:
+        return len(self._instances)
@@ -0,0 +1,238 @@
+import asyncio
+import base64
+import collections
+import concurrent.futures
+import json
+import multiprocessing
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from pkm_trade_spoofer.models import EVs, Party, Pokemon
+from pkm_trade_spoofer.pokemon import (
+    SpeciesRecord,
+    SQLiteSpeciesCache,
+    StatTable,
+    bulk_pokemon_from_species,
+    get_pokeapi_url,
+    get_species_cache,
+    pokemon_by_id,
+    set_pokeapi_url,
+    set_species_cache,
+    species_by_id,
+)
+from pkm_trade_spoofer.schemas import SimpleParty
+
+# Parties submitted to the pool and not yet written back. Bounds the memory used
+# by a batch regardless of its size
+DEFAULT_MAX_PENDING = 256
+
+# Parties sent to a worker at once, their stats are computed in a single call
+DEFAULT_CHUNK_SIZE = 32
+
+_Document = tuple[int, str]
+
+# Stats of the species loaded by the worker process, filled as they are used
+_stat_table: Optional[StatTable] = None
+
+
+def create_executor(
+    workers: Optional[int] = None,
+) -> concurrent.futures.ProcessPoolExecutor:
+    """Process pool whose workers look species up like the current process."""
+    cache = get_species_cache()
+    cache_path = cache.path if isinstance(cache, SQLiteSpeciesCache) else None
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        # Forking a process running an event loop and threads is not safe
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(get_pokeapi_url(), cache_path),
+    )
+
+
+def build_party_document(line_no: int, document: str) -> str:
+    """Validates and builds a JSON `SimpleParty`.
+
+    Returns:
+        JSON line with the base64 serialized party image, or with the error if the
+        party could not be built.
+    """
+    return build_party_documents([(line_no, document)])[0]
+
+
+def build_party_documents(documents: list[_Document]) -> list[str]:
+    """Same as `build_party_document` for a chunk of documents.
+
+    The stats of every pokemon in the chunk are looked up with one vectorized
+    call, see `bulk_pokemon_from_species`.
+    """
+    results: dict[int, str] = {}
+    parties: list[tuple[int, SimpleParty, list[SpeciesRecord]]] = []
+    for i, (line_no, document) in enumerate(documents):
+        try:
+            sp = SimpleParty.parse_raw(document)
+            species = [species_by_id(pkm.dex_id) for pkm in sp.pokemon]
+        except Exception as e:
+            results[i] = _error_document(line_no, e)
+        else:
+            parties.append((i, sp, species))
+
+    all_pokemon = bulk_pokemon_from_species(
+        [s for _, _, species in parties for s in species],
+        ivs=[_ivs(pkm.ivs) for _, sp, _ in parties for pkm in sp.pokemon],
+        levels=[pkm.level for _, sp, _ in parties for pkm in sp.pokemon],
+        item_held_ids=[pkm.held_item_id for _, sp, _ in parties for pkm in sp.pokemon],
+        table=_worker_stat_table(),
+    )
+
+    offset = 0
+    for i, sp, species in parties:
+        line_no = documents[i][0]
+        pokemon = all_pokemon[offset : offset + len(species)]
+        offset += len(species)
+        try:
+            image = _party_from_pokemon(sp, pokemon).serialize()
+        except Exception as e:
+            results[i] = _error_document(line_no, e)
+        else:
+            results[i] = json.dumps(
+                {"line": line_no, "party": base64.b64encode(image).decode()},
+            )
+
+    return [results[i] for i in range(len(documents))]
+
+
+def simple_party_to_party(sp: SimpleParty) -> Party:
+    return _party_from_pokemon(
+        sp,
+        [
+            pokemon_by_id(
+                pkm.dex_id,
+                ivs=_ivs(pkm.ivs),
+                level=pkm.level,
+                item_held_id=pkm.held_item_id,
+            )
+            for pkm in sp.pokemon
+        ],
+    )
+
+
+def build_parties(
+    lines: Iterable[str],
+    executor: concurrent.futures.Executor,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """Builds a JSONL stream of parties, yielding the results in input order.
+
+    Parties are sent to the pool in chunks of `chunk_size`.
+    """
+    chunk_size = min(chunk_size, max_pending)
+    max_chunks = max(1, max_pending // chunk_size)
+    pending: collections.deque[
+        concurrent.futures.Future[list[str]]
+    ] = collections.deque()
+    chunk: list[_Document] = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        chunk.append((line_no, line))
+        if len(chunk) < chunk_size:
+            continue
+
+        if len(pending) >= max_chunks:
+            yield from pending.popleft().result()
+        pending.append(executor.submit(build_party_documents, chunk))
+        chunk = []
+
+    if chunk:
+        pending.append(executor.submit(build_party_documents, chunk))
+    while pending:
+        yield from pending.popleft().result()
+
+
+async def build_parties_async(
+    lines: AsyncIterator[str],
+    executor: concurrent.futures.Executor,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[str]:
+    """Same as `build_parties` for an asynchronous stream of lines."""
+    loop = asyncio.get_running_loop()
+    chunk_size = min(chunk_size, max_pending)
+    max_chunks = max(1, max_pending // chunk_size)
+    pending: collections.deque[asyncio.Future[list[str]]] = collections.deque()
+    chunk: list[_Document] = []
+    line_no = 0
+    try:
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+
+            chunk.append((line_no, line))
+            if len(chunk) < chunk_size:
+                continue
+
+            if len(pending) >= max_chunks:
+                for result in await pending.popleft():
+                    yield result
+            pending.append(
+                loop.run_in_executor(executor, build_party_documents, chunk),
+            )
+            chunk = []
+
+        if chunk:
+            pending.append(
+                loop.run_in_executor(executor, build_party_documents, chunk),
+            )
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Splits a stream of bytes into lines."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode()
+
+    if buffer:
+        yield buffer.decode()
+
+
+def _party_from_pokemon(sp: SimpleParty, pokemon: list[Pokemon]) -> Party:
+    return Party(
+        trainer_name=sp.trainer_name,
+        pokemon=pokemon,
+        ots_names=[sp.trainer_name] * 6,
+        pokemon_nicknames=[pkm.nickname for pkm in sp.pokemon],
+    )
+
+
+def _ivs(ivs: Optional[list[int]]) -> EVs:
+    return EVs(*ivs) if ivs else EVs(0, 0, 0, 0, 0)
+
+
+def _error_document(line_no: int, e: Exception) -> str:
+    return json.dumps({"line": line_no, "error": f"{type(e).__name__}: {e}"})
+
+
+def _worker_stat_table() -> StatTable:
+    global _stat_table
+    if _stat_table is None:
+        _stat_table = StatTable()
+    return _stat_table
+
+
+def _init_worker(pokeapi_url: str, cache_path: Optional[Path]) -> None:
+    set_pokeapi_url(pokeapi_url)
+    if cache_path is not None:
+        set_species_cache(SQLiteSpeciesCache(cache_path))
@@ -0,0 +1,102 @@
+import random
+from typing import Iterator, Optional
+
+from pkm_trade_spoofer.models import PP, EVs, Party, Pokemon, Stats
+
+# Magic bytes sent by a Gen II game acting as the link master. Mirrors the
+# constants used by the trading state machine.
+_MASTER_MAGIC = 0x01
+_CONNECTED_MAGIC = 0x61
+_TERMINATOR_MAGIC = 0xFD
+_IN_TRADE_ROOM_MAGIC = 0xD1
+_FIRST_POKEMON_MAGIC = 0x70
+_CONFIRM_MAGIC = 0x72
+
+_RANDOM_SEED_LEN = 10
+_TRADE_ANIMATION_LEN = 4
+
+
+def synthetic_pokemon(dex_id: int, level: int = 5) -> Pokemon:
+    """Builds a valid pokemon without querying PokeAPI."""
+    return Pokemon(
+        dex_id=dex_id,
+        item_held_id=0,
+        moves_ids=[33, 45],
+        moves_pps=[PP(0, current_pps=35), PP(0, current_pps=40)],
+        OT=1234,
+        exp_points=125,
+        evs=EVs(0, 0, 0, 0, 0),
+        ivs=EVs(0, 15, 15, 15, 15),
+        friendship_remaining_egg_cycles=70,
+        pokerus=0,
+        caught_data=0,
+        level=level,
+        status_cond=0,
+        stats=Stats(
+            max_hp=20,
+            hp=20,
+            attack=10,
+            defense=10,
+            speed=10,
+            special_attack=10,
+            special_defense=10,
+        ),
+    )
+
+
+def synthetic_party(trainer_name: str = "GOLD", n_pokemon: int = 6) -> Party:
+    """Builds a full party without querying PokeAPI."""
+    dex_ids = [1, 4, 7, 151, 150, 251][:n_pokemon]
+    return Party(
+        trainer_name=trainer_name,
+        pokemon=[synthetic_pokemon(dex_id) for dex_id in dex_ids],
+        ots_names=[trainer_name] * len(dex_ids),
+        pokemon_nicknames=[f"PKMN{i}" for i in range(len(dex_ids))],
+    )
+
+
+def trade_script(
+    party: Party,
+    n_trades: int = 1,
+    rng: Optional[random.Random] = None,
+) -> Iterator[int]:
+    """Yields the bytes a Gen II game sends, as link master, to trade `n_trades`
+    times with the spoofer.
+
+    The sequence drives the trading state machine through: connect magic, trade
+    room, random seed, party interchange, pokemon selection, trade confirmation
+    and the trade itself.
+    """
+    rng = rng or random.Random(0)
+    serialized_party = party.serialize()
+
+    # Connect and enter the trade room
+    yield from [_MASTER_MAGIC] * 3
+    yield _CONNECTED_MAGIC
+    yield from [_IN_TRADE_ROOM_MAGIC] * 3
+    yield from [_TERMINATOR_MAGIC] * 3
+
+    for _ in range(n_trades):
+        # Random seed interchange
+        yield from (
+            rng.randrange(0, _TERMINATOR_MAGIC) for _ in range(_RANDOM_SEED_LEN)
+        )
+        yield from [_TERMINATOR_MAGIC] * 3
+
+        # Party interchange, then select the first pokemon and confirm
+        yield from serialized_party
+        yield from [_TERMINATOR_MAGIC] * 3
+        yield from [_FIRST_POKEMON_MAGIC] * 3
+        yield from [_CONFIRM_MAGIC] * 3
+
+        # Trade animation
+        yield from [0x00] * _TRADE_ANIMATION_LEN
+        yield from [_TERMINATOR_MAGIC] * 3
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[idx]
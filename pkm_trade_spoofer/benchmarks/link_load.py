@@ -0,0 +1,295 @@
+import asyncio
+import functools
+import multiprocessing
+import multiprocessing.connection
+import struct
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Sequence
+
+from pkm_trade_spoofer._types import EventLoopTypes
+from pkm_trade_spoofer.backend.bgb.bgb_link_server import (
+    PACKET_FORMAT,
+    PACKET_SIZE_BYTES,
+    GameBoyPacket,
+    GBPacketType,
+)
+from pkm_trade_spoofer.benchmarks._common import (
+    percentile,
+    synthetic_party,
+    trade_script,
+)
+from pkm_trade_spoofer.event_loop import new_event_loop, resolve_loop_type
+
+_REPLY_TIMEOUT = 5.0
+
+
+@dataclass
+class LinkLoadReport:
+    """Aggregated results of a link server load test."""
+
+    clients: int
+    trades_per_session: int
+    duration_s: float
+    sessions: int
+    failed_sessions: int
+    trades: int
+    bytes_exchanged: int
+    sessions_per_s: float
+    trades_per_s: float
+    latency_p50_ms: float
+    latency_p99_ms: float
+    server_cpu_s: Optional[float] = None
+    server_cpu_pct: Optional[float] = None
+    # Sessions served per second of server CPU time, ie. by a single busy core
+    sessions_per_core_s: Optional[float] = None
+    event_loop: str = EventLoopTypes.asyncio
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def summary(self) -> str:
+        lines = [
+            f"Event loop: {self.event_loop}",
+            f"Clients: {self.clients} ({self.failed_sessions} failed)",
+            f"Duration: {self.duration_s:.2f}s",
+            f"Sessions/s: {self.sessions_per_s:.2f}",
+            f"Trades/s: {self.trades_per_s:.2f}",
+            f"Byte round-trip p50: {self.latency_p50_ms:.3f}ms",
+            f"Byte round-trip p99: {self.latency_p99_ms:.3f}ms",
+        ]
+        if self.server_cpu_s is not None:
+            lines.append(
+                f"Server CPU: {self.server_cpu_s:.2f}s ({self.server_cpu_pct:.1f}%)",
+            )
+        if self.sessions_per_core_s is not None:
+            lines.append(f"Sessions/s per core: {self.sessions_per_core_s:.2f}")
+        return "\n".join(lines)
+
+
+@dataclass
+class _SessionResult:
+    trades: int = 0
+    bytes_exchanged: int = 0
+    latencies: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+class SimulatedBGBClient(object):
+    """Minimal BGB emulator acting as link master for a scripted GSC trade."""
+
+    def __init__(self, host: str, port: int, trades: int = 1) -> None:
+        self.host = host
+        self.port = port
+        self.trades = trades
+        self._replies: asyncio.Queue[float] = asyncio.Queue()
+        self._timestamp = 0
+
+    async def __call__(self) -> _SessionResult:
+        result = _SessionResult()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError as e:
+            result.error = f"Connection failed: {e}"
+            return result
+
+        read_task = asyncio.create_task(self._read_loop(reader))
+        try:
+            await self._handshake(writer)
+            await self._trade(writer, result)
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            result.error = f"{e.__class__.__name__}: {e}"
+        finally:
+            read_task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+        return result
+
+    async def _handshake(self, writer: asyncio.StreamWriter) -> None:
+        self._send(writer, GameBoyPacket(GBPacketType.VERSION, 1, 4, 0))
+        self._send(writer, GameBoyPacket(GBPacketType.STATUS, 1 | 4))
+        self._send(writer, GameBoyPacket(GBPacketType.SYNC3, 0))
+        await writer.drain()
+
+    async def _trade(
+        self,
+        writer: asyncio.StreamWriter,
+        result: _SessionResult,
+    ) -> None:
+        party = synthetic_party(trainer_name="SILVER")
+
+        for data in trade_script(party, n_trades=self.trades):
+            # Discard replies that were not triggered by the previous byte
+            while not self._replies.empty():
+                self._replies.get_nowait()
+
+            sent_at = time.perf_counter()
+            self._send(writer, GameBoyPacket(GBPacketType.MASTER, data, 0x81))
+            await writer.drain()
+            received_at = await asyncio.wait_for(self._replies.get(), _REPLY_TIMEOUT)
+            result.latencies.append(received_at - sent_at)
+            result.bytes_exchanged += 1
+
+        result.trades = self.trades
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            data = await reader.readexactly(PACKET_SIZE_BYTES)
+            packet = GameBoyPacket(*struct.unpack(PACKET_FORMAT, data))
+            if packet.type_ == GBPacketType.SLAVE:
+                self._replies.put_nowait(time.perf_counter())
+
+    def _send(self, writer: asyncio.StreamWriter, packet: GameBoyPacket) -> None:
+        self._timestamp += 1
+        writer.write(
+            struct.pack(
+                PACKET_FORMAT,
+                packet.type_,
+                packet.b2,
+                packet.b3,
+                packet.b4,
+                self._timestamp,
+            ),
+        )
+
+
+async def run_clients(
+    host: str,
+    port: int,
+    clients: int,
+    trades_per_session: int = 1,
+) -> tuple[list[_SessionResult], float]:
+    """Runs `clients` simulated emulators concurrently against a link server."""
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            SimulatedBGBClient(host, port, trades=trades_per_session)()
+            for _ in range(clients)
+        ),
+    )
+    return list(results), time.perf_counter() - start
+
+
+def run_link_load(
+    clients: int = 10,
+    trades_per_session: int = 1,
+    host: str = "127.0.0.1",
+    port: int = 9999,
+    spawn_server: bool = True,
+    event_loop: EventLoopTypes = EventLoopTypes.asyncio,
+) -> LinkLoadReport:
+    """Runs a load test against a BGB link server.
+
+    If `spawn_server` is set, a server is started in a child process listening at
+    `host:port` so its CPU usage can be reported. Otherwise, the clients connect
+    to an already running server. Both the spawned server and the clients run
+    `event_loop` loops.
+    """
+    event_loop = resolve_loop_type(event_loop)
+    server: Optional[_ServerProcess] = None
+    if spawn_server:
+        server = _ServerProcess(host, port, event_loop)
+        server.start()
+
+    try:
+        loop_factory = functools.partial(new_event_loop, event_loop)
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            results, duration = runner.run(
+                run_clients(host, port, clients, trades_per_session),
+            )
+    finally:
+        server_cpu = server.stop() if server is not None else None
+
+    ok = [r for r in results if r.error is None]
+    latencies = sorted(lat for r in ok for lat in r.latencies)
+    trades = sum(r.trades for r in ok)
+    return LinkLoadReport(
+        clients=clients,
+        trades_per_session=trades_per_session,
+        duration_s=duration,
+        sessions=len(ok),
+        failed_sessions=len(results) - len(ok),
+        trades=trades,
+        bytes_exchanged=sum(r.bytes_exchanged for r in ok),
+        sessions_per_s=len(ok) / duration,
+        trades_per_s=trades / duration,
+        latency_p50_ms=percentile(latencies, 50) * 1000,
+        latency_p99_ms=percentile(latencies, 99) * 1000,
+        server_cpu_s=server_cpu,
+        server_cpu_pct=server_cpu / duration * 100 if server_cpu is not None else None,
+        sessions_per_core_s=len(ok) / server_cpu if server_cpu else None,
+        event_loop=event_loop,
+        errors=sorted({r.error for r in results if r.error is not None}),
+    )
+
+
+def format_comparison(reports: Sequence[LinkLoadReport]) -> str:
+    """Table comparing the latency and throughput of several runs."""
+    lines = [
+        f"{'Event loop':<12} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'Sessions/s':>11} {'Sessions/s per core':>20}",
+    ]
+    for r in reports:
+        per_core = (
+            f"{r.sessions_per_core_s:>20.2f}"
+            if r.sessions_per_core_s is not None
+            else f"{'-':>20}"
+        )
+        lines.append(
+            f"{r.event_loop:<12} {r.latency_p50_ms:>8.3f} {r.latency_p99_ms:>8.3f} "
+            f"{r.sessions_per_s:>11.2f} {per_core}",
+        )
+    return "\n".join(lines)
+
+
+class _ServerProcess(object):
+    """BGB link server running in a child process, reporting its CPU time."""
+
+    def __init__(self, host: str, port: int, event_loop: EventLoopTypes) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_serve,
+            args=(host, port, event_loop, child_conn),
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._process.start()
+        # Wait until the server is listening
+        self._conn.recv()
+
+    def stop(self) -> float:
+        self._conn.send("stop")
+        cpu_time: float = self._conn.recv()
+        self._process.join()
+        return cpu_time
+
+
+def _serve(
+    host: str,
+    port: int,
+    event_loop: EventLoopTypes,
+    conn: multiprocessing.connection.Connection,
+) -> None:
+    from pkm_trade_spoofer.backend import BGBBackend
+
+    async def serve() -> None:
+        loop = asyncio.get_running_loop()
+        backend = BGBBackend(host, port, loop)
+        await backend.start(synthetic_party())
+        conn.send("ready")
+
+        await loop.run_in_executor(None, conn.recv)
+        await backend.stop()
+
+    with asyncio.Runner(
+        loop_factory=functools.partial(new_event_loop, event_loop)
+    ) as r:
+        r.run(serve())
+    conn.send(time.process_time())
@@ -0,0 +1,300 @@
+import asyncio
+import json
+import platform
+import random
+import statistics
+import struct
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from pkm_trade_spoofer import utils
+from pkm_trade_spoofer.backend.bgb.bgb_link_server import (
+    PACKET_FORMAT,
+    GameBoyPacket,
+    GBPacketType,
+)
+from pkm_trade_spoofer.benchmarks._common import synthetic_party, trade_script
+from pkm_trade_spoofer.models import EVs, Party, PartyStreamParser
+from pkm_trade_spoofer.pokemon import SpeciesRecord, StatTable, pokemon_from_species
+from pkm_trade_spoofer.pokemon.testing import (
+    fake_pokemon_payload,
+    fake_pokemon_species_payload,
+)
+from pkm_trade_spoofer.trading_state_machine import (
+    NotConnectedState,
+    TradeStateMachineContext,
+    TradingPokemonStateMachine,
+)
+
+# Minimum time spent on each timing sample, used to calibrate the loop count
+_MIN_SAMPLE_TIME = 0.05
+
+# Pokemon built per call by the bulk stats benchmarks
+_BULK_SIZE = 4096
+
+BenchmarkFn = Callable[[], object]
+
+# The callable to be timed, optionally along with the one releasing what the
+# setup acquired
+BenchmarkSetup = Callable[[], BenchmarkFn | tuple[BenchmarkFn, Callable[[], None]]]
+
+_BENCHMARKS: dict[str, BenchmarkSetup] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkSetup], BenchmarkSetup]:
+    """Registers a benchmark.
+
+    The decorated function runs the setup and returns the callable to be timed.
+    If the setup acquires resources (eg. an event loop), it returns a cleanup
+    function as well, called once the benchmark is timed.
+    """
+
+    def decorator(setup: BenchmarkSetup) -> BenchmarkSetup:
+        _BENCHMARKS[name] = setup
+        return setup
+
+    return decorator
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    loops: int
+    repeat: int
+    min_ns: float
+    median_ns: float
+    mean_ns: float
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_ns / self.baseline_ns
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.baseline_ns:.0f}ns -> {self.current_ns:.0f}ns "
+            f"(+{(self.ratio - 1) * 100:.1f}%)"
+        )
+
+
+def run_benchmarks(
+    repeat: int = 5,
+    only: Optional[list[str]] = None,
+) -> list[BenchmarkResult]:
+    """Times every registered benchmark (or the ones named in `only`)."""
+    results = []
+    for name, setup in _BENCHMARKS.items():
+        if only and name not in only:
+            continue
+
+        fn = setup()
+        cleanup: Optional[Callable[[], None]] = None
+        if isinstance(fn, tuple):
+            fn, cleanup = fn
+
+        try:
+            loops = _calibrate(fn)
+            samples = [_time(fn, loops) / loops for _ in range(repeat)]
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+        results.append(
+            BenchmarkResult(
+                name=name,
+                loops=loops,
+                repeat=repeat,
+                min_ns=min(samples) * 1e9,
+                median_ns=statistics.median(samples) * 1e9,
+                mean_ns=statistics.fmean(samples) * 1e9,
+            ),
+        )
+    return results
+
+
+def save_results(results: list[BenchmarkResult], path: Path) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": [asdict(r) for r in results],
+            },
+            indent=2,
+        ),
+    )
+
+
+def load_results(path: Path) -> list[BenchmarkResult]:
+    return [BenchmarkResult(**r) for r in json.loads(path.read_text())["results"]]
+
+
+def compare_results(
+    baseline: list[BenchmarkResult],
+    current: list[BenchmarkResult],
+    threshold: float = 0.1,
+) -> list[Regression]:
+    """Lists the benchmarks whose median got slower than `threshold` (a ratio)."""
+    baseline_by_name = {r.name: r for r in baseline}
+    return [
+        Regression(r.name, baseline_by_name[r.name].median_ns, r.median_ns)
+        for r in current
+        if r.name in baseline_by_name
+        and r.median_ns > baseline_by_name[r.name].median_ns * (1 + threshold)
+    ]
+
+
+def _calibrate(fn: BenchmarkFn) -> int:
+    loops = 1
+    while True:
+        if _time(fn, loops) >= _MIN_SAMPLE_TIME:
+            return loops
+        loops *= 2
+
+
+def _time(fn: BenchmarkFn, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return time.perf_counter() - start
+
+
+@benchmark("party.serialize")
+def _party_serialize() -> BenchmarkFn:
+    party = synthetic_party()
+    return party.serialize
+
+
+@benchmark("party.from_bytes")
+def _party_from_bytes() -> BenchmarkFn:
+    # `Party.from_bytes` consumes its input, so a copy is done on every call
+    serialized = synthetic_party().serialize()
+    return lambda: Party.from_bytes(bytearray(serialized))
+
+
+@benchmark("party_stream_parser.feed")
+def _party_stream_parser_feed() -> BenchmarkFn:
+    serialized = synthetic_party().serialize()
+    parser = PartyStreamParser()
+
+    def parse() -> Party:
+        parser.reset()
+        for b in serialized:
+            parser.feed(b)
+        return parser.party()
+
+    return parse
+
+
+@benchmark("pokemon.to_bytes")
+def _pokemon_to_bytes() -> BenchmarkFn:
+    pokemon = synthetic_party().pokemon[0]
+    return pokemon.to_bytes
+
+
+@benchmark("pokestr.roundtrip")
+def _pokestr_roundtrip() -> BenchmarkFn:
+    def roundtrip() -> str:
+        return utils.pokemon.pokestr_to_python_str(
+            bytearray(utils.pokemon.python_text_to_pokestr("CHARMANDER")),
+        )
+
+    return roundtrip
+
+
+@benchmark("gameboy_packet.pack_unpack")
+def _gameboy_packet_pack_unpack() -> BenchmarkFn:
+    packet = GameBoyPacket(GBPacketType.MASTER, 0x61, 0x81, 0, 123456)
+
+    def pack_unpack() -> GameBoyPacket:
+        data = struct.pack(
+            PACKET_FORMAT,
+            packet.type_,
+            packet.b2,
+            packet.b3,
+            packet.b4,
+            packet.timestamp or 0,
+        )
+        return GameBoyPacket(*struct.unpack(PACKET_FORMAT, data))
+
+    return pack_unpack
+
+
+@benchmark("state_machine.trade")
+def _state_machine_trade() -> tuple[BenchmarkFn, Callable[[], None]]:
+    runner = asyncio.Runner()
+    script = list(trade_script(synthetic_party(trainer_name="SILVER")))
+
+    async def trade() -> None:
+        reader: utils.queues.PeekableQueue[int] = utils.queues.PeekableQueue()
+        for data in script:
+            reader.put_nowait(data)
+
+        sent: list[int] = []
+
+        async def writer(data: int) -> None:
+            sent.append(data)
+
+        state_machine = TradingPokemonStateMachine(
+            initial_state=NotConnectedState(),
+            context=TradeStateMachineContext(
+                reader=reader,
+                writer=writer,
+                pkm_party=synthetic_party(),
+            ),
+        )
+        task = asyncio.create_task(state_machine())
+        await reader.join()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    return lambda: runner.run(trade()), runner.close
+
+
+def _fake_species() -> list[SpeciesRecord]:
+    return [
+        SpeciesRecord.from_pokeapi(
+            fake_pokemon_payload(dex_id),
+            fake_pokemon_species_payload(dex_id),
+        )
+        for dex_id in range(1, 252)
+    ]
+
+
+def _bulk_inputs() -> tuple[list[int], list[int], list[list[int]]]:
+    rng = random.Random(0)
+    dex_ids = [rng.randint(1, 251) for _ in range(_BULK_SIZE)]
+    levels = [rng.randint(1, 100) for _ in range(_BULK_SIZE)]
+    ivs = [[rng.randint(0, 15) for _ in range(5)] for _ in range(_BULK_SIZE)]
+    return dex_ids, levels, ivs
+
+
+@benchmark("stat_table.bulk_stats")
+def _stat_table_bulk_stats() -> BenchmarkFn:
+    table = StatTable.from_species(_fake_species())
+    dex_ids, levels, ivs = _bulk_inputs()
+    return lambda: table.bulk_stats(dex_ids, levels, ivs)
+
+
+@benchmark("pokemon_from_species.scalar_bulk")
+def _pokemon_from_species_scalar_bulk() -> BenchmarkFn:
+    """Same work as `stat_table.bulk_stats`, one pokemon at a time."""
+    species = {s.dex_id: s for s in _fake_species()}
+    dex_ids, levels, ivs = _bulk_inputs()
+
+    def build() -> None:
+        for dex_id, level, pkm_ivs in zip(dex_ids, levels, ivs):
+            pokemon_from_species(species[dex_id], ivs=EVs(*pkm_ivs), level=level)
+
+    return build
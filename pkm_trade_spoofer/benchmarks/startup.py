@@ -0,0 +1,105 @@
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+DEFAULT_MODULES = (
+    "pkm_trade_spoofer.logger",
+    "pkm_trade_spoofer.trading_state_machine",
+    "pkm_trade_spoofer.backend",
+    "pkm_trade_spoofer.api",
+)
+
+# Modules each CLI command imports before doing its work, keep it in sync with
+# the imports of the commands in `cli`
+COMMAND_MODULES = {
+    "api": (
+        "pkm_trade_spoofer.cli",
+        "pkm_trade_spoofer.api",
+        "pkm_trade_spoofer.backend",
+        "pkm_trade_spoofer.events",
+        "pkm_trade_spoofer.event_loop",
+        "pkm_trade_spoofer.profiling",
+        "pkm_trade_spoofer.monitoring",
+    ),
+    "bgb": (
+        "pkm_trade_spoofer.cli",
+        "pkm_trade_spoofer.backend",
+        "pkm_trade_spoofer.pokemon",
+        "pkm_trade_spoofer.event_loop",
+        "pkm_trade_spoofer.profiling",
+        "pkm_trade_spoofer.monitoring",
+    ),
+    "batch": ("pkm_trade_spoofer.cli", "pkm_trade_spoofer.batch"),
+}
+
+# `python -X importtime` line: "import time: <self us> | <cumulative us> | <name>",
+# nested imports are indented two spaces per level
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    repeat: int
+    min_us: float
+    median_us: float
+
+
+def import_time_us(*modules: str) -> int:
+    """Time taken to import `modules` in a fresh interpreter, in microseconds."""
+    statement = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Whatever the statement imports is nested under the top level lines of the
+    # packages it names, the rest are the interpreter startup imports
+    packages = {module.split(".")[0] for module in modules}
+    cumulative = [
+        int(match.group(2))
+        for match in map(_IMPORT_TIME_LINE.match, proc.stderr.splitlines())
+        if match is not None
+        and not match.group(3)
+        and match.group(4).split(".")[0] in packages
+    ]
+    if not cumulative:
+        raise ValueError(f"Import time of {', '.join(modules)} not found")
+    return sum(cumulative)
+
+
+def measure_imports(
+    modules: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+) -> list[ImportTiming]:
+    """Times importing each module in a fresh interpreter `repeat` times."""
+    return [
+        _measure(module, (module,), repeat) for module in modules or DEFAULT_MODULES
+    ]
+
+
+def measure_commands(
+    commands: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+) -> list[ImportTiming]:
+    """Times the imports of each CLI command in a fresh interpreter."""
+    timings = []
+    for command in commands or COMMAND_MODULES:
+        if command not in COMMAND_MODULES:
+            raise ValueError(f"Unknown command {command}")
+        timings.append(_measure(command, COMMAND_MODULES[command], repeat))
+    return timings
+
+
+def _measure(name: str, modules: Sequence[str], repeat: int) -> ImportTiming:
+    samples = [import_time_us(*modules) for _ in range(repeat)]
+    return ImportTiming(
+        module=name,
+        repeat=repeat,
+        min_us=min(samples),
+        median_us=statistics.median(samples),
+    )
@@ -1,39 +1,34 @@
 import asyncio
 import functools
+import json
 import logging
 import signal
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
 
 import typer
 
-from pkm_trade_spoofer import ManagementAPI, logger
-from pkm_trade_spoofer._types import Backend, BackendTypes
-from pkm_trade_spoofer.backend import BGBBackend
-from pkm_trade_spoofer.models import EVs, Party
-from pkm_trade_spoofer.pokemon import pokemon_by_id
+from pkm_trade_spoofer import logger
+from pkm_trade_spoofer._types import EventLoopTypes
+from pkm_trade_spoofer.party_store import DEFAULT_STORE_PATH
 
-app = typer.Typer(name="Pokemon GSC Trade Spoofer", no_args_is_help=True)
+# Each command imports what it needs when it runs, so the commands that do not
+# use the API or the species lookup start without importing them
+if TYPE_CHECKING:
+    from pkm_trade_spoofer.models import Party
+    from pkm_trade_spoofer.monitoring import LinkHealthMonitor
 
+app = typer.Typer(name="Pokemon GSC Trade Spoofer", no_args_is_help=True)
 
-PARTY = Party(
-    trainer_name="GOLD",
-    pokemon=[
-        pokemon_by_id(1, ivs=EVs(15, 15, 15, 15, 15)),
-        pokemon_by_id(4, ivs=EVs(15, 15, 15, 15, 15)),
-        pokemon_by_id(7, ivs=EVs(15, 15, 15, 15, 15)),
-        pokemon_by_id(151, ivs=EVs(15, 15, 15, 15, 15)),
-        pokemon_by_id(150, ivs=EVs(15, 15, 15, 15, 15)),
-        pokemon_by_id(251, ivs=EVs(15, 15, 15, 15, 15)),
-    ],
-    ots_names=["GOLD"] * 6,
-    pokemon_nicknames=[
-        "Bulbasaur",
-        "Charmander",
-        "Squirtle",
-        "Gatito",
-        "Gato",
-        "Hoja",
-    ],
+_PROFILE_DIR_HELP = "Directory where a pstats file per profiled session is written."
+_PROFILE_PEER_HELP = "Only profile sessions coming from this host."
+_MONITOR_HELP = "Warn when the event loop or the link replies are lagging."
+_PARTY_STORE_HELP = "File where parties are stored to be started by id."
+_ARCHIVE_HELP = "Keep the pokemon received in trades in this file."
+_EVENT_LOOP_HELP = "Event loop implementation, uvloop falls back to asyncio if missing."
+_RECONNECT_GRACE_HELP = (
+    "Seconds the trade session of a dropped client is kept to resume it if the "
+    "client reconnects from the same host, 0 to disable."
 )
 
 
@@ -43,18 +38,82 @@ def admin_api_cmd(
     port: int = 8000,
     bgb_host: str = "127.0.0.1",
     bgb_port: int = 9999,
+    bgb_instances: int = typer.Option(
+        1,
+        min=1,
+        help="BGB link servers, listening at consecutive ports from --bgb-port.",
+    ),
     secret: str = "",
+    profile: bool = typer.Option(False, help="Profile each link session."),
+    profile_dir: Path = typer.Option(Path("logs/profiles"), help=_PROFILE_DIR_HELP),
+    profile_peer: Optional[str] = typer.Option(None, help=_PROFILE_PEER_HELP),
+    monitor: bool = typer.Option(True, help=_MONITOR_HELP),
+    warm_up: bool = typer.Option(
+        False,
+        help="Prefetch all Gen II species in background when starting.",
+    ),
+    party_store: Path = typer.Option(DEFAULT_STORE_PATH, help=_PARTY_STORE_HELP),
+    event_loop: EventLoopTypes = typer.Option(
+        EventLoopTypes.asyncio,
+        help=_EVENT_LOOP_HELP,
+    ),
+    archive: Optional[Path] = typer.Option(None, help=_ARCHIVE_HELP),
+    reconnect_grace: float = typer.Option(0.0, min=0, help=_RECONNECT_GRACE_HELP),
 ) -> None:
+    logger.setup_logging()
     cli_logger = logger.get_logger(__name__)
     cli_logger.setLevel(logging.INFO)
 
-    loop = _setup_event_loop(cli_logger)
+    from pkm_trade_spoofer._types import BackendTypes
+    from pkm_trade_spoofer.api import ManagementAPI
+    from pkm_trade_spoofer.backend import BackendPool, BGBBackend
+    from pkm_trade_spoofer.events import EventBus
+    from pkm_trade_spoofer.party_store import PartyStore
+    from pkm_trade_spoofer.profiling import SessionProfiler
+    from pkm_trade_spoofer.trade_archive import TradeArchive, TradeArchiveWriter
+
+    loop = _setup_event_loop(cli_logger, event_loop)
+    link_monitor = _setup_link_monitor(loop) if monitor else None
 
-    backends: dict[BackendTypes, Backend] = {
-        BackendTypes.bgb_emulator: BGBBackend(bgb_host, bgb_port, loop),
-    }
+    profiler = SessionProfiler(profile_dir, enabled=profile, peer=profile_peer)
+    events = EventBus()
+    store = PartyStore(party_store)
+    trade_archive = TradeArchive(archive) if archive is not None else None
+    archive_writer = (
+        TradeArchiveWriter(trade_archive) if trade_archive is not None else None
+    )
+    backends = BackendPool()
+    for bgb_instance_port in range(bgb_port, bgb_port + bgb_instances):
+        backends.add(
+            BackendTypes.bgb_emulator,
+            bgb_host,
+            bgb_instance_port,
+            BGBBackend(
+                bgb_host,
+                bgb_instance_port,
+                loop,
+                profiler,
+                link_monitor,
+                events,
+                store,
+                archive_writer,
+                reconnect_grace,
+            ),
+        )
 
-    admin_api = ManagementAPI(backends, loop=loop, host=host, port=port, secret=secret)
+    admin_api = ManagementAPI(
+        backends,
+        loop=loop,
+        host=host,
+        port=port,
+        secret=secret,
+        profiler=profiler,
+        monitor=link_monitor,
+        warm_up=warm_up,
+        events=events,
+        party_store=store,
+        archive=trade_archive,
+    )
     try:
         admin_api.start()
     except KeyboardInterrupt:
@@ -62,6 +121,12 @@ def admin_api_cmd(
     finally:
         cli_logger.info("Graceful shutdown...")
         admin_api.stop()
+        store.close()
+        if archive_writer is not None:
+            loop.run_until_complete(archive_writer.close())
+            archive_writer.archive.close()
+        if link_monitor is not None:
+            link_monitor.stop()
         loop.close()
 
 
@@ -69,28 +134,219 @@ def admin_api_cmd(
 def bgb_cmd(
     host: str = "127.0.0.1",
     port: int = 8000,
+    profile: bool = typer.Option(False, help="Profile each link session."),
+    profile_dir: Path = typer.Option(Path("logs/profiles"), help=_PROFILE_DIR_HELP),
+    profile_peer: Optional[str] = typer.Option(None, help=_PROFILE_PEER_HELP),
+    monitor: bool = typer.Option(True, help=_MONITOR_HELP),
+    party_id: Optional[int] = typer.Option(
+        None,
+        help="Trade this stored party instead of the default one.",
+    ),
+    party_store: Path = typer.Option(DEFAULT_STORE_PATH, help=_PARTY_STORE_HELP),
+    event_loop: EventLoopTypes = typer.Option(
+        EventLoopTypes.asyncio,
+        help=_EVENT_LOOP_HELP,
+    ),
+    archive: Optional[Path] = typer.Option(None, help=_ARCHIVE_HELP),
+    reconnect_grace: float = typer.Option(0.0, min=0, help=_RECONNECT_GRACE_HELP),
 ) -> None:
+    logger.setup_logging()
     cli_logger = logger.get_logger(__name__)
     cli_logger.setLevel(logging.INFO)
 
-    loop = _setup_event_loop(cli_logger)
+    from pkm_trade_spoofer.backend import BGBBackend
+    from pkm_trade_spoofer.party_store import PartyStore
+    from pkm_trade_spoofer.profiling import SessionProfiler
+    from pkm_trade_spoofer.trade_archive import TradeArchive, TradeArchiveWriter
 
-    backend = BGBBackend(host, port, loop)
+    party = _default_party() if party_id is None else party_id
+    loop = _setup_event_loop(cli_logger, event_loop)
+    link_monitor = _setup_link_monitor(loop) if monitor else None
+
+    profiler = SessionProfiler(profile_dir, enabled=profile, peer=profile_peer)
+    store = PartyStore(party_store) if party_id is not None else None
+    archive_writer = (
+        TradeArchiveWriter(TradeArchive(archive)) if archive is not None else None
+    )
+    backend = BGBBackend(
+        host,
+        port,
+        loop,
+        profiler,
+        link_monitor,
+        store=store,
+        archive=archive_writer,
+        reconnect_grace=reconnect_grace,
+    )
 
     try:
-        loop.run_until_complete(backend.start(PARTY))
+        loop.run_until_complete(backend.start(party))
         loop.run_forever()
     except KeyboardInterrupt:
         cli_logger.info("Stopping spoofer with CTRL+C")
     finally:
         cli_logger.info("Graceful shutdown...")
         loop.run_until_complete(backend.stop())
+        if store is not None:
+            store.close()
+        if archive_writer is not None:
+            loop.run_until_complete(archive_writer.close())
+            archive_writer.archive.close()
+        if link_monitor is not None:
+            link_monitor.stop()
         loop.close()
 
 
-def _setup_event_loop(cli_logger: logging.Logger) -> asyncio.AbstractEventLoop:
-    cli_logger.info("Setting up asynchronous loop...")
-    loop = asyncio.new_event_loop()
+@app.command("batch")
+def batch_cmd(
+    parties: typer.FileText = typer.Argument(
+        "-",
+        help="JSONL file with a party per line, stdin by default.",
+    ),
+    output: typer.FileTextWrite = typer.Option("-", help="Where results are written."),
+    workers: Optional[int] = typer.Option(None, help="Worker processes."),
+    max_pending: Optional[int] = typer.Option(
+        None,
+        help="Parties being built at the same time, 256 by default.",
+    ),
+) -> None:
+    """Builds the parties of a JSONL file, writing one result per line."""
+    from pkm_trade_spoofer import batch
+
+    max_pending = max_pending or batch.DEFAULT_MAX_PENDING
+    with batch.create_executor(workers) as executor:
+        for result in batch.build_parties(parties, executor, max_pending=max_pending):
+            output.write(f"{result}\n")
+
+
+@app.command("bench-link")
+def bench_link_cmd(
+    clients: int = typer.Option(10, help="Number of simulated BGB emulators."),
+    trades: int = typer.Option(1, help="Trades performed by each emulator."),
+    host: str = "127.0.0.1",
+    port: int = 9999,
+    spawn_server: bool = typer.Option(
+        True,
+        help="Start a local link server instead of using a running one.",
+    ),
+    event_loop: list[EventLoopTypes] = typer.Option(
+        [EventLoopTypes.asyncio],
+        help="Event loop of the server and the emulators, repeat it to compare.",
+    ),
+    output: Optional[Path] = typer.Option(None, help="Write results as JSON."),
+) -> None:
+    from pkm_trade_spoofer.benchmarks.link_load import (
+        format_comparison,
+        run_link_load,
+    )
+
+    reports = []
+    for loop_type in event_loop:
+        report = run_link_load(
+            clients=clients,
+            trades_per_session=trades,
+            host=host,
+            port=port,
+            spawn_server=spawn_server,
+            event_loop=loop_type,
+        )
+        typer.echo(report.summary())
+        for error in report.errors:
+            typer.echo(f"Error: {error}", err=True)
+        reports.append(report)
+
+    if len(reports) > 1:
+        typer.echo(format_comparison(reports))
+
+    if output is not None:
+        results = [r.to_dict() for r in reports]
+        output.write_text(
+            json.dumps(results[0] if len(results) == 1 else results, indent=2)
+        )
+
+
+@app.command("bench-micro")
+def bench_micro_cmd(
+    repeat: int = typer.Option(5, help="Timing samples taken per benchmark."),
+    only: Optional[list[str]] = typer.Option(None, help="Benchmarks to run."),
+    output: Optional[Path] = typer.Option(None, help="Write results as JSON."),
+    baseline: Optional[Path] = typer.Option(
+        None,
+        help="JSON results of a previous run to compare against.",
+    ),
+    threshold: float = typer.Option(
+        0.1,
+        help="Allowed slowdown ratio with respect to the baseline.",
+    ),
+) -> None:
+    from pkm_trade_spoofer.benchmarks import micro
+
+    results = micro.run_benchmarks(repeat=repeat, only=only)
+    for r in results:
+        typer.echo(f"{r.name:<32} {r.median_ns:>12.0f} ns/op (min {r.min_ns:.0f})")
+
+    if output is not None:
+        micro.save_results(results, output)
+
+    if baseline is not None:
+        regressions = micro.compare_results(
+            micro.load_results(baseline),
+            results,
+            threshold=threshold,
+        )
+        for regression in regressions:
+            typer.echo(f"Regression: {regression}", err=True)
+        if regressions:
+            raise typer.Exit(code=1)
+
+
+@app.command("bench-startup")
+def bench_startup_cmd(
+    module: Optional[list[str]] = typer.Option(None, help="Modules to import."),
+    command: Optional[list[str]] = typer.Option(
+        None,
+        help="Time the imports of these commands instead of modules.",
+    ),
+    repeat: int = typer.Option(5, help="Imports timed per module."),
+    budget_ms: Optional[float] = typer.Option(
+        None,
+        help="Fail if the median import time of any of them exceeds it.",
+    ),
+) -> None:
+    """Times importing the package modules in fresh interpreters."""
+    from pkm_trade_spoofer.benchmarks import startup
+
+    if command:
+        timings = startup.measure_commands(command, repeat=repeat)
+    else:
+        timings = startup.measure_imports(module, repeat=repeat)
+
+    for t in timings:
+        typer.echo(
+            f"{t.module:<48} {t.median_us / 1000:>8.1f} ms (min {t.min_us / 1000:.1f})",
+        )
+
+    if budget_ms is not None:
+        over_budget = [t for t in timings if t.median_us > budget_ms * 1000]
+        for t in over_budget:
+            typer.echo(
+                f"Over budget: {t.module} takes {t.median_us / 1000:.1f} ms, "
+                f"the budget is {budget_ms:.1f} ms",
+                err=True,
+            )
+        if over_budget:
+            raise typer.Exit(code=1)
+
+
+def _setup_event_loop(
+    cli_logger: logging.Logger,
+    loop_type: EventLoopTypes = EventLoopTypes.asyncio,
+) -> asyncio.AbstractEventLoop:
+    from pkm_trade_spoofer.event_loop import new_event_loop, resolve_loop_type
+
+    loop_type = resolve_loop_type(loop_type)
+    cli_logger.info(f"Setting up {loop_type} asynchronous loop...")
+    loop = new_event_loop(loop_type)
     loop.set_exception_handler(functools.partial(_exception_handler, cli_logger))
     loop.add_signal_handler(
         signal.SIGTERM,
@@ -99,6 +355,40 @@ def _setup_event_loop(cli_logger: logging.Logger) -> asyncio.AbstractEventLoop:
     return loop
 
 
+def _setup_link_monitor(loop: asyncio.AbstractEventLoop) -> "LinkHealthMonitor":
+    from pkm_trade_spoofer.monitoring import LinkHealthMonitor
+
+    link_monitor = LinkHealthMonitor()
+    link_monitor.start(loop)
+    return link_monitor
+
+
+def _default_party() -> "Party":
+    from pkm_trade_spoofer.models import EVs, Party
+    from pkm_trade_spoofer.pokemon import pokemon_by_id
+
+    return Party(
+        trainer_name="GOLD",
+        pokemon=[
+            pokemon_by_id(1, ivs=EVs(15, 15, 15, 15, 15)),
+            pokemon_by_id(4, ivs=EVs(15, 15, 15, 15, 15)),
+            pokemon_by_id(7, ivs=EVs(15, 15, 15, 15, 15)),
+            pokemon_by_id(151, ivs=EVs(15, 15, 15, 15, 15)),
+            pokemon_by_id(150, ivs=EVs(15, 15, 15, 15, 15)),
+            pokemon_by_id(251, ivs=EVs(15, 15, 15, 15, 15)),
+        ],
+        ots_names=["GOLD"] * 6,
+        pokemon_nicknames=[
+            "Bulbasaur",
+            "Charmander",
+            "Squirtle",
+            "Gatito",
+            "Gato",
+            "Hoja",
+        ],
+    )
+
+
 def _signal_handler(
     cli_logger: logging.Logger,
     signal: str,
@@ -0,0 +1,138 @@
+import asyncio
+import collections
+import gc
+import itertools
+import threading
+import tracemalloc
+from typing import Any, Optional
+
+from pkm_trade_spoofer.backend.bgb.bgb_link_server import BGBLinkCableConnection
+from pkm_trade_spoofer.models import Party, Pokemon
+
+_TRACKED_TYPES: tuple[type, ...] = (BGBLinkCableConnection, Party, Pokemon)
+
+# Do not account the memory allocated by tracemalloc itself
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class MemoryDiagnostics(object):
+    """Inspects the memory of a long running process.
+
+    Wraps tracemalloc to take snapshots, list the top allocation sites and compare
+    snapshots, and counts the live objects of the types that tend to accumulate.
+
+    The methods can be called from worker threads, the snapshots are only taken
+    and compared outside the lock.
+
+    Args:
+        max_snapshots: Snapshots kept in memory, the oldest ones are discarded.
+    """
+
+    def __init__(self, max_snapshots: int = 8) -> None:
+        self.max_snapshots = max_snapshots
+        self._snapshots: collections.OrderedDict[
+            int,
+            tracemalloc.Snapshot,
+        ] = collections.OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not self.tracing:
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+
+    def take_snapshot(self) -> int:
+        """Takes a snapshot and returns its id.
+
+        Raises:
+            RuntimeError: tracemalloc is not tracing.
+        """
+        if not self.tracing:
+            raise RuntimeError("Memory tracing is not started.")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        with self._lock:
+            snapshot_id = next(self._ids)
+            self._snapshots[snapshot_id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot_id
+
+    def top(
+        self,
+        limit: int = 20,
+        snapshot_id: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        """Top allocation sites of a snapshot (a new one if no id is given).
+
+        Raises:
+            RuntimeError: tracemalloc is not tracing.
+            KeyError: Unknown snapshot id.
+        """
+        if snapshot_id is None:
+            snapshot_id = self.take_snapshot()
+
+        with self._lock:
+            snapshot = self._snapshots[snapshot_id]
+        stats = snapshot.statistics("lineno")
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_kb": stat.size / 1024,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def diff(
+        self,
+        first_id: int,
+        second_id: int,
+        limit: int = 20,
+    ) -> list[dict[str, Any]]:
+        """Allocation sites that changed the most between two snapshots.
+
+        Raises:
+            KeyError: Unknown snapshot id.
+        """
+        with self._lock:
+            first, second = self._snapshots[first_id], self._snapshots[second_id]
+        stats = second.compare_to(first, "lineno")
+        return [
+            {
+                "location": str(stat.traceback),
+                "size_kb": stat.size / 1024,
+                "size_diff_kb": stat.size_diff / 1024,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def live_objects(self) -> dict[str, int]:
+        """Counts the live link connections, parties, pokemon and queued items."""
+        counts = {t.__name__: 0 for t in _TRACKED_TYPES}
+        counts["asyncio.Queue"] = 0
+        counts["queued_items"] = 0
+
+        for o in gc.get_objects():
+            if isinstance(o, _TRACKED_TYPES):
+                for t in _TRACKED_TYPES:
+                    counts[t.__name__] += isinstance(o, t)
+            elif isinstance(o, asyncio.Queue):
+                counts["asyncio.Queue"] += 1
+                counts["queued_items"] += o.qsize()
+        return counts
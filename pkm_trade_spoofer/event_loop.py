@@ -0,0 +1,31 @@
+import asyncio
+import importlib.util
+
+from pkm_trade_spoofer import logger
+from pkm_trade_spoofer._types import EventLoopTypes
+
+LOGGER = logger.get_logger(__name__)
+
+
+def resolve_loop_type(loop_type: EventLoopTypes) -> EventLoopTypes:
+    """Loop type that will be used, asyncio if uvloop is not installed."""
+    if loop_type == EventLoopTypes.uvloop and not importlib.util.find_spec("uvloop"):
+        LOGGER.warning("uvloop is not installed, falling back to the asyncio loop")
+        return EventLoopTypes.asyncio
+    return loop_type
+
+
+def new_event_loop(
+    loop_type: EventLoopTypes = EventLoopTypes.asyncio,
+) -> asyncio.AbstractEventLoop:
+    """Creates an event loop of the given type.
+
+    uvloop (libuv based) handles the many tiny link packets with less overhead
+    than the default loop. It is an optional dependency, if it is missing the
+    default loop is used instead.
+    """
+    if resolve_loop_type(loop_type) == EventLoopTypes.uvloop:
+        import uvloop
+
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
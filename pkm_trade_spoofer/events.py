@@ -0,0 +1,66 @@
+import asyncio
+import contextlib
+import contextvars
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+# Link session the running task belongs to, set by the link server
+SESSION: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "SESSION",
+    default=None,
+)
+
+
+@dataclass
+class Event:
+    type: str
+    data: dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_sse(self) -> str:
+        """Formats the event as a Server-Sent Events message."""
+        payload = json.dumps({"timestamp": self.timestamp, **self.data})
+        return f"event: {self.type}\ndata: {payload}\n\n"
+
+
+class EventBus(object):
+    """Fans out backend events to the subscribers, eg. the streaming endpoint.
+
+    Publishing never blocks: each subscriber has a bounded queue and, when a slow
+    one falls behind, its oldest events are dropped.
+
+    Args:
+        max_pending: Events buffered per subscriber.
+    """
+
+    def __init__(self, max_pending: int = 256) -> None:
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._subscribers: set[asyncio.Queue[Event]] = set()
+
+    def publish(self, type_: str, **data: Any) -> None:
+        session = SESSION.get()
+        if session is not None:
+            data.setdefault("session", session)
+
+        event = Event(type=type_, data=data)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[Event]]:
+        queue: asyncio.Queue[Event] = asyncio.Queue(self.max_pending)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
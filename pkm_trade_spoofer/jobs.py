@@ -0,0 +1,101 @@
+import asyncio
+import collections
+import enum
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Coroutine, Optional
+
+from pkm_trade_spoofer import logger
+
+LOGGER = logger.get_logger(__name__)
+
+
+class JobStatus(enum.StrEnum):
+    pending = "PENDING"
+    building_party = "BUILDING_PARTY"
+    starting_backend = "STARTING_BACKEND"
+    succeeded = "SUCCEEDED"
+    failed = "FAILED"
+
+
+@dataclass
+class Job:
+    id: str
+    backend: str
+    status: JobStatus = JobStatus.pending
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.succeeded, JobStatus.failed)
+
+
+JobFn = Callable[[Job], Coroutine[None, None, None]]
+
+
+class JobRegistry(object):
+    """Runs jobs in background and keeps their status to be polled.
+
+    Only the latest `max_finished` finished jobs are remembered.
+    """
+
+    def __init__(self, max_finished: int = 64) -> None:
+        self.max_finished = max_finished
+        self._jobs: dict[str, Job] = {}
+        self._finished: collections.deque[str] = collections.deque()
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, backend: str, coro_fn: JobFn) -> Job:
+        """Creates a job and runs `coro_fn(job)` in a background task.
+
+        The coroutine updates the job status as it makes progress, the job fails
+        if it raises.
+        """
+        job = Job(id=uuid.uuid4().hex, backend=backend)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, coro_fn(job)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def active(self, backend: str) -> Optional[Job]:
+        """Unfinished job of the given backend, if any."""
+        return next(
+            (j for j in self._jobs.values() if j.backend == backend and not j.finished),
+            None,
+        )
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    async def _run(self, job: Job, coro: Coroutine[None, None, None]) -> None:
+        try:
+            await coro
+        except asyncio.CancelledError:
+            self._finish(job, JobStatus.failed, "Job cancelled")
+            raise
+        except Exception as e:
+            LOGGER.exception(f"Job {job.id} ({job.backend}) failed")
+            self._finish(job, JobStatus.failed, f"{type(e).__name__}: {e}")
+        else:
+            self._finish(job, JobStatus.succeeded)
+
+    def _finish(
+        self,
+        job: Job,
+        status: JobStatus,
+        error: Optional[str] = None,
+    ) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        self._finished.append(job.id)
+        while len(self._finished) > self.max_finished:
+            self._jobs.pop(self._finished.popleft(), None)
@@ -1,10 +1,12 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
 from logging import config as logging_config
+from logging import handlers as logging_handlers
 from pathlib import Path
-
-import coloredlogs
-import yaml
+from typing import Any, Optional
 
 import pkm_trade_spoofer
 
@@ -14,6 +16,17 @@ if hasattr(sys, "_MEIPASS"):
 else:
     _CONFIG_PATH = Path(pkm_trade_spoofer.__file__).parent / "configs/logging.yaml"
 
+_PACKAGE_LOGGER = "pkm_trade_spoofer"
+
+# Records waiting for the writer thread. Once full, new records are dropped
+# instead of blocking the event loop
+DEFAULT_QUEUE_SIZE = 10_000
+
+_setup_lock = threading.RLock()
+_configured = False
+_listener: Optional["_BlockingStopQueueListener"] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+
 
 class PokemonPacketsFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
@@ -25,10 +38,117 @@ class NoPokemonPacketsFilter(logging.Filter):
         return not record.getMessage().startswith("Pokemon packet: ")
 
 
+class _LazySetupHandler(logging.Handler):
+    """Configures logging when the first record is emitted, then replays it.
+
+    Lets library users skip `setup_logging`, without paying for the
+    configuration at import time.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        setup_logging()
+        # The record keeps propagating past the package logger once this returns,
+        # eg. to the root handlers of the default configuration. Only the handlers
+        # up to the package logger still have to see it
+        logger: Optional[logging.Logger] = logging.getLogger(record.name)
+        while logger is not None:
+            for handler in logger.handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+            if logger.name == _PACKAGE_LOGGER or not logger.propagate:
+                break
+            logger = logger.parent
+
+
+class DroppingQueueHandler(logging_handlers.QueueHandler):
+    """Hands records over to a bounded queue without ever blocking.
+
+    Records are formatted by the listener thread, when the queue is full they
+    are counted and dropped.
+    """
+
+    def __init__(self, queue_: "queue.Queue[Any]") -> None:
+        super().__init__(queue_)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks keep frames alive, render them while they are current
+            return super().prepare(record)
+        if record.args and any(map(_is_container, _record_args(record))):
+            # Containers could change before the writer thread formats them
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class _BlockingStopQueueListener(logging_handlers.QueueListener):
+    def __init__(
+        self,
+        queue_: "queue.Queue[Any]",
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ) -> None:
+        super().__init__(
+            queue_,
+            *handlers,
+            respect_handler_level=respect_handler_level,
+        )
+        self._records = queue_
+
+    def enqueue_sentinel(self) -> None:
+        # Waits for room when the queue is full, the writer thread is draining it.
+        # `None` is the sentinel the listener stops at
+        self._records.put(None)
+
+
 def setup_logging(
     config_path: Path = _CONFIG_PATH,
     default_level: int = logging.INFO,
+    force: bool = False,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
 ) -> None:
+    """Configures logging from `config_path`.
+
+    The package logger handlers run in a background thread, fed by a queue of
+    `queue_size` records, so writing logs does not block the event loop.
+
+    Only the first call configures logging, the following ones do nothing unless
+    `force` is set.
+    """
+    global _configured
+    with _setup_lock:
+        if _configured and not force:
+            return
+        _configured = True
+        _remove_lazy_setup()
+        _stop_listener()
+        _configure(config_path, default_level)
+        _start_listener(queue_size)
+
+
+def dropped_records() -> int:
+    """Records dropped because the logging queue was full."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def shutdown_logging() -> None:
+    """Writes the queued records and stops the writer thread."""
+    with _setup_lock:
+        _stop_listener()
+
+
+def _configure(config_path: Path, default_level: int) -> None:
+    # Only needed once logging is configured, kept out of the package import time
+    import coloredlogs
+    import yaml
+
     if config_path.exists():
         with open(config_path, "rt") as f:
             try:
@@ -46,14 +166,83 @@ def setup_logging(
         LOGGER.error("Failed to load configuration file. Using default configs")
 
 
+def _start_listener(queue_size: int) -> None:
+    global _listener, _queue_handler
+    package_logger = logging.getLogger(_PACKAGE_LOGGER)
+    if not package_logger.handlers:
+        # Default configuration, records propagate to the root handlers
+        return
+
+    records: queue.Queue[Any] = queue.Queue(queue_size)
+    _queue_handler = DroppingQueueHandler(records)
+    _listener = _BlockingStopQueueListener(
+        records,
+        *package_logger.handlers,
+        respect_handler_level=True,
+    )
+    package_logger.handlers = [_queue_handler]
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    # Give the handlers back, the records logged from now on are written inline
+    logging.getLogger(_PACKAGE_LOGGER).handlers = list(_listener.handlers)
+    _listener = None
+    if _queue_handler is not None and _queue_handler.dropped:
+        LOGGER.warning(
+            "%d log records dropped, the logging queue was full",
+            _queue_handler.dropped,
+        )
+
+
+def _record_args(record: logging.LogRecord) -> Any:
+    args = record.args
+    return args.values() if isinstance(args, dict) else args
+
+
+def _is_container(arg: Any) -> bool:
+    return isinstance(arg, (list, dict, set, bytearray))
+
+
 def get_logger(logger_name: str) -> logging.Logger:
     """Creates a logger object with `logger_name`.
 
+    Logging is configured when the first record is emitted, or earlier with an
+    explicit `setup_logging` call.
+
     Args:
         logger_name (str): Logger name
 
     Returns:
         logging.Logger: Logger object
     """
-    setup_logging()
     return logging.getLogger(logger_name)
+
+
+def _install_lazy_setup() -> None:
+    package_logger = logging.getLogger(_PACKAGE_LOGGER)
+    if not package_logger.handlers:
+        # Records have to reach the handler, the configuration sets the final level
+        package_logger.setLevel(logging.DEBUG)
+        package_logger.addHandler(_LazySetupHandler())
+
+
+def _remove_lazy_setup() -> None:
+    package_logger = logging.getLogger(_PACKAGE_LOGGER)
+    handlers = [
+        h for h in package_logger.handlers if not isinstance(h, _LazySetupHandler)
+    ]
+    if len(handlers) != len(package_logger.handlers):
+        # A new list, the one being iterated by the logger emitting the first
+        # record must not see the handlers added by the configuration
+        package_logger.handlers = handlers
+        package_logger.setLevel(logging.NOTSET)
+
+
+_install_lazy_setup()
+atexit.register(shutdown_logging)
@@ -1,6 +1,7 @@
 import functools
 import struct
 from dataclasses import dataclass
+from typing import Iterator, Optional
 
 from pkm_trade_spoofer import utils
 
@@ -228,6 +229,94 @@ class Party:
         return bytearray(party_header + serialized_pokemon + ot_names + pkm_names)
 
 
+# Offsets of the party sections
+_PARTY_HEADER_N_BYTES = (POKE_TEXT_MAX_LEN + 1) + 10
+_PARTY_OTS_OFFSET = _PARTY_HEADER_N_BYTES + POKEMON_N_BYTES * MAX_PARTY_POKEMON
+_PARTY_NICKNAMES_OFFSET = (
+    _PARTY_OTS_OFFSET + (POKE_TEXT_MAX_LEN + 1) * MAX_PARTY_POKEMON
+)
+
+
+class PartyStreamParser(object):
+    """Decodes a party as its bytes arrive through the link cable.
+
+    The header, each pokemon and each name are decoded as soon as their last byte
+    is fed, so the party is ready right after the last byte of the exchange
+    instead of decoding it all at the end. Bytes are kept in a preallocated
+    buffer, the parser can be reused for the following parties with `reset`.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray(PARTY_N_BYTES)
+        self.reset()
+
+    def reset(self) -> None:
+        self._size = 0
+        self._trainer_name = ""
+        self._pokemon: list[Pokemon] = []
+        self._ots_names: list[str] = []
+        self._nicknames: list[str] = []
+        self._sections = self._decode_sections()
+        self._next_boundary: Optional[int] = next(self._sections)
+
+    def feed(self, b: int) -> None:
+        if self._next_boundary is None:
+            raise ValueError(f"Parties are {PARTY_N_BYTES} bytes long")
+
+        self._buffer[self._size] = b
+        self._size += 1
+        if self._size == self._next_boundary:
+            self._next_boundary = next(self._sections, None)
+
+    @property
+    def done(self) -> bool:
+        return self._next_boundary is None
+
+    def party(self) -> Party:
+        if not self.done:
+            raise ValueError(
+                f"Party incomplete, {self._size} of {PARTY_N_BYTES} bytes received",
+            )
+
+        return Party(
+            trainer_name=self._trainer_name,
+            pokemon=self._pokemon,
+            ots_names=self._ots_names,
+            pokemon_nicknames=self._nicknames,
+        )
+
+    def _decode_sections(self) -> Iterator[int]:
+        """Yields the offset where each section ends, decoding it once resumed."""
+        name_len = POKE_TEXT_MAX_LEN + 1
+        yield _PARTY_HEADER_N_BYTES
+        self._trainer_name = self._decode_str(0)
+        n_pokes = min(self._buffer[name_len], MAX_PARTY_POKEMON)
+
+        for i in range(n_pokes):
+            start = _PARTY_HEADER_N_BYTES + i * POKEMON_N_BYTES
+            yield start + POKEMON_N_BYTES
+            self._pokemon.append(
+                Pokemon.from_bytes(self._buffer[start : start + POKEMON_N_BYTES]),
+            )
+
+        for offset, names in (
+            (_PARTY_OTS_OFFSET, self._ots_names),
+            (_PARTY_NICKNAMES_OFFSET, self._nicknames),
+        ):
+            for i in range(n_pokes):
+                yield offset + (i + 1) * name_len
+                names.append(self._decode_str(offset + i * name_len))
+
+        if n_pokes < MAX_PARTY_POKEMON:
+            # Padding of the missing pokemon names
+            yield PARTY_N_BYTES
+
+    def _decode_str(self, offset: int) -> str:
+        return utils.pokemon.pokestr_to_python_str(
+            self._buffer[offset : offset + POKE_TEXT_MAX_LEN + 1],
+        )
+
+
 def _parse_strs(bs: Bytes, actual_elements: int, max_elements: int) -> list[str]:
     names = [
         utils.pokemon.pokestr_to_python_str(
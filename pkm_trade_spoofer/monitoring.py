@@ -0,0 +1,160 @@
+import asyncio
+import collections
+import time
+from typing import Any, Optional
+
+from pkm_trade_spoofer import logger
+
+LOGGER = logger.get_logger(__name__)
+
+# Minimum seconds between two warnings of the same kind, avoids flooding the logs
+# when the loop is overloaded
+_WARNING_INTERVAL = 5.0
+
+
+class RollingHistogram(object):
+    """Keeps the latest `window` samples and computes percentiles over them."""
+
+    def __init__(self, window: int = 2048) -> None:
+        self._samples: collections.deque[float] = collections.deque(maxlen=window)
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> dict[str, float]:
+        """Percentiles of the window in milliseconds."""
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0}
+
+        def pct(q: float) -> float:
+            return samples[min(len(samples) - 1, int(q / 100 * len(samples)))] * 1000
+
+        return {
+            "count": self.count,
+            "p50_ms": pct(50),
+            "p90_ms": pct(90),
+            "p99_ms": pct(99),
+            "max_ms": self.max * 1000,
+        }
+
+
+class ConnectionJitter(object):
+    """Tracks the gap between a received MASTER byte and our SLAVE reply."""
+
+    def __init__(self, name: str, monitor: "LinkHealthMonitor") -> None:
+        self.name = name
+        self.histogram = RollingHistogram()
+        self._monitor = monitor
+        self._pending_since: Optional[float] = None
+
+    def master_received(self) -> None:
+        if self._pending_since is None:
+            self._pending_since = time.perf_counter()
+
+    def discard(self) -> None:
+        """Forgets the pending MASTER byte, eg. when the client is paused."""
+        self._pending_since = None
+
+    def slave_sent(self) -> None:
+        # Replies not triggered by a MASTER byte (eg. echoes) are not accounted
+        if self._pending_since is None:
+            return
+
+        gap = time.perf_counter() - self._pending_since
+        self._pending_since = None
+        self.histogram.add(gap)
+        self._monitor._record_jitter(self, gap)
+
+
+class LinkHealthMonitor(object):
+    """Measures whether the event loop keeps up with the link traffic.
+
+    Samples the event loop scheduling delay in the background and collects, per
+    connection, the time it takes to reply a MASTER byte. A warning is logged when
+    any of them exceeds its threshold.
+
+    Args:
+        interval: Seconds between event loop lag samples.
+        lag_threshold: Event loop lag (in seconds) considered a stall.
+        jitter_threshold: MASTER to SLAVE delay (in seconds) considered too slow.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.25,
+        lag_threshold: float = 0.05,
+        jitter_threshold: float = 0.01,
+    ) -> None:
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.jitter_threshold = jitter_threshold
+        self.loop_lag = RollingHistogram()
+        self.link_jitter = RollingHistogram()
+        self.lag_threshold_exceeded = 0
+        self.jitter_threshold_exceeded = 0
+        self._connections: dict[str, ConnectionJitter] = {}
+        self._last_warnings: dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._task is None:
+            self._task = loop.create_task(self._sample_loop_lag())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def track_connection(self, name: str) -> ConnectionJitter:
+        jitter = ConnectionJitter(name, self)
+        self._connections[name] = jitter
+        return jitter
+
+    def untrack_connection(self, jitter: ConnectionJitter) -> None:
+        self._connections.pop(jitter.name, None)
+        # Every connection has its own key, keeping them would grow forever
+        self._last_warnings.pop(f"jitter:{jitter.name}", None)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "loop_lag": self.loop_lag.snapshot(),
+            "loop_lag_threshold_exceeded": self.lag_threshold_exceeded,
+            "link_jitter": self.link_jitter.snapshot(),
+            "link_jitter_threshold_exceeded": self.jitter_threshold_exceeded,
+            "connections": {
+                name: c.histogram.snapshot() for name, c in self._connections.items()
+            },
+            "dropped_log_records": logger.dropped_records(),
+        }
+
+    async def _sample_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.loop_lag.add(lag)
+
+            if lag > self.lag_threshold:
+                self.lag_threshold_exceeded += 1
+                self._warn("loop_lag", f"Event loop lagging {lag * 1000:.1f}ms")
+
+    def _record_jitter(self, connection: ConnectionJitter, gap: float) -> None:
+        self.link_jitter.add(gap)
+        if gap > self.jitter_threshold:
+            self.jitter_threshold_exceeded += 1
+            self._warn(
+                f"jitter:{connection.name}",
+                f"Slow link reply to {connection.name}: {gap * 1000:.1f}ms",
+            )
+
+    def _warn(self, kind: str, message: str) -> None:
+        now = time.monotonic()
+        if now - self._last_warnings.get(kind, -_WARNING_INTERVAL) >= _WARNING_INTERVAL:
+            self._last_warnings[kind] = now
+            LOGGER.warning(message)
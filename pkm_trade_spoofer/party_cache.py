@@ -0,0 +1,65 @@
+import collections
+import copy
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from pkm_trade_spoofer import logger
+from pkm_trade_spoofer.models import Party
+
+LOGGER = logger.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedParty:
+    party: Party
+    serialized: bytes
+
+
+class PartyCache(object):
+    """LRU cache of built parties, keyed by a hash of the requested party.
+
+    Front-ends keep sending the same parties, with this cache they are built and
+    serialized once. Each lookup hands out its own copy of the party, so the
+    in-place changes done by trades never reach the cached one.
+
+    Args:
+        max_entries: Parties kept, the least recently used ones are evicted.
+    """
+
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[
+            str,
+            CachedParty,
+        ] = collections.OrderedDict()
+
+    async def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], Awaitable[Party]],
+    ) -> CachedParty:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            party = await build()
+            LOGGER.info(party)
+            entry = CachedParty(party=party, serialized=bytes(party.serialize()))
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return CachedParty(copy.deepcopy(entry.party), entry.serialized)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
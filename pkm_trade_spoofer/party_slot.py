@@ -0,0 +1,37 @@
+import copy
+from dataclasses import dataclass
+
+from pkm_trade_spoofer.models import Party
+
+
+@dataclass(frozen=True)
+class PartyVersion:
+    party: Party
+    image: bytes | memoryview
+    version: int
+
+    def checkout(self) -> tuple[Party, bytes | memoryview]:
+        """Copy of the party for a session, trades modify it in place."""
+        return copy.deepcopy(self.party), self.image
+
+
+class PartySlot(object):
+    """Party offered by a running backend, replaceable without restarting it.
+
+    Sessions copy the current version when they start and check for a newer one
+    before every party interchange, so a replaced party reaches the connected
+    players on their next trade. Versions are swapped as a whole, a session never
+    sees the party of one version with the image of another.
+    """
+
+    def __init__(self, party: Party, image: bytes | memoryview) -> None:
+        self._current = PartyVersion(party, image, version=0)
+
+    @property
+    def current(self) -> PartyVersion:
+        return self._current
+
+    def replace(self, party: Party, image: bytes | memoryview) -> int:
+        """Offers `party` from now on and returns its version."""
+        self._current = PartyVersion(party, image, self._current.version + 1)
+        return self._current.version
@@ -0,0 +1,141 @@
+import json
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from pkm_trade_spoofer.models import PARTY_N_BYTES, Party
+
+DEFAULT_STORE_PATH = Path(
+    os.environ.get(
+        "PKM_TRADE_SPOOFER_PARTIES",
+        Path.home() / ".cache" / "pkm_trade_spoofer" / "parties.bin",
+    ),
+)
+
+
+class PartyStore(object):
+    """Append-only file of serialized parties.
+
+    Serialized parties are `PARTY_N_BYTES` long, so they are stored back to back
+    and party `i` lives at offset `i * PARTY_N_BYTES`. The file is memory mapped:
+    `image` returns a view of a stored party without copying it, ready to be sent
+    through the link cable.
+
+    Names are kept in a small index file next to it (`<path>.idx`), a JSON string
+    per line with the party ids being the line numbers.
+
+    Args:
+        path: Records file, created if it does not exist.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH) -> None:
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a+b")
+        self._index = open(self.index_path, "a+", encoding="utf-8")
+        self._map: Optional[mmap.mmap] = None
+        self._names: list[str] = []
+        self._ids_by_name: dict[str, list[int]] = {}
+        self._load()
+
+    def append(self, party: Party, name: Optional[str] = None) -> int:
+        """Stores a party and returns its id."""
+        return self.append_image(party.serialize(), name or party.trainer_name)
+
+    def append_image(self, image: bytes | bytearray, name: str) -> int:
+        if len(image) != PARTY_N_BYTES:
+            raise ValueError(
+                f"Serialized parties are {PARTY_N_BYTES} bytes long, got {len(image)}",
+            )
+
+        with self._lock:
+            # Records are written before the index, a crash in between leaves a
+            # trailing record that is dropped when loading
+            self._file.write(image)
+            self._file.flush()
+            self._index.write(json.dumps(name) + "\n")
+            self._index.flush()
+
+            party_id = len(self._names)
+            self._add_name(party_id, name)
+            return party_id
+
+    def image(self, party_id: int) -> memoryview:
+        """Serialized party, as a read-only view of the mapped file."""
+        if not 0 <= party_id < len(self):
+            raise KeyError(f"Party {party_id} not found")
+
+        offset = party_id * PARTY_N_BYTES
+        with self._lock:
+            if self._map is None or len(self._map) < offset + PARTY_N_BYTES:
+                # Views of the previous map keep it alive until they are released
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return memoryview(self._map)[offset : offset + PARTY_N_BYTES]
+
+    def get(self, party_id: int) -> Party:
+        return Party.from_bytes(bytearray(self.image(party_id)))
+
+    def name(self, party_id: int) -> str:
+        if not 0 <= party_id < len(self):
+            raise KeyError(f"Party {party_id} not found")
+        return self._names[party_id]
+
+    def ids(self, name: str) -> list[int]:
+        """Ids of the parties stored with the given name."""
+        return list(self._ids_by_name.get(name, []))
+
+    def items(self) -> list[tuple[int, str]]:
+        return list(enumerate(self._names))
+
+    def close(self) -> None:
+        # Mapped views still in use keep the map open, it is closed once released
+        self._map = None
+        self._file.close()
+        self._index.close()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __enter__(self) -> "PartyStore":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _load(self) -> None:
+        self._index.seek(0)
+        names: list[str] = []
+        complete = True
+        for line in self._index:
+            if not line.endswith("\n"):
+                # Partial line written by an interrupted append
+                complete = False
+                break
+            if not line.strip():
+                continue
+            try:
+                names.append(json.loads(line))
+            except json.JSONDecodeError:
+                complete = False
+                break
+
+        n_records = os.fstat(self._file.fileno()).st_size // PARTY_N_BYTES
+        n_parties = min(len(names), n_records)
+
+        # Drop what an interrupted append left behind
+        self._file.truncate(n_parties * PARTY_N_BYTES)
+        if len(names) > n_parties or not complete:
+            self._index.truncate(0)
+            self._index.writelines(json.dumps(n) + "\n" for n in names[:n_parties])
+            self._index.flush()
+
+        for party_id, name in enumerate(names[:n_parties]):
+            self._add_name(party_id, name)
+
+    def _add_name(self, party_id: int, name: str) -> None:
+        self._names.append(name)
+        self._ids_by_name.setdefault(name, []).append(party_id)
@@ -0,0 +1,26 @@
+from pkm_trade_spoofer.pokemon.builder import (
+    bulk_pokemon_from_species,
+    get_species_cache,
+    pokemon_by_id,
+    pokemon_from_species,
+    set_species_cache,
+    species_by_id,
+    species_by_id_async,
+)
+from pkm_trade_spoofer.pokemon.cache import (
+    NullSpeciesCache,
+    SpeciesCache,
+    SQLiteSpeciesCache,
+)
+from pkm_trade_spoofer.pokemon.client import AsyncPokeApiClient, PokeApiError
+from pkm_trade_spoofer.pokemon.repository import SpeciesRepository, WarmUpProgress
+from pkm_trade_spoofer.pokemon.species import (
+    SpeciesRecord,
+    get_pokeapi_url,
+    set_pokeapi_url,
+)
+from pkm_trade_spoofer.pokemon.tables import (
+    MAX_LEVEL,
+    StatTable,
+    experience_for_level,
+)
@@ -0,0 +1,225 @@
+import asyncio
+import random
+import sqlite3
+import threading
+from typing import Optional, Sequence
+
+from pkm_trade_spoofer.models import PP, EVs, Pokemon, Stats
+from pkm_trade_spoofer.pokemon.cache import (
+    NullSpeciesCache,
+    SpeciesCache,
+    SQLiteSpeciesCache,
+)
+from pkm_trade_spoofer.pokemon.client import AsyncPokeApiClient
+from pkm_trade_spoofer.pokemon.species import (
+    SpeciesRecord,
+    fetch_species,
+    get_pokeapi_url,
+)
+from pkm_trade_spoofer.pokemon.tables import (
+    MAX_LEVEL,
+    StatTable,
+    experience_for_level,
+    stat_value,
+)
+
+_species_cache: Optional[SpeciesCache] = None
+_species_cache_lock = threading.Lock()
+
+
+def set_species_cache(cache: Optional[SpeciesCache]) -> None:
+    """Sets the cache used for species lookups.
+
+    `None` restores the default one, a `SQLiteSpeciesCache` at its default path.
+    """
+    global _species_cache
+    _species_cache = cache
+
+
+def get_species_cache() -> SpeciesCache:
+    global _species_cache
+    with _species_cache_lock:
+        if _species_cache is None:
+            try:
+                _species_cache = SQLiteSpeciesCache()
+            except (OSError, sqlite3.Error):
+                # Unwritable, locked or corrupt database, lookups still work
+                _species_cache = NullSpeciesCache()
+        return _species_cache
+
+
+def species_by_id(pokemon_id: int) -> SpeciesRecord:
+    """Gets a species from the cache, or PokeAPI if it is not cached."""
+    cache = get_species_cache()
+    species = cache.get(pokemon_id)
+    if species is None:
+        species = fetch_species(pokemon_id, base_url=get_pokeapi_url())
+        cache.put(species)
+    return species
+
+
+async def species_by_id_async(
+    pokemon_id: int,
+    client: AsyncPokeApiClient,
+) -> SpeciesRecord:
+    """Same as `species_by_id` but downloads the species with an async client."""
+    # The database is shared with other processes and a write may wait for
+    # their locks, which must not stall the event loop serving the link
+    cache = await asyncio.to_thread(get_species_cache)
+    species = await asyncio.to_thread(cache.get, pokemon_id)
+    if species is None:
+        species = await client.fetch_species(pokemon_id)
+        await asyncio.to_thread(cache.put, species)
+    return species
+
+
+def pokemon_by_id(
+    pokemon_id: int,
+    *,
+    ivs: EVs,
+    level: int = 1,
+    item_held_id: Optional[int] = None,
+    OT: Optional[int] = None,
+) -> Pokemon:
+    return pokemon_from_species(
+        species_by_id(pokemon_id),
+        ivs=ivs,
+        level=level,
+        item_held_id=item_held_id,
+        OT=OT,
+    )
+
+
+def pokemon_from_species(
+    species: SpeciesRecord,
+    *,
+    ivs: EVs,
+    level: int = 1,
+    item_held_id: Optional[int] = None,
+    OT: Optional[int] = None,
+    table: Optional[StatTable] = None,
+) -> Pokemon:
+    """Builds a pokemon of the given species.
+
+    Stats and experience are looked up in `table` when the species is in it,
+    otherwise they are computed on the spot.
+    """
+    if not 1 <= level <= MAX_LEVEL:
+        raise ValueError(f"Level must be between 1 and {MAX_LEVEL}")
+
+    if table is not None and species.dex_id in table:
+        stats = table.stats(species.dex_id, level, ivs)
+        exp_points = table.exp_points(species.dex_id, level)
+    else:
+        stats = _compute_stats(species, level, ivs)
+        exp_points = experience_for_level(species.growth_rate, level)
+
+    return _new_pokemon(species, ivs, level, item_held_id, OT, stats, exp_points)
+
+
+def bulk_pokemon_from_species(
+    species: Sequence[SpeciesRecord],
+    *,
+    ivs: Sequence[EVs],
+    levels: Sequence[int],
+    item_held_ids: Sequence[Optional[int]],
+    table: StatTable,
+) -> list[Pokemon]:
+    """Builds many pokemon, the `i`-th one of `species[i]`.
+
+    Species missing from `table` are added to it, then the stats and experience
+    of all the pokemon are looked up with a single `bulk_stats` call.
+    """
+    if not species:
+        return []
+
+    for s in species:
+        if s.dex_id not in table:
+            table.add(s)
+
+    dex_ids = [s.dex_id for s in species]
+    iv_values = [(i.hp, i.attack, i.defense, i.speed, i.special) for i in ivs]
+    all_stats = table.bulk_stats(dex_ids, levels, iv_values).tolist()
+    all_exp_points = table.bulk_exp_points(dex_ids, levels).tolist()
+
+    pokemon = []
+    for s, pkm_ivs, level, item_held_id, stats, exp_points in zip(
+        species,
+        ivs,
+        levels,
+        item_held_ids,
+        all_stats,
+        all_exp_points,
+    ):
+        hp, attack, defense, speed, special_attack, special_defense = stats
+        pokemon.append(
+            _new_pokemon(
+                s,
+                pkm_ivs,
+                level,
+                item_held_id,
+                None,
+                Stats(
+                    max_hp=hp,
+                    hp=hp,
+                    attack=attack,
+                    defense=defense,
+                    speed=speed,
+                    special_attack=special_attack,
+                    special_defense=special_defense,
+                ),
+                exp_points,
+            ),
+        )
+    return pokemon
+
+
+def _new_pokemon(
+    species: SpeciesRecord,
+    ivs: EVs,
+    level: int,
+    item_held_id: Optional[int],
+    OT: Optional[int],
+    stats: Stats,
+    exp_points: int,
+) -> Pokemon:
+    move_ids = [
+        move_id for move_id, learned_at in species.moves if learned_at <= level
+    ][:4]
+
+    return Pokemon(
+        dex_id=species.dex_id,
+        item_held_id=item_held_id or 0,
+        moves_ids=move_ids,
+        moves_pps=[PP(0, current_pps=1)] * len(move_ids),
+        evs=EVs(0, 0, 0, 0, 0),
+        OT=OT or random.randint(1, 10000),
+        exp_points=exp_points,
+        ivs=ivs,
+        friendship_remaining_egg_cycles=70,
+        pokerus=0,
+        caught_data=0,
+        level=level,
+        status_cond=0,
+        stats=stats,
+    )
+
+
+def _compute_stats(species: SpeciesRecord, level: int, ivs: EVs) -> Stats:
+    stats_dict = dict(species.base_stats)
+    for k, v in stats_dict.items():
+        if k == "special-attack" or k == "special-defense":
+            iv = ivs.special
+        else:
+            iv = getattr(ivs, k)
+        stats_dict[k] = stat_value(k, v, iv, level)
+
+    return Stats(
+        max_hp=stats_dict["hp"],
+        hp=stats_dict["hp"],
+        attack=stats_dict["attack"],
+        defense=stats_dict["defense"],
+        speed=stats_dict["speed"],
+        special_attack=stats_dict["special-attack"],
+        special_defense=stats_dict["special-defense"],
+    )
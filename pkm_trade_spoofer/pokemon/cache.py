@@ -0,0 +1,151 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Protocol
+
+from pkm_trade_spoofer.pokemon.species import SpeciesRecord
+
+DEFAULT_CACHE_PATH = Path(
+    os.environ.get(
+        "PKM_TRADE_SPOOFER_CACHE",
+        Path.home() / ".cache" / "pkm_trade_spoofer" / "species.sqlite3",
+    ),
+)
+
+# Bump when `SpeciesRecord` changes, existing caches are then discarded
+_SCHEMA_VERSION = 2
+
+# Last access times are refreshed at most once per this amount of seconds, so
+# cache hits seldom need to write
+_ACCESS_RESOLUTION = 60.0
+
+
+class SpeciesCache(Protocol):
+    def get(self, dex_id: int) -> Optional[SpeciesRecord]:
+        ...
+
+    def put(self, record: SpeciesRecord) -> None:
+        ...
+
+
+class NullSpeciesCache(object):
+    """Cache that stores nothing, every lookup goes to PokeAPI."""
+
+    def get(self, dex_id: int) -> Optional[SpeciesRecord]:
+        return None
+
+    def put(self, record: SpeciesRecord) -> None:
+        ...
+
+
+class SQLiteSpeciesCache(object):
+    """Species cache persisted in a SQLite database.
+
+    The database runs in WAL mode so it can be shared by every process of the
+    host: readers never block and writers wait for each other. Entries expire
+    after `ttl` seconds, and when the cache grows past `max_entries` the least
+    recently used ones are evicted.
+
+    Args:
+        path: Database file.
+        ttl: Seconds an entry is valid for.
+        max_entries: Maximum number of species stored.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl: float = 30 * 24 * 60 * 60,
+        max_entries: int = 1024,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # sqlite3 connections can not be shared across threads
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._setup()
+
+    def get(self, dex_id: int) -> Optional[SpeciesRecord]:
+        now = time.time()
+        row = self._conn.execute(
+            "SELECT payload, fetched_at, accessed_at FROM species WHERE dex_id = ?",
+            (dex_id,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        payload, fetched_at, accessed_at = row
+        if now - fetched_at > self.ttl:
+            with self._conn:
+                self._conn.execute("DELETE FROM species WHERE dex_id = ?", (dex_id,))
+            return None
+
+        if now - accessed_at > _ACCESS_RESOLUTION:
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE species SET accessed_at = ? WHERE dex_id = ?",
+                    (now, dex_id),
+                )
+
+        return SpeciesRecord.from_json(payload)
+
+    def put(self, record: SpeciesRecord) -> None:
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO species VALUES (?, ?, ?, ?)",
+                (record.dex_id, record.to_json(), now, now),
+            )
+            self._evict(now)
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM species")
+
+    def __len__(self) -> int:
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM species").fetchone()
+        return count
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _setup(self) -> None:
+        conn = self._conn
+        conn.execute("PRAGMA journal_mode = WAL")
+        with conn:
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS species")
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS species ("
+                "dex_id INTEGER PRIMARY KEY, "
+                "payload TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)",
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS species_accessed_at "
+                "ON species (accessed_at)",
+            )
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(
+            "DELETE FROM species WHERE fetched_at < ?",
+            (now - self.ttl,),
+        )
+        self._conn.execute(
+            "DELETE FROM species WHERE dex_id IN ("
+            "SELECT dex_id FROM species ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
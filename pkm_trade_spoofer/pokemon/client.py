@@ -0,0 +1,96 @@
+import asyncio
+from typing import TYPE_CHECKING, Any, Optional
+
+from pkm_trade_spoofer.pokemon.species import (
+    REQUEST_TIMEOUT,
+    SpeciesRecord,
+    get_pokeapi_url,
+)
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+
+# Requests made to fetch a species, `/pokemon` and `/pokemon-species`
+REQUESTS_PER_SPECIES = 2
+
+
+class PokeApiError(Exception):
+    """PokeAPI replied with an error or an invalid response."""
+
+
+class AsyncPokeApiClient(object):
+    """Asyncio PokeAPI client with a keep-alive connection pool.
+
+    Connections are reused across requests and at most `max_connections`
+    requests are in flight at the same time, the rest wait for a free connection.
+
+    Args:
+        base_url: PokeAPI base url, the one set with `set_pokeapi_url` by default.
+        max_connections: Maximum number of concurrent connections.
+        timeout: Seconds to wait for a request to complete, including the time
+            waiting for a free connection.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: int = 8,
+        timeout: float = REQUEST_TIMEOUT,
+    ) -> None:
+        # Only needed once PokeAPI is queried, kept out of the commands import time
+        import httpx
+
+        self._base_url = base_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: "AsyncClient" = httpx.AsyncClient(
+            headers={
+                "User-Agent": "pkm_trade_spoofer",
+                "Accept": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+
+    @property
+    def base_url(self) -> str:
+        return (self._base_url or get_pokeapi_url()).rstrip("/")
+
+    async def fetch_species(self, dex_id: int) -> SpeciesRecord:
+        pokemon, species = await asyncio.gather(
+            self.get_json(f"/pokemon/{dex_id}/"),
+            self.get_json(f"/pokemon-species/{dex_id}/"),
+        )
+        return SpeciesRecord.from_pokeapi(pokemon, species)
+
+    async def get_json(self, path: str) -> Any:
+        """GETs `path` (relative to the base url) and decodes the JSON body.
+
+        Raises:
+            PokeApiError: Unexpected response or the request failed.
+            TimeoutError: The request did not complete in time.
+        """
+        import httpx
+
+        try:
+            async with asyncio.timeout(self.timeout):
+                res = await self._client.get(f"{self.base_url}{path}")
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f"GET {path} timed out") from e
+        except httpx.HTTPError as e:
+            raise PokeApiError(f"GET {path} failed: {e}") from e
+
+        if res.status_code != 200:
+            raise PokeApiError(f"GET {path} failed with status {res.status_code}")
+
+        try:
+            return res.json()
+        except ValueError as e:
+            raise PokeApiError(f"GET {path} returned an invalid body") from e
+
+    async def close(self) -> None:
+        await self._client.aclose()
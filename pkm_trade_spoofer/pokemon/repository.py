@@ -0,0 +1,146 @@
+import asyncio
+import collections
+import functools
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from pkm_trade_spoofer import logger
+from pkm_trade_spoofer.models import EVs, Pokemon
+from pkm_trade_spoofer.pokemon.builder import pokemon_from_species, species_by_id_async
+from pkm_trade_spoofer.pokemon.client import REQUESTS_PER_SPECIES, AsyncPokeApiClient
+from pkm_trade_spoofer.pokemon.species import SpeciesRecord
+from pkm_trade_spoofer.pokemon.tables import StatTable
+
+# Generation II species
+MAX_DEX_ID = 251
+
+LOGGER = logger.get_logger(__name__)
+
+
+@dataclass
+class WarmUpProgress:
+    total: int
+    done: int = 0
+    failed: int = 0
+    finished: bool = False
+
+
+class SpeciesRepository(object):
+    """Species lookups shared by all the requests of a process.
+
+    Keeps the most recently used species in memory and coalesces concurrent
+    lookups of the same species (single-flight): the first one goes to the species
+    cache or PokeAPI and the rest wait for its result. A burst of identical
+    parties therefore costs one lookup per species.
+
+    Loaded species are added to `table`, so pokemon are built with array lookups
+    at any level.
+
+    Args:
+        client: Client used on cache misses.
+        max_templates: Species kept in memory.
+    """
+
+    def __init__(self, client: AsyncPokeApiClient, max_templates: int = 256) -> None:
+        self.client = client
+        self.max_templates = max_templates
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._templates: collections.OrderedDict[
+            int,
+            SpeciesRecord,
+        ] = collections.OrderedDict()
+        self._in_flight: dict[int, asyncio.Task[SpeciesRecord]] = {}
+        self.table = StatTable()
+        self.warm_up_progress: Optional[WarmUpProgress] = None
+
+    async def get(self, dex_id: int) -> SpeciesRecord:
+        species = self._templates.get(dex_id)
+        if species is not None:
+            self._templates.move_to_end(dex_id)
+            self.hits += 1
+            return species
+
+        task = self._in_flight.get(dex_id)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._load(dex_id))
+            task.add_done_callback(functools.partial(self._done, dex_id))
+            self._in_flight[dex_id] = task
+        else:
+            self.coalesced += 1
+
+        # A cancelled request must not cancel the lookup other requests wait for
+        return await asyncio.shield(task)
+
+    async def pokemon_by_id(
+        self,
+        dex_id: int,
+        *,
+        ivs: EVs,
+        level: int = 1,
+        item_held_id: Optional[int] = None,
+        OT: Optional[int] = None,
+    ) -> Pokemon:
+        return pokemon_from_species(
+            await self.get(dex_id),
+            ivs=ivs,
+            level=level,
+            item_held_id=item_held_id,
+            OT=OT,
+            table=self.table,
+        )
+
+    async def warm_up(
+        self,
+        dex_ids: Iterable[int] = range(1, MAX_DEX_ID + 1),
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """Loads the given species (all Gen II by default) in memory.
+
+        At most `concurrency` species are looked up at the same time. Each one
+        takes `REQUESTS_PER_SPECIES` of the client connections, by default the
+        warm up leaves enough of them free for a species lookup of the requests
+        served meanwhile.
+        """
+        if concurrency is None:
+            concurrency = max(
+                1,
+                self.client.max_connections // REQUESTS_PER_SPECIES - 1,
+            )
+        ids = list(dex_ids)
+        progress = self.warm_up_progress = WarmUpProgress(total=len(ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm(dex_id: int) -> None:
+            async with semaphore:
+                try:
+                    await self.get(dex_id)
+                except Exception as e:
+                    progress.failed += 1
+                    LOGGER.warning(f"Could not warm up species {dex_id}: {e!r}")
+                else:
+                    progress.done += 1
+
+        await asyncio.gather(*(warm(dex_id) for dex_id in ids))
+        progress.finished = True
+        LOGGER.info(
+            f"Species warm up finished: {progress.done} loaded, "
+            f"{progress.failed} failed",
+        )
+
+    def __contains__(self, dex_id: int) -> bool:
+        return dex_id in self._templates
+
+    async def _load(self, dex_id: int) -> SpeciesRecord:
+        species = await species_by_id_async(dex_id, self.client)
+        self._templates[dex_id] = species
+        # Rows stay in the table after the species is evicted, they are cheap
+        self.table.add(species)
+        while len(self._templates) > self.max_templates:
+            self._templates.popitem(last=False)
+        return species
+
+    def _done(self, dex_id: int, _: asyncio.Task) -> None:
+        self._in_flight.pop(dex_id, None)
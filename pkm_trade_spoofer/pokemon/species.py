@@ -0,0 +1,98 @@
+import json
+import os
+import urllib.request
+from dataclasses import asdict, dataclass
+from typing import Any
+
+POKEAPI_URL = os.environ.get("POKEAPI_URL", "https://pokeapi.co/api/v2")
+REQUEST_TIMEOUT = 10.0
+
+# Moves are taken from the version groups up to this one
+_VERSION_GROUP = 2
+
+
+@dataclass
+class SpeciesRecord:
+    """Normalized PokeAPI data required to build a pokemon of a species.
+
+    Attributes:
+        dex_id: National pokedex number.
+        name: Species name.
+        base_stats: Base stats by PokeAPI stat name (hp, attack, special-attack...).
+        moves: (move id, level learned at) pairs, in PokeAPI order.
+        growth_rate: PokeAPI growth rate name (slow, medium, fast, medium-slow).
+    """
+
+    dex_id: int
+    name: str
+    base_stats: dict[str, int]
+    moves: list[tuple[int, int]]
+    growth_rate: str = "medium"
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, payload: str) -> "SpeciesRecord":
+        data = json.loads(payload)
+        data["moves"] = [tuple(m) for m in data["moves"]]
+        return cls(**data)
+
+    @classmethod
+    def from_pokeapi(
+        cls,
+        pokemon: dict[str, Any],
+        species: dict[str, Any],
+    ) -> "SpeciesRecord":
+        """Builds the record from PokeAPI `/pokemon/{id}` and `/pokemon-species/{id}`
+        responses."""
+        moves = []
+        for m in pokemon["moves"]:
+            details = [
+                vg
+                for vg in m["version_group_details"]
+                if _resource_id(vg["version_group"]["url"]) <= _VERSION_GROUP
+            ]
+            if details:
+                moves.append(
+                    (_resource_id(m["move"]["url"]), details[0]["level_learned_at"]),
+                )
+
+        return cls(
+            dex_id=pokemon["id"],
+            name=pokemon["name"],
+            base_stats={st["stat"]["name"]: st["base_stat"] for st in pokemon["stats"]},
+            moves=moves,
+            growth_rate=species["growth_rate"]["name"],
+        )
+
+
+_pokeapi_url = POKEAPI_URL
+
+
+def set_pokeapi_url(url: str) -> None:
+    """Sets the PokeAPI instance queried on cache misses."""
+    global _pokeapi_url
+    _pokeapi_url = url
+
+
+def get_pokeapi_url() -> str:
+    return _pokeapi_url
+
+
+def fetch_species(dex_id: int, base_url: str = POKEAPI_URL) -> SpeciesRecord:
+    """Downloads a species from PokeAPI."""
+    return SpeciesRecord.from_pokeapi(
+        _get_json(f"{base_url}/pokemon/{dex_id}/"),
+        _get_json(f"{base_url}/pokemon-species/{dex_id}/"),
+    )
+
+
+def _get_json(url: str) -> Any:
+    request = urllib.request.Request(url, headers={"User-Agent": "pkm_trade_spoofer"})
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as res:
+        return json.load(res)
+
+
+def _resource_id(url: str) -> int:
+    return int(url.removesuffix("/").split("/")[-1])
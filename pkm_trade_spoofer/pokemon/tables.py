@@ -0,0 +1,177 @@
+import math
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pkm_trade_spoofer.models import EVs, Stats
+from pkm_trade_spoofer.pokemon.species import SpeciesRecord
+
+MAX_LEVEL = 100
+
+# Generation II species
+_N_SPECIES = 251
+
+# Stat axis order of the tables, and the IV feeding each stat
+STAT_NAMES = ("hp", "attack", "defense", "speed", "special-attack", "special-defense")
+_STAT_IVS = ("hp", "attack", "defense", "speed", "special", "special")
+
+GROWTH_RATES = ("medium", "fast", "medium-slow", "slow")
+
+_LEVELS = np.arange(MAX_LEVEL + 1, dtype=np.int64)
+_IVS = np.arange(16, dtype=np.int64)
+
+
+def stat_value(stat: str, base: int, iv: int, level: int) -> int:
+    """Computes a stat of a pokemon without stat experience."""
+    value = math.floor((((base + iv) * 2) * level) / 100)
+    if stat == "hp":
+        return value + level + 10
+    return value + 5
+
+
+def experience_for_level(growth_rate: str, level: int) -> int:
+    """Experience points needed to reach `level`. Unknown rates count as medium."""
+    n = level
+    if growth_rate == "fast":
+        exp = 4 * n**3 // 5
+    elif growth_rate == "medium-slow":
+        exp = 6 * n**3 // 5 - 15 * n**2 + 100 * n - 140
+    elif growth_rate == "slow":
+        exp = 5 * n**3 // 4
+    else:
+        exp = n**3
+    return max(exp, 0)
+
+
+def _experience_table() -> npt.NDArray[np.int32]:
+    n = _LEVELS
+    table = np.stack(
+        [
+            n**3,
+            4 * n**3 // 5,
+            6 * n**3 // 5 - 15 * n**2 + 100 * n - 140,
+            5 * n**3 // 4,
+        ],
+    )
+    return np.maximum(table, 0).astype(np.int32)
+
+
+class StatTable(object):
+    """Precomputed stats and experience of every species, level and IV.
+
+    Stats are stored in a `(252, 101, 16, 6)` array indexed by dex id, level, IV
+    value and stat (see `STAT_NAMES`), about 5MB. Species are added as they are
+    loaded, after that building a pokemon at any level is an array lookup, and
+    `bulk_stats` computes the stats of thousands of pokemon in a single call.
+    """
+
+    def __init__(self) -> None:
+        self._stats = np.zeros(
+            (_N_SPECIES + 1, MAX_LEVEL + 1, len(_IVS), len(STAT_NAMES)),
+            dtype=np.uint16,
+        )
+        self._growth_rates = np.zeros(_N_SPECIES + 1, dtype=np.int8)
+        self._loaded = np.zeros(_N_SPECIES + 1, dtype=bool)
+        self._experience = _experience_table()
+
+    @classmethod
+    def from_species(cls, species: Sequence[SpeciesRecord]) -> "StatTable":
+        table = cls()
+        for s in species:
+            table.add(s)
+        return table
+
+    def add(self, species: SpeciesRecord) -> None:
+        base = np.array(
+            [species.base_stats[name] for name in STAT_NAMES],
+            dtype=np.int64,
+        )
+        # (levels, IVs, stats)
+        level = _LEVELS[:, None, None]
+        stats = (((base + _IVS[:, None]) * 2) * level) // 100
+        stats[..., 0] += _LEVELS[:, None] + 10
+        stats[..., 1:] += 5
+
+        self._stats[species.dex_id] = stats
+        self._growth_rates[species.dex_id] = _growth_rate_index(species.growth_rate)
+        self._loaded[species.dex_id] = True
+
+    def stats(self, dex_id: int, level: int, ivs: EVs) -> Stats:
+        self._check(dex_id, level)
+        iv_values = [getattr(ivs, name) for name in _STAT_IVS]
+        row = self._stats[dex_id, level, iv_values, np.arange(len(STAT_NAMES))]
+        hp, attack, defense, speed, special_attack, special_defense = row.tolist()
+        return Stats(
+            max_hp=hp,
+            hp=hp,
+            attack=attack,
+            defense=defense,
+            speed=speed,
+            special_attack=special_attack,
+            special_defense=special_defense,
+        )
+
+    def bulk_stats(
+        self,
+        dex_ids: npt.ArrayLike,
+        levels: npt.ArrayLike,
+        ivs: npt.ArrayLike,
+    ) -> npt.NDArray[np.uint16]:
+        """Stats of many pokemon at once.
+
+        Args:
+            dex_ids: `(n,)` species.
+            levels: `(n,)` levels.
+            ivs: `(n, 5)` IVs, in `EVs` field order (hp, attack, defense, speed,
+                special).
+
+        Returns:
+            `(n, 6)` array with the stats in `STAT_NAMES` order.
+        """
+        dex_ids = np.asarray(dex_ids, dtype=np.intp)
+        levels = np.asarray(levels, dtype=np.intp)
+        ivs = np.asarray(ivs, dtype=np.intp)
+        if not self._loaded[dex_ids].all():
+            missing = np.unique(dex_ids[~self._loaded[dex_ids]])
+            raise KeyError(f"Species not in the table: {missing.tolist()}")
+        if levels.min(initial=1) < 1 or levels.max(initial=1) > MAX_LEVEL:
+            raise ValueError(f"Levels must be between 1 and {MAX_LEVEL}")
+
+        # special IV feeds both special attack and special defense
+        stat_ivs = ivs[:, [0, 1, 2, 3, 4, 4]]
+        return self._stats[
+            dex_ids[:, None],
+            levels[:, None],
+            stat_ivs,
+            np.arange(len(STAT_NAMES)),
+        ]
+
+    def exp_points(self, dex_id: int, level: int) -> int:
+        self._check(dex_id, level)
+        return int(self._experience[self._growth_rates[dex_id], level])
+
+    def bulk_exp_points(
+        self,
+        dex_ids: npt.ArrayLike,
+        levels: npt.ArrayLike,
+    ) -> npt.NDArray[np.int32]:
+        dex_ids = np.asarray(dex_ids, dtype=np.intp)
+        levels = np.asarray(levels, dtype=np.intp)
+        return self._experience[self._growth_rates[dex_ids], levels]
+
+    def __contains__(self, dex_id: int) -> bool:
+        return 0 < dex_id <= _N_SPECIES and bool(self._loaded[dex_id])
+
+    def _check(self, dex_id: int, level: int) -> None:
+        if dex_id not in self:
+            raise KeyError(f"Species not in the table: {dex_id}")
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"Level must be between 1 and {MAX_LEVEL}")
+
+
+def _growth_rate_index(growth_rate: str) -> int:
+    try:
+        return GROWTH_RATES.index(growth_rate)
+    except ValueError:
+        return 0
@@ -0,0 +1,130 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+_POKEMON_PATH = re.compile(r"^/api/v2/(pokemon|pokemon-species)/(\d+)/?$")
+
+_STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+_GROWTH_RATES = ["slow", "medium", "fast", "medium-slow"]
+
+
+def fake_pokemon_payload(dex_id: int) -> dict[str, Any]:
+    """Deterministic PokeAPI `/pokemon/{id}` response with the fields we use."""
+
+    def link(resource: str, id_: int) -> dict[str, str]:
+        return {
+            "name": f"{resource}-{id_}",
+            "url": f"https://pokeapi.co/api/v2/{resource}/{id_}/",
+        }
+
+    return {
+        "id": dex_id,
+        "name": f"pokemon-{dex_id}",
+        "stats": [
+            {"base_stat": 40 + (dex_id * (i + 3)) % 90, "stat": {"name": name}}
+            for i, name in enumerate(_STAT_NAMES)
+        ],
+        "moves": [
+            {
+                "move": link("move", 1 + (dex_id * 7 + i * 13) % 251),
+                "version_group_details": [
+                    {
+                        "level_learned_at": i * 5,
+                        "version_group": link("version-group", 1),
+                        "move_learn_method": link("move-learn-method", 1),
+                    },
+                ],
+            }
+            for i in range(6)
+        ],
+    }
+
+
+def fake_pokemon_species_payload(dex_id: int) -> dict[str, Any]:
+    """Deterministic PokeAPI `/pokemon-species/{id}` response."""
+    growth_rate = _GROWTH_RATES[dex_id % len(_GROWTH_RATES)]
+    return {
+        "id": dex_id,
+        "name": f"pokemon-{dex_id}",
+        "growth_rate": {
+            "name": growth_rate,
+            "url": f"https://pokeapi.co/api/v2/growth-rate/{growth_rate}/",
+        },
+    }
+
+
+class FakePokeApiServer(object):
+    """Local stand-in for PokeAPI, serving fake species over HTTP.
+
+    Lets the cache-miss path run offline. Use it as a context manager and point
+    the lookups to `base_url`:
+
+        with FakePokeApiServer() as server:
+            set_pokeapi_url(server.base_url)
+            ...
+
+    Attributes:
+        requests: Number of requests served.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_cls())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/api/v2"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakePokeApiServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def _handler_cls(self) -> type[BaseHTTPRequestHandler]:
+        fake_api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                match = _POKEMON_PATH.match(self.path)
+                if match is None or not 1 <= int(match.group(2)) <= 251:
+                    self.send_error(404)
+                    return
+
+                with fake_api._lock:
+                    fake_api.requests += 1
+
+                resource, dex_id = match.group(1), int(match.group(2))
+                if resource == "pokemon":
+                    payload = fake_pokemon_payload(dex_id)
+                else:
+                    payload = fake_pokemon_species_payload(dex_id)
+
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_: Any) -> None:
+                ...
+
+        return Handler
@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import cProfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Generator, Optional, TypeVar
+
+from pkm_trade_spoofer import logger
+
+LOGGER = logger.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Profiler of the session the current task belongs to. Tasks inherit the context
+# of the task that created them, so all tasks spawned by a profiled connection
+# are profiled too.
+_SESSION_PROFILE: contextvars.ContextVar[
+    Optional[cProfile.Profile]
+] = contextvars.ContextVar("session_profile", default=None)
+
+
+class SessionProfiler(object):
+    """Profiles link sessions, writing a pstats file per session on disconnect.
+
+    Only the tasks belonging to the profiled sessions are measured: the profiler is
+    enabled just while one of them is running a step, so the rest of the event loop
+    is not accounted. When disabled, it costs a single attribute check per new
+    connection.
+
+    Args:
+        output_dir: Directory where the `.prof` files are written.
+        enabled: Whether new sessions are profiled.
+        peer: If set, only sessions from this host are profiled.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path = Path("logs/profiles"),
+        enabled: bool = False,
+        peer: Optional[str] = None,
+    ) -> None:
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.peer = peer
+
+    def should_profile(self, peer: str) -> bool:
+        return self.enabled and (self.peer is None or self.peer == peer)
+
+    async def profile_session(
+        self,
+        session_name: str,
+        coro: Coroutine[Any, Any, T],
+    ) -> T:
+        """Runs `coro` and the tasks it spawns under a dedicated profiler."""
+        loop = asyncio.get_running_loop()
+        factory = _install_task_factory(loop)
+
+        profile = cProfile.Profile()
+        _SESSION_PROFILE.set(profile)
+        try:
+            return await _ProfiledCoroutine(coro, profile)
+        finally:
+            self._dump(session_name, profile)
+            _release_task_factory(loop, factory)
+
+    def _dump(self, session_name: str, profile: cProfile.Profile) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = self.output_dir / f"{session_name}-{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        profile.dump_stats(path)
+        LOGGER.info(f"Session profile written to {path}")
+
+
+class _ProfiledCoroutine(Coroutine[Any, Any, T]):
+    """Coroutine wrapper enabling a profiler around each step of `coro`."""
+
+    def __init__(self, coro: Coroutine[Any, Any, T], profile: cProfile.Profile) -> None:
+        self._coro = coro
+        self._profile = profile
+
+    def send(self, value: Any) -> Any:
+        self._profile.enable()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._profile.disable()
+
+    def throw(self, *args: Any) -> Any:
+        self._profile.enable()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._profile.disable()
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self  # type: ignore
+
+    def __iter__(self) -> Generator[Any, None, T]:
+        return self  # type: ignore
+
+    def __next__(self) -> Any:
+        return self.send(None)
+
+
+class _ProfilingTaskFactory(object):
+    """Task factory wrapping the coroutines of the profiled sessions' tasks.
+
+    Tasks are created by the factory the loop had before, if any. Keyword
+    arguments (`context`, and `name` among others since Python 3.13.3) are
+    forwarded as given.
+    """
+
+    def __init__(self, previous: Optional[Callable[..., Any]]) -> None:
+        self.previous = previous
+        self.sessions = 0
+
+    def __call__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[Any, Any, Any],
+        **kwargs: Any,
+    ) -> asyncio.Task:
+        context = kwargs.get("context")
+        if context is not None:
+            profile = context.get(_SESSION_PROFILE)
+        else:
+            profile = _SESSION_PROFILE.get()
+
+        if profile is not None:
+            coro = _ProfiledCoroutine(coro, profile)
+
+        if self.previous is not None:
+            return self.previous(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+
+def _install_task_factory(loop: asyncio.AbstractEventLoop) -> _ProfilingTaskFactory:
+    current = loop.get_task_factory()
+    if isinstance(current, _ProfilingTaskFactory):
+        factory = current
+    else:
+        factory = _ProfilingTaskFactory(current)
+        loop.set_task_factory(factory)  # type: ignore
+    factory.sessions += 1
+    return factory
+
+
+def _release_task_factory(
+    loop: asyncio.AbstractEventLoop,
+    factory: _ProfilingTaskFactory,
+) -> None:
+    # Gives the loop its factory back once no session is profiled, unless another
+    # one was set meanwhile
+    factory.sessions -= 1
+    if factory.sessions == 0 and loop.get_task_factory() is factory:
+        loop.set_task_factory(factory.previous)
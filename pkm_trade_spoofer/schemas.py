@@ -0,0 +1,36 @@
+from typing import Optional
+
+import pydantic
+
+
+def to_camel(string: str) -> str:
+    initial, *remaining = string.split("_")
+    return initial + "".join(word.capitalize() for word in remaining)
+
+
+class PokeApiBaseModel(pydantic.BaseModel):
+    class Config:
+        alias_generator = to_camel
+
+
+class SimplePokemon(PokeApiBaseModel):
+    """Simple pokemon schema transferred between front-end and back-end."""
+
+    nickname: str
+    dex_id: int = pydantic.Field(ge=0, le=251)  # type: ignore
+    ivs: Optional[list[int]] = pydantic.Field(None, min_items=5, max_items=5)
+    held_item_id: Optional[int] = None
+    level: int = pydantic.Field(1, ge=1, le=100)  # type: ignore
+
+    @pydantic.validator("ivs")
+    def _ivs_validator(cls, ivs: list[int]) -> list[int]:
+        if any(o > 15 or o < 0 for o in ivs):
+            raise ValueError("IVs have to be lower or equal than 15")
+        return ivs
+
+
+class SimpleParty(PokeApiBaseModel):
+    """Simplified pokemon party schema."""
+
+    trainer_name: str
+    pokemon: list[SimplePokemon] = pydantic.Field(min_items=0, max_items=6)
@@ -0,0 +1,73 @@
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from pkm_trade_spoofer.trading_state_machine import State, TradeStateMachineContext
+
+
+@dataclass(frozen=True)
+class SessionCheckpoint:
+    context: TradeStateMachineContext
+    state: State
+    saved_at: float
+
+
+class SessionCheckpoints(object):
+    """Trade sessions of disconnected clients, waiting for them to reconnect.
+
+    When a connection drops, the context of its state machine (party being
+    offered, received party, selected pokemon...) is kept with the state it was
+    running. If the same client reconnects within `grace_period` seconds the new
+    session continues from there, instead of going through the handshake and the
+    party interchange again. Clients are identified by host, the backend decides
+    when a new connection is the client that dropped.
+
+    States restart from their beginning, a session dropped in the middle of a
+    party interchange repeats the whole interchange.
+
+    Args:
+        grace_period: Seconds a checkpoint is kept.
+    """
+
+    def __init__(self, grace_period: float = 30.0) -> None:
+        self.grace_period = grace_period
+        self._checkpoints: dict[str, SessionCheckpoint] = {}
+
+    def save(
+        self,
+        client: str,
+        context: TradeStateMachineContext,
+        state: State,
+    ) -> None:
+        self._prune()
+        # Re-inserted so the dict stays ordered by age
+        self._checkpoints.pop(client, None)
+        self._checkpoints[client] = SessionCheckpoint(
+            context,
+            state,
+            time.monotonic(),
+        )
+
+    def restore(self, client: str) -> Optional[SessionCheckpoint]:
+        """Takes the checkpoint of `client`, if it did not expire."""
+        self._prune()
+        return self._checkpoints.pop(client, None)
+
+    def __contains__(self, client: str) -> bool:
+        self._prune()
+        return client in self._checkpoints
+
+    def clear(self) -> None:
+        self._checkpoints.clear()
+
+    def __len__(self) -> int:
+        self._prune()
+        return len(self._checkpoints)
+
+    def _prune(self) -> None:
+        expired_before = time.monotonic() - self.grace_period
+        while self._checkpoints:
+            client, checkpoint = next(iter(self._checkpoints.items()))
+            if checkpoint.saved_at > expired_before:
+                break
+            del self._checkpoints[client]
@@ -0,0 +1,308 @@
+import array
+import asyncio
+import itertools
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from pkm_trade_spoofer import logger, utils
+from pkm_trade_spoofer.models import POKE_TEXT_MAX_LEN, POKEMON_N_BYTES, Party, Pokemon
+
+LOGGER = logger.get_logger(__name__)
+
+DEFAULT_ARCHIVE_PATH = Path(
+    os.environ.get(
+        "PKM_TRADE_SPOOFER_ARCHIVE",
+        Path.home() / ".cache" / "pkm_trade_spoofer" / "received.bin",
+    ),
+)
+
+# Timestamp, party slot, flags, pokemon, nickname, original trainer and the name
+# of the trainer the party was received from
+_NAME_N_BYTES = POKE_TEXT_MAX_LEN + 1
+_RECORD_FORMAT = (
+    f">dBB{POKEMON_N_BYTES}s{_NAME_N_BYTES}s{_NAME_N_BYTES}s{_NAME_N_BYTES}s"
+)
+RECORD_N_BYTES = struct.calcsize(_RECORD_FORMAT)
+
+# Index entry of each record: species and hash of the trainer name
+_INDEX_FORMAT = ">BI"
+_INDEX_N_BYTES = struct.calcsize(_INDEX_FORMAT)
+
+_TRADED_FLAG = 1
+
+
+@dataclass
+class ArchivedPokemon:
+    record_id: int
+    timestamp: float
+    trainer_name: str
+    slot: int
+    traded: bool
+    nickname: str
+    ot_name: str
+    pokemon: Pokemon
+
+
+class TradeArchive(object):
+    """Append-only archive of the pokemon received in trades.
+
+    Every pokemon of a received party is stored as a fixed size record, the one
+    actually traded is flagged. Pokemon `i` lives at offset `i * RECORD_N_BYTES`
+    of the records file, which is memory mapped to read them.
+
+    A compact index (`<path>.idx`, 5 bytes per record) keeps the species and a
+    hash of the trainer name of each record. It is loaded in memory as a list of
+    record ids per species and per trainer, so queries only read the matching
+    records.
+
+    Args:
+        path: Records file, created if it does not exist.
+    """
+
+    def __init__(self, path: Path = DEFAULT_ARCHIVE_PATH) -> None:
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a+b")
+        self._index = open(self.index_path, "a+b")
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        self._by_species: dict[int, array.array[int]] = {}
+        self._by_trainer: dict[int, array.array[int]] = {}
+        self._load()
+
+    def append(
+        self,
+        party: Party,
+        traded_slot: Optional[int] = None,
+        timestamp: Optional[float] = None,
+    ) -> list[int]:
+        """Stores the pokemon of a received party and returns their ids."""
+        timestamp = time.time() if timestamp is None else timestamp
+        trainer = utils.pokemon.python_text_to_pokestr(party.trainer_name)
+        records = b"".join(
+            struct.pack(
+                _RECORD_FORMAT,
+                timestamp,
+                slot,
+                _TRADED_FLAG if slot == traded_slot else 0,
+                pokemon.to_bytes(),
+                utils.pokemon.python_text_to_pokestr(party.pokemon_nicknames[slot]),
+                utils.pokemon.python_text_to_pokestr(party.ots_names[slot]),
+                trainer,
+            )
+            for slot, pokemon in enumerate(party.pokemon)
+        )
+        trainer_hash = _trainer_hash(party.trainer_name)
+        entries = [(pokemon.dex_id, trainer_hash) for pokemon in party.pokemon]
+
+        with self._lock:
+            # Records are written before the index, a crash in between leaves
+            # records without index entries, rebuilt when loading
+            self._file.write(records)
+            self._file.flush()
+            self._index.write(
+                b"".join(struct.pack(_INDEX_FORMAT, *e) for e in entries),
+            )
+            self._index.flush()
+
+            first_id = self._size
+            for dex_id, trainer_hash in entries:
+                self._add_entry(dex_id, trainer_hash)
+            return list(range(first_id, self._size))
+
+    def get(self, record_id: int) -> ArchivedPokemon:
+        return _parse_record(record_id, self._record(record_id))
+
+    def ids_by_species(self, dex_id: int) -> list[int]:
+        return list(self._by_species.get(dex_id, ()))
+
+    def ids_by_trainer(self, trainer_name: str) -> list[int]:
+        # Different names may share a hash, the name is checked in the record
+        trainer = utils.pokemon.python_text_to_pokestr(trainer_name)
+        return [
+            record_id
+            for record_id in self._by_trainer.get(_trainer_hash(trainer_name), ())
+            if self._record(record_id)[-_NAME_N_BYTES:] == trainer
+        ]
+
+    def query(
+        self,
+        dex_id: Optional[int] = None,
+        trainer_name: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[ArchivedPokemon]:
+        """Archived pokemon matching all the given filters, the newest first."""
+        candidates: Optional[set[int]] = None
+        if dex_id is not None:
+            candidates = set(self.ids_by_species(dex_id))
+        if trainer_name is not None:
+            by_trainer = set(self.ids_by_trainer(trainer_name))
+            candidates = by_trainer if candidates is None else candidates & by_trainer
+
+        record_ids = (
+            sorted(candidates, reverse=True)
+            if candidates is not None
+            else range(len(self) - 1, -1, -1)
+        )
+        return [self.get(i) for i in itertools.islice(record_ids, limit)]
+
+    def close(self) -> None:
+        # Mapped views still in use keep the map open, it is closed once released
+        self._map = None
+        self._file.close()
+        self._index.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __enter__(self) -> "TradeArchive":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def _record(self, record_id: int) -> bytes:
+        if not 0 <= record_id < len(self):
+            raise KeyError(f"Record {record_id} not found")
+
+        offset = record_id * RECORD_N_BYTES
+        with self._lock:
+            if self._map is None or len(self._map) < offset + RECORD_N_BYTES:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._map[offset : offset + RECORD_N_BYTES]
+
+    def _load(self) -> None:
+        n_records = os.fstat(self._file.fileno()).st_size // RECORD_N_BYTES
+        n_entries = os.fstat(self._index.fileno()).st_size // _INDEX_N_BYTES
+
+        # Drop what an interrupted append left behind
+        self._file.truncate(n_records * RECORD_N_BYTES)
+        self._index.truncate(min(n_entries, n_records) * _INDEX_N_BYTES)
+
+        self._index.seek(0)
+        for dex_id, trainer_hash in struct.iter_unpack(
+            _INDEX_FORMAT,
+            self._index.read(),
+        ):
+            self._add_entry(dex_id, trainer_hash)
+
+        if n_entries < n_records:
+            self._rebuild_index(n_records)
+
+    def _rebuild_index(self, n_records: int) -> None:
+        """Indexes the records appended without their index entries."""
+        LOGGER.warning(f"Indexing {n_records - self._size} archived pokemon")
+        self._file.seek(self._size * RECORD_N_BYTES)
+        for _, _, _, pokemon, _, _, trainer in struct.iter_unpack(
+            _RECORD_FORMAT,
+            self._file.read(),
+        ):
+            entry = (
+                pokemon[0],
+                _trainer_hash(
+                    utils.pokemon.pokestr_to_python_str(bytearray(trainer)),
+                ),
+            )
+            self._index.write(struct.pack(_INDEX_FORMAT, *entry))
+            self._add_entry(*entry)
+        self._index.flush()
+
+    def _add_entry(self, dex_id: int, trainer_hash: int) -> None:
+        record_id = self._size
+        self._by_species.setdefault(dex_id, array.array("I")).append(record_id)
+        self._by_trainer.setdefault(trainer_hash, array.array("I")).append(record_id)
+        self._size += 1
+
+
+class TradeArchiveWriter(object):
+    """Archives the received parties from a background task.
+
+    `submit` only queues the party, so the trade never waits for the disk. The
+    parties are written in batches from a worker thread and, if the disk falls
+    behind and `max_pending` parties are waiting, new ones are dropped.
+
+    Args:
+        archive: Where the parties are written.
+        max_pending: Parties waiting to be written.
+    """
+
+    def __init__(self, archive: TradeArchive, max_pending: int = 1024) -> None:
+        self.archive = archive
+        self.dropped = 0
+        self._pending: asyncio.Queue[
+            tuple[Party, Optional[int], float]
+        ] = asyncio.Queue(max_pending)
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, party: Party, traded_slot: Optional[int] = None) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._write_pending())
+
+        try:
+            self._pending.put_nowait((party, traded_slot, time.time()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def close(self) -> None:
+        """Writes the queued parties and stops the background task."""
+        if self._task is None:
+            return
+
+        await self._pending.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        if self.dropped:
+            LOGGER.warning(f"{self.dropped} received parties were not archived")
+
+    async def _write_pending(self) -> None:
+        while True:
+            batch = [await self._pending.get()]
+            while not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception:
+                LOGGER.exception(f"Failed to archive {len(batch)} parties")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+
+    def _write(self, batch: list[tuple[Party, Optional[int], float]]) -> None:
+        for party, traded_slot, timestamp in batch:
+            self.archive.append(party, traded_slot, timestamp)
+
+
+def _parse_record(record_id: int, record: bytes) -> ArchivedPokemon:
+    timestamp, slot, flags, pokemon, nickname, ot_name, trainer = struct.unpack(
+        _RECORD_FORMAT,
+        record,
+    )
+    return ArchivedPokemon(
+        record_id=record_id,
+        timestamp=timestamp,
+        trainer_name=utils.pokemon.pokestr_to_python_str(bytearray(trainer)),
+        slot=slot,
+        traded=bool(flags & _TRADED_FLAG),
+        nickname=utils.pokemon.pokestr_to_python_str(bytearray(nickname)),
+        ot_name=utils.pokemon.pokestr_to_python_str(bytearray(ot_name)),
+        pokemon=Pokemon.from_bytes(bytearray(pokemon)),
+    )
+
+
+def _trainer_hash(trainer_name: str) -> int:
+    return zlib.crc32(trainer_name.encode())
@@ -1,11 +1,14 @@
 import abc
-import asyncio
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Awaitable, Callable, Optional
 
 from pkm_trade_spoofer import logger
-from pkm_trade_spoofer.models import Party
+from pkm_trade_spoofer.events import EventBus
+from pkm_trade_spoofer.models import Party, PartyStreamParser
+from pkm_trade_spoofer.party_slot import PartySlot
+from pkm_trade_spoofer.trade_archive import TradeArchiveWriter
+from pkm_trade_spoofer.utils.queues import PeekableQueue
 
 _MASTER_MAGIC = 0x01
 _SLAVE_MAGIC = 0x02
@@ -23,17 +26,33 @@ LOGGER = logger.get_logger(__name__)
 
 @dataclass
 class TradeStateMachineContext:
-    reader: asyncio.Queue[int]
+    reader: PeekableQueue[int]
     writer: Callable[[int], Awaitable[None]]
     pkm_party: Party
     other_pkm_party: Optional[Party] = None
 
+    # Decodes the other player's party while it is received, reused every trade
+    other_party_parser: PartyStreamParser = field(default_factory=PartyStreamParser)
+
+    # `pkm_party` already serialized, sent as is while the party is not traded
+    party_image: Optional[bytes | memoryview] = None
+
     # Pokemon id to send
     me_sends: Optional[int] = None
 
     # Pokemon id that the other player is sending
     other_sends: Optional[int] = None
 
+    # Completed trades are published here
+    events: Optional[EventBus] = None
+
+    # Received parties are archived here
+    archive: Optional[TradeArchiveWriter] = None
+
+    # Where the backend offers its current party, and the version being traded
+    party_slot: Optional[PartySlot] = None
+    party_version: int = 0
+
 
 class State(abc.ABC):
     @abc.abstractmethod
@@ -55,15 +74,21 @@ class TradingPokemonStateMachine(object):
     ) -> None:
         self._initial_state = initial_state
         self._context = context
+        self._state: Optional[State] = None
+
+    @property
+    def state(self) -> Optional[State]:
+        """State being run, None before starting and once finished."""
+        return self._state
 
     async def __call__(self) -> None:
-        next_state: Optional[State] = self._initial_state
+        self._state = self._initial_state
 
-        while next_state is not None:
-            prev_state = next_state
-            next_state = await next_state.run(self._context)
-            if prev_state is not next_state:
-                LOGGER.info(f"Switching state from {prev_state} to {next_state}")
+        while self._state is not None:
+            prev_state = self._state
+            self._state = await prev_state.run(self._context)
+            if prev_state is not self._state:
+                LOGGER.info("Switching state from %s to %s", prev_state, self._state)
 
 
 class NotConnectedState(State):
@@ -113,15 +138,27 @@ class InterchangePokemonTeamsState(State):
     """Interchange pokemon parties."""
 
     async def run(self, ctx: TradeStateMachineContext) -> Optional[State]:
-        other_party_bs = []
-        for pb in ctx.pkm_party.serialize():
+        slot = ctx.party_slot
+        if slot is not None and slot.current.version != ctx.party_version:
+            # The party was replaced after the session started
+            current = slot.current
+            ctx.pkm_party, ctx.party_image = current.checkout()
+            ctx.party_version = current.version
+            LOGGER.info("Offering party version %d", current.version)
+
+        if ctx.party_image is None:
+            ctx.party_image = bytes(ctx.pkm_party.serialize())
+
+        parser = ctx.other_party_parser
+        parser.reset()
+        for pb in ctx.party_image:
             opb = await ctx.reader.get()
-            other_party_bs.append(opb)
             await ctx.writer(pb)
+            parser.feed(opb)
             _log_traffic(opb, pb, self)
             ctx.reader.task_done()
 
-        ctx.other_pkm_party = Party.from_bytes(other_party_bs)
+        ctx.other_pkm_party = parser.party()
 
         return WaitWhileState(_TERMINATOR_MAGIC, next_state=SelectingPokemonState())
 
@@ -211,6 +248,24 @@ class TradingPokemonState(State):
                     "ctx.other_pkm_party cannot be None in TradingPokemonState.",
                 )
 
+            if ctx.events is not None:
+                ctx.events.publish(
+                    "trade_completed",
+                    sent={
+                        "dex_id": ctx.pkm_party.pokemon[ctx.me_sends].dex_id,
+                        "nickname": ctx.pkm_party.pokemon_nicknames[ctx.me_sends],
+                    },
+                    received={
+                        "dex_id": ctx.other_pkm_party.pokemon[ctx.other_sends].dex_id,
+                        "nickname": ctx.other_pkm_party.pokemon_nicknames[
+                            ctx.other_sends
+                        ],
+                    },
+                )
+
+            if ctx.archive is not None:
+                ctx.archive.submit(ctx.other_pkm_party, ctx.other_sends)
+
             ctx.pkm_party.pokemon[ctx.me_sends] = ctx.other_pkm_party.pokemon[
                 ctx.other_sends
             ]
@@ -222,6 +277,7 @@ class TradingPokemonState(State):
             ]
 
             # Restart context data
+            ctx.party_image = None
             ctx.me_sends = None
             ctx.other_pkm_party = None
             ctx.other_pkm_party = None
@@ -280,21 +336,15 @@ class WaitWhileState(State):
         wait_while_value: int,
         next_state: State,
         echo_value: Optional[int] = None,
-        delay: float = 0.001,
     ) -> None:
         super().__init__()
         self.wait_while_value = wait_while_value
         self.next_state = next_state
-        self.delay = delay
         self.echo_value = echo_value
 
     async def run(self, ctx: TradeStateMachineContext) -> Optional[State]:
-        if ctx.reader.empty():
-            await asyncio.sleep(self.delay)
-            return self
-
-        # Hack to peek a value
-        value = ctx.reader._queue[0]  # type: ignore
+        # Sleeps until the client sends something, idle sessions cost nothing
+        value = await ctx.reader.peek()
 
         # echo
         await ctx.writer(value if self.echo_value is None else self.echo_value)
@@ -322,4 +372,5 @@ class WaitWhileState(State):
 
 
 def _log_traffic(recv: int, sent: int, state: State) -> None:
-    LOGGER.debug(f"Pokemon packet: 0x{recv:02x},0x{sent:02x},{state}")
+    # Formatted by the logging thread, only if a handler takes the record
+    LOGGER.debug("Pokemon packet: 0x%02x,0x%02x,%s", recv, sent, state)
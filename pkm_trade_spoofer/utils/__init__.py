@@ -1 +1 @@
-from pkm_trade_spoofer.utils import pokemon
+from pkm_trade_spoofer.utils import pokemon, queues
@@ -0,0 +1,30 @@
+import asyncio
+import collections
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class PeekableQueue(asyncio.Queue[T]):
+    """Queue whose next item can be awaited without removing it."""
+
+    _queue: collections.deque[T]
+
+    def _init(self, maxsize: int) -> None:
+        super()._init(maxsize)  # type: ignore[misc]
+        self._not_empty = asyncio.Event()
+
+    def _put(self, item: T) -> None:
+        super()._put(item)  # type: ignore[misc]
+        self._not_empty.set()
+
+    def _get(self) -> T:
+        item: T = super()._get()  # type: ignore[misc]
+        if not self._queue:
+            self._not_empty.clear()
+        return item
+
+    async def peek(self) -> T:
+        """Waits for an item and returns it, leaving it in the queue."""
+        await self._not_empty.wait()
+        return self._queue[0]
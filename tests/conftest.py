@@ -0,0 +1,39 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from pkm_trade_spoofer.pokemon import (
+    SQLiteSpeciesCache,
+    get_pokeapi_url,
+    set_pokeapi_url,
+    set_species_cache,
+)
+from pkm_trade_spoofer.pokemon.testing import FakePokeApiServer
+
+
+@pytest.fixture
+def pokeapi() -> Iterator[FakePokeApiServer]:
+    """Fake PokeAPI the species lookups are pointed to."""
+    previous_url = get_pokeapi_url()
+    with FakePokeApiServer() as server:
+        set_pokeapi_url(server.base_url)
+        try:
+            yield server
+        finally:
+            set_pokeapi_url(previous_url)
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / "species.sqlite3"
+
+
+@pytest.fixture
+def species_cache(cache_path: Path) -> Iterator[SQLiteSpeciesCache]:
+    cache = SQLiteSpeciesCache(cache_path)
+    set_species_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_species_cache(None)
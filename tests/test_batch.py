@@ -0,0 +1,85 @@
+import base64
+import concurrent.futures
+import json
+
+from pkm_trade_spoofer import batch
+from pkm_trade_spoofer.models import Party
+from pkm_trade_spoofer.pokemon import SQLiteSpeciesCache
+from pkm_trade_spoofer.pokemon.testing import FakePokeApiServer
+from pkm_trade_spoofer.schemas import SimpleParty
+
+_PARTIES = [
+    {
+        "trainerName": f"T{i}",
+        "pokemon": [
+            {
+                "nickname": f"P{j}",
+                "dexId": 1 + (i * 7 + j * 13) % 251,
+                "level": 1 + (i + j * 17) % 100,
+                "ivs": [(i + j + k) % 16 for k in range(5)],
+            }
+            for j in range(1 + i % 6)
+        ],
+    }
+    for i in range(20)
+]
+
+
+def _without_ot(party: Party) -> Party:
+    for pokemon in party.pokemon:
+        pokemon.OT = 0
+    return party
+
+
+def test_chunk_matches_the_scalar_build(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    documents = [(i, json.dumps(p)) for i, p in enumerate(_PARTIES, start=1)]
+    results = [json.loads(r) for r in batch.build_party_documents(documents)]
+
+    assert [r["line"] for r in results] == [line_no for line_no, _ in documents]
+    for result, document in zip(results, _PARTIES):
+        built = Party.from_bytes(bytearray(base64.b64decode(result["party"])))
+        expected = batch.simple_party_to_party(SimpleParty.parse_obj(document))
+        # Decoding derives some fields, eg. the HP IV, compare decoded parties
+        expected = Party.from_bytes(bytearray(expected.serialize()))
+        assert repr(_without_ot(built)) == repr(_without_ot(expected))
+
+
+def test_errors_do_not_fail_the_chunk(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    documents = [
+        (1, json.dumps(_PARTIES[0])),
+        (2, "not json"),
+        (
+            3,
+            json.dumps(
+                {"trainerName": "X", "pokemon": [{"nickname": "A", "dexId": 0}]}
+            ),
+        ),
+        (4, json.dumps(_PARTIES[1])),
+    ]
+    results = [json.loads(r) for r in batch.build_party_documents(documents)]
+
+    assert [r["line"] for r in results] == [1, 2, 3, 4]
+    assert "party" in results[0] and "party" in results[3]
+    assert "error" in results[1] and "error" in results[2]
+
+
+def test_results_keep_the_input_order(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    lines = [json.dumps(p) for p in _PARTIES]
+    lines.insert(3, "")
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        results = list(
+            batch.build_parties(lines, executor, max_pending=8, chunk_size=3),
+        )
+
+    assert [json.loads(r)["line"] for r in results] == [
+        i for i, line in enumerate(lines, start=1) if line
+    ]
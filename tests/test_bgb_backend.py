@@ -0,0 +1,183 @@
+import asyncio
+import struct
+from typing import Optional
+
+from pkm_trade_spoofer.backend import BGBBackend
+from pkm_trade_spoofer.backend.bgb.bgb_link_server import (
+    LINK_CLIENT,
+    PACKET_FORMAT,
+    GBPacketType,
+    LinkClient,
+)
+from pkm_trade_spoofer.benchmarks._common import synthetic_party, trade_script
+from pkm_trade_spoofer.events import EventBus
+from pkm_trade_spoofer.trading_state_machine import NotConnectedState
+from pkm_trade_spoofer.utils.queues import PeekableQueue
+
+# Bytes up to the party interchange, as in a session dropped mid trade
+_N_BYTES = 7 + 3 + 10 + 3 + 444 + 1
+
+# Status packet flags: running, running and supporting reconnects
+_RUNNING = 1
+_RECONNECTS = 1 | 4
+
+
+def test_connection_reset_while_writing_saves_the_session() -> None:
+    script = list(trade_script(synthetic_party(trainer_name="SILVER")))
+
+    async def reset_after_the_party_interchange() -> None:
+        backend = BGBBackend("127.0.0.1", 0, reconnect_grace=30)
+        await backend.start(synthetic_party())
+        try:
+            LINK_CLIENT.set(LinkClient("192.168.1.20", supports_reconnect=True))
+            reader: PeekableQueue[int] = PeekableQueue()
+            for data in script:
+                reader.put_nowait(data)
+
+            n_written = 0
+
+            async def writer(_: int) -> None:
+                nonlocal n_written
+                n_written += 1
+                if n_written > _N_BYTES:
+                    raise ConnectionResetError()
+
+            # The reset ends the session as a dropped connection would
+            await backend._master_data_handler_state_machine(reader, writer)
+
+            assert backend._checkpoints is not None
+            checkpoint = backend._checkpoints.restore("192.168.1.20")
+            assert checkpoint is not None
+            assert not isinstance(checkpoint.state, NotConnectedState)
+        finally:
+            await backend.stop()
+
+    asyncio.run(reset_after_the_party_interchange())
+
+
+class _Emulator(object):
+    """BGB emulator driving the link as master, from 127.0.0.1."""
+
+    def __init__(self, port: int, status: int = _RECONNECTS) -> None:
+        self.port = port
+        self.status = status
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(
+            "127.0.0.1",
+            self.port,
+        )
+        self._send(GBPacketType.VERSION, 1, 4, 0)
+        self._send(GBPacketType.STATUS, self.status)
+        await self._writer.drain()
+
+    async def exchange(self, data: list[int]) -> None:
+        assert self._reader is not None and self._writer is not None
+        for b in data:
+            self._send(GBPacketType.MASTER, b, 0x81)
+            await self._writer.drain()
+            while True:
+                packet = await asyncio.wait_for(self._reader.readexactly(8), 2)
+                if struct.unpack(PACKET_FORMAT, packet)[0] == GBPacketType.SLAVE:
+                    break
+
+    async def drop(self) -> None:
+        assert self._writer is not None
+        self._writer.close()
+        await self._writer.wait_closed()
+        # Lets the server notice the connection is gone
+        await asyncio.sleep(0.1)
+
+    def _send(self, type_: int, b2: int = 0, b3: int = 0, b4: int = 0) -> None:
+        assert self._writer is not None
+        self._writer.write(struct.pack(PACKET_FORMAT, type_, b2, b3, b4, 0))
+
+
+async def _start_backend(events: EventBus) -> tuple[BGBBackend, int]:
+    backend = BGBBackend("127.0.0.1", 0, events=events, reconnect_grace=30)
+    await backend.start(synthetic_party())
+    assert backend._server._server is not None
+    return backend, backend._server._server.sockets[0].getsockname()[1]
+
+
+def _session_events(events: "asyncio.Queue") -> list[str]:
+    types = []
+    while not events.empty():
+        types.append(events.get_nowait().type)
+    return [t for t in types if t not in ("session_connected", "session_disconnected")]
+
+
+def test_reconnecting_client_resumes_its_session() -> None:
+    script = list(trade_script(synthetic_party(trainer_name="SILVER")))
+
+    async def drop_and_reconnect() -> list[str]:
+        events = EventBus()
+        backend, port = await _start_backend(events)
+        try:
+            async with events.subscribe() as queue:
+                emulator = _Emulator(port)
+                await emulator.connect()
+                await emulator.exchange(script[:_N_BYTES])
+                await emulator.drop()
+
+                await emulator.connect()
+                await emulator.exchange(script[_N_BYTES:])
+                await emulator.drop()
+                return _session_events(queue)
+        finally:
+            await backend.stop()
+
+    assert asyncio.run(drop_and_reconnect()) == ["session_resumed", "trade_completed"]
+
+
+def test_client_not_reconnecting_does_not_take_over_the_session() -> None:
+    script = list(trade_script(synthetic_party(trainer_name="SILVER")))
+
+    async def drop_and_connect_another() -> None:
+        events = EventBus()
+        backend, port = await _start_backend(events)
+        try:
+            async with events.subscribe() as queue:
+                dropped = _Emulator(port)
+                await dropped.connect()
+                await dropped.exchange(script[:_N_BYTES])
+                await dropped.drop()
+
+                # Another game from the same host, starting with the handshake
+                other = _Emulator(port, status=_RUNNING)
+                await other.connect()
+                await other.exchange(script[:10])
+                await other.drop()
+
+                assert "session_resumed" not in _session_events(queue)
+                # Still waiting for the client that dropped
+                assert len(backend._checkpoints or ()) == 1
+        finally:
+            await backend.stop()
+
+    asyncio.run(drop_and_connect_another())
+
+
+def test_sessions_sharing_a_host_are_not_kept() -> None:
+    script = list(trade_script(synthetic_party(trainer_name="SILVER")))
+
+    async def drop_one_of_two() -> None:
+        events = EventBus()
+        backend, port = await _start_backend(events)
+        try:
+            first, second = _Emulator(port), _Emulator(port)
+            await first.connect()
+            await second.connect()
+            await first.exchange(script[:_N_BYTES])
+            await second.exchange(script[:10])
+            await first.drop()
+
+            # The reconnecting client could be matched with either session
+            assert len(backend._checkpoints or ()) == 0
+            await second.drop()
+        finally:
+            await backend.stop()
+
+    asyncio.run(drop_one_of_two())
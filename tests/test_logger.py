@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pkm_trade_spoofer
+
+_SCRIPT = """
+from pkm_trade_spoofer.logger import get_logger
+
+logger = get_logger("pkm_trade_spoofer.test")
+logger.warning("first record")
+logger.warning("second record")
+"""
+
+
+def test_first_record_is_emitted_once_with_the_default_config(
+    tmp_path: Path,
+) -> None:
+    # Out of the repository root `logs/` does not exist, the file handlers of
+    # the configuration fail and logging falls back to `basicConfig`
+    package_root = Path(pkm_trade_spoofer.__file__).parent.parent
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(package_root)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    logs = output.stdout + output.stderr
+
+    assert "Using default configs" in logs
+    assert logs.count("first record") == 1
+    assert logs.count("second record") == 1
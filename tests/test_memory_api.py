@@ -0,0 +1,33 @@
+import asyncio
+
+from pkm_trade_spoofer.api import ManagementAPI
+
+
+def test_diagnostics_do_not_block_the_event_loop() -> None:
+    # Plenty of objects for the live objects count to walk
+    heap = [{"i": i} for i in range(500_000)]
+
+    async def count_objects() -> int:
+        api = ManagementAPI({}, loop=asyncio.get_running_loop(), secret="s")
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        ticks = 0
+        try:
+            res = await api._memory_objects()
+        finally:
+            ticker.cancel()
+
+        assert res.status_code == 200
+        return ticks
+
+    # The loop kept serving other tasks while the objects were counted
+    assert asyncio.run(count_objects()) > 1
+    del heap
@@ -0,0 +1,28 @@
+import gc
+import logging
+import warnings
+from typing import Iterator
+
+import pytest
+
+from pkm_trade_spoofer.benchmarks import micro
+
+
+@pytest.fixture
+def quiet_logs() -> Iterator[None]:
+    # Every state switch of the trades is logged at INFO
+    package_logger = logging.getLogger("pkm_trade_spoofer")
+    level = package_logger.level
+    package_logger.setLevel(logging.WARNING)
+    yield
+    package_logger.setLevel(level)
+
+
+def test_trade_benchmark_closes_its_event_loop(quiet_logs: None) -> None:
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        (result,) = micro.run_benchmarks(repeat=1, only=["state_machine.trade"])
+        gc.collect()
+
+    assert result.name == "state_machine.trade"
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
@@ -0,0 +1,47 @@
+import asyncio
+
+from pkm_trade_spoofer.backend import BGBBackend
+from pkm_trade_spoofer.benchmarks._common import synthetic_party
+from pkm_trade_spoofer.models import Party
+from pkm_trade_spoofer.party_cache import PartyCache
+
+
+def test_parties_are_built_and_serialized_once() -> None:
+    cache = PartyCache()
+    builds = 0
+
+    async def build() -> Party:
+        nonlocal builds
+        builds += 1
+        return synthetic_party(trainer_name="GOLD")
+
+    async def lookup_twice() -> None:
+        first = await cache.get_or_build("gold", build)
+        second = await cache.get_or_build("gold", build)
+
+        assert builds == 1
+        assert first.party is not second.party
+        assert first.serialized is second.serialized
+        assert first.serialized == bytes(first.party.serialize())
+
+    asyncio.run(lookup_twice())
+
+
+def test_backend_sends_the_given_image() -> None:
+    party = synthetic_party(trainer_name="GOLD")
+    image = bytes(party.serialize())
+
+    async def start_and_swap() -> None:
+        backend = BGBBackend("127.0.0.1", 0)
+        await backend.start(party, image)
+        try:
+            assert backend._slot is not None
+            assert backend._slot.current.image is image
+
+            swapped_image = bytes(image)
+            await backend.swap_party(party, swapped_image)
+            assert backend._slot.current.image is swapped_image
+        finally:
+            await backend.stop()
+
+    asyncio.run(start_and_swap())
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from pkm_trade_spoofer.benchmarks._common import synthetic_party
+from pkm_trade_spoofer.models import PARTY_N_BYTES
+from pkm_trade_spoofer.party_store import PartyStore
+
+
+@pytest.fixture
+def store_path(tmp_path: Path) -> Path:
+    path = tmp_path / "parties.bin"
+    with PartyStore(path) as store:
+        store.append(synthetic_party(trainer_name="GOLD"))
+        store.append(synthetic_party(trainer_name="SILVER"))
+    return path
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+@pytest.mark.parametrize("partial_line", ['"CRYS', '"CRYSTAL"', "\x00\x00"])
+def test_partial_index_line_is_dropped(store_path: Path, partial_line: str) -> None:
+    # An append interrupted while writing the index: record written, name not
+    with open(store_path, "ab") as f:
+        f.write(bytes(synthetic_party(trainer_name="CRYSTAL").serialize()))
+    with open(_index_path(store_path), "a", encoding="utf-8") as f:
+        f.write(partial_line)
+
+    with PartyStore(store_path) as store:
+        assert store.items() == [(0, "GOLD"), (1, "SILVER")]
+        assert store_path.stat().st_size == 2 * PARTY_N_BYTES
+
+        assert store.append(synthetic_party(trainer_name="CRYSTAL")) == 2
+
+    with PartyStore(store_path) as store:
+        assert store.items() == [(0, "GOLD"), (1, "SILVER"), (2, "CRYSTAL")]
+        assert store.get(2).trainer_name == "CRYSTAL"
+
+
+def test_trailing_record_without_name_is_dropped(store_path: Path) -> None:
+    with open(store_path, "ab") as f:
+        f.write(b"\x00" * (PARTY_N_BYTES // 2))
+
+    with PartyStore(store_path) as store:
+        assert len(store) == 2
+        assert store_path.stat().st_size == 2 * PARTY_N_BYTES
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from pkm_trade_spoofer.pokemon import (
+    AsyncPokeApiClient,
+    PokeApiError,
+    SQLiteSpeciesCache,
+    species_by_id,
+    species_by_id_async,
+)
+from pkm_trade_spoofer.pokemon.testing import FakePokeApiServer
+
+
+def test_async_miss_then_hit(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    async def lookup_twice() -> None:
+        # No base url, the client follows `set_pokeapi_url`
+        client = AsyncPokeApiClient()
+        try:
+            fetched = await species_by_id_async(25, client)
+            assert pokeapi.requests == 2
+            assert await species_by_id_async(25, client) == fetched
+            assert pokeapi.requests == 2
+        finally:
+            await client.close()
+
+    asyncio.run(lookup_twice())
+    # Same record the synchronous lookup gets from the shared cache
+    assert species_by_id(25) == species_cache.get(25)
+
+
+def test_async_client_matches_the_sync_lookup(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    async def fetch() -> object:
+        client = AsyncPokeApiClient(pokeapi.base_url)
+        try:
+            return await client.fetch_species(151)
+        finally:
+            await client.close()
+
+    assert asyncio.run(fetch()) == species_by_id(151)
+
+
+def test_unknown_species_raises(pokeapi: FakePokeApiServer) -> None:
+    async def fetch() -> None:
+        client = AsyncPokeApiClient()
+        try:
+            await client.fetch_species(999)
+        finally:
+            await client.close()
+
+    with pytest.raises(PokeApiError):
+        asyncio.run(fetch())
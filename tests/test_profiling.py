@@ -0,0 +1,54 @@
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from pkm_trade_spoofer.profiling import (
+    SessionProfiler,
+    _install_task_factory,
+    _ProfiledCoroutine,
+)
+
+
+def test_sessions_chain_to_the_loop_task_factory(tmp_path: Path) -> None:
+    profiled: list[bool] = []
+
+    def previous_factory(
+        loop: asyncio.AbstractEventLoop,
+        coro: Any,
+        **kwargs: Any,
+    ) -> asyncio.Task:
+        profiled.append(isinstance(coro, _ProfiledCoroutine))
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    async def session() -> None:
+        # Spawned from the session, created by the loop factory and profiled
+        await asyncio.create_task(asyncio.sleep(0))
+
+    async def profile_one_session() -> None:
+        loop = asyncio.get_running_loop()
+        loop.set_task_factory(previous_factory)
+        profiler = SessionProfiler(tmp_path, enabled=True)
+
+        await profiler.profile_session("session", session())
+
+        assert loop.get_task_factory() is previous_factory
+        loop.set_task_factory(None)
+
+    asyncio.run(profile_one_session())
+
+    assert profiled == [True]
+    assert len(list(tmp_path.glob("session-*.prof"))) == 1
+
+
+def test_factory_forwards_keyword_arguments() -> None:
+    async def create_named_task() -> None:
+        loop = asyncio.get_running_loop()
+        factory = _install_task_factory(loop)
+        # Python >= 3.13.3 passes the task name (and others) to the factory
+        task = factory(loop, asyncio.sleep(0), name="named", context=None)
+        await task
+
+        assert task.get_name() == "named"
+        loop.set_task_factory(None)
+
+    asyncio.run(create_named_task())
@@ -0,0 +1,146 @@
+import functools
+import multiprocessing
+import multiprocessing.synchronize
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from pkm_trade_spoofer.pokemon import (
+    NullSpeciesCache,
+    SQLiteSpeciesCache,
+    builder,
+    get_species_cache,
+    set_pokeapi_url,
+    set_species_cache,
+    species_by_id,
+)
+from pkm_trade_spoofer.pokemon.testing import FakePokeApiServer
+
+# Each species is downloaded with two requests, /pokemon and /pokemon-species
+_REQUESTS_PER_SPECIES = 2
+
+
+def test_miss_then_hit(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    fetched = species_by_id(25)
+    assert pokeapi.requests == _REQUESTS_PER_SPECIES
+    assert len(species_cache) == 1
+
+    assert species_by_id(25) == fetched
+    assert pokeapi.requests == _REQUESTS_PER_SPECIES
+
+
+def test_expired_entries_are_fetched_again(
+    pokeapi: FakePokeApiServer,
+    cache_path: Path,
+) -> None:
+    set_species_cache(SQLiteSpeciesCache(cache_path, ttl=0.01))
+    try:
+        species_by_id(25)
+        time.sleep(0.02)
+        species_by_id(25)
+    finally:
+        set_species_cache(None)
+
+    assert pokeapi.requests == 2 * _REQUESTS_PER_SPECIES
+
+
+def test_least_recently_used_entries_are_evicted(
+    pokeapi: FakePokeApiServer,
+    cache_path: Path,
+) -> None:
+    cache = SQLiteSpeciesCache(cache_path, max_entries=2)
+    set_species_cache(cache)
+    try:
+        for dex_id in (1, 2, 3):
+            species_by_id(dex_id)
+    finally:
+        set_species_cache(None)
+
+    assert len(cache) == 2
+    assert cache.get(1) is None
+    assert cache.get(2) is not None
+    assert cache.get(3) is not None
+
+
+def test_corrupt_database_falls_back_to_no_cache(
+    pokeapi: FakePokeApiServer,
+    cache_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache_path.write_bytes(b"not a sqlite database" * 100)
+    monkeypatch.setattr(
+        builder,
+        "SQLiteSpeciesCache",
+        functools.partial(SQLiteSpeciesCache, cache_path),
+    )
+    set_species_cache(None)
+    try:
+        assert isinstance(get_species_cache(), NullSpeciesCache)
+        assert species_by_id(25).dex_id == 25
+    finally:
+        set_species_cache(None)
+
+
+def _lookup_species(
+    pokeapi_url: str,
+    cache_path: Path,
+    dex_ids: list[int],
+    start: multiprocessing.synchronize.Event,
+) -> None:
+    set_pokeapi_url(pokeapi_url)
+    set_species_cache(SQLiteSpeciesCache(cache_path))
+    start.wait()
+    for dex_id in dex_ids:
+        species_by_id(dex_id)
+
+
+def test_processes_share_the_cache(
+    pokeapi: FakePokeApiServer,
+    cache_path: Path,
+) -> None:
+    dex_ids = list(range(1, 31))
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    processes = [
+        ctx.Process(
+            target=_lookup_species,
+            args=(pokeapi.base_url, cache_path, ids, start),
+        )
+        for ids in (dex_ids, dex_ids[::-1])
+    ]
+    for p in processes:
+        p.start()
+    start.set()
+    for p in processes:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    # Both processes wrote to the same WAL database and left it consistent
+    with sqlite3.connect(cache_path) as conn:
+        (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+        (integrity,) = conn.execute("PRAGMA integrity_check").fetchone()
+    assert journal_mode == "wal"
+    assert integrity == "ok"
+
+    # Each species was downloaded at least once and at most by both processes
+    n_requests = pokeapi.requests
+    assert (
+        len(dex_ids) * _REQUESTS_PER_SPECIES
+        <= n_requests
+        <= 2 * len(dex_ids) * _REQUESTS_PER_SPECIES
+    )
+
+    cache = SQLiteSpeciesCache(cache_path)
+    set_species_cache(cache)
+    try:
+        assert len(cache) == len(dex_ids)
+        for dex_id in dex_ids:
+            species_by_id(dex_id)
+    finally:
+        set_species_cache(None)
+    assert pokeapi.requests == n_requests
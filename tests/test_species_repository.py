@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any
+
+from pkm_trade_spoofer.pokemon import SQLiteSpeciesCache
+from pkm_trade_spoofer.pokemon.client import REQUESTS_PER_SPECIES, AsyncPokeApiClient
+from pkm_trade_spoofer.pokemon.repository import SpeciesRepository
+from pkm_trade_spoofer.pokemon.testing import FakePokeApiServer
+
+
+class _CountingClient(AsyncPokeApiClient):
+    def __init__(self) -> None:
+        super().__init__(max_connections=8)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_json(self, path: str) -> Any:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # Keeps the requests in flight long enough to overlap
+            await asyncio.sleep(0.01)
+            return await super().get_json(path)
+        finally:
+            self.in_flight -= 1
+
+
+def test_warm_up_leaves_connections_for_requests(
+    pokeapi: FakePokeApiServer,
+    species_cache: SQLiteSpeciesCache,
+) -> None:
+    async def warm_up() -> _CountingClient:
+        client = _CountingClient()
+        try:
+            repository = SpeciesRepository(client)
+            await repository.warm_up(range(1, 31))
+            assert all(dex_id in repository for dex_id in range(1, 31))
+            return client
+        finally:
+            await client.close()
+
+    client = asyncio.run(warm_up())
+
+    assert client.max_in_flight > REQUESTS_PER_SPECIES
+    assert client.max_in_flight <= client.max_connections - REQUESTS_PER_SPECIES
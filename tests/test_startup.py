@@ -0,0 +1,25 @@
+import pytest
+
+from pkm_trade_spoofer.benchmarks import startup
+
+# Median import time allowed to each CLI command, in milliseconds. About twice
+# what they take on a developer machine, so slower runners do not fail the test
+_BUDGETS_MS = {
+    "api": 1200,
+    "bgb": 500,
+    "batch": 500,
+}
+
+
+def test_every_command_has_a_budget() -> None:
+    assert set(_BUDGETS_MS) == set(startup.COMMAND_MODULES)
+
+
+@pytest.mark.parametrize("command", sorted(_BUDGETS_MS))
+def test_command_imports_within_budget(command: str) -> None:
+    (timing,) = startup.measure_commands([command], repeat=3)
+
+    assert timing.median_us <= _BUDGETS_MS[command] * 1000, (
+        f"{command} takes {timing.median_us / 1000:.1f} ms to import, "
+        f"the budget is {_BUDGETS_MS[command]} ms"
+    )